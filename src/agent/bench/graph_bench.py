@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from agent.bench.mock_server import LatencyModel, build_policy, start_mock_server
+from agent.config.config import Settings
+from agent.core.planner import Planner
+from agent.infra.hedging import nearest_rank
+from agent.infra.llm_client import close_shared_clients
+from agent.infra.runtime import BrowserRuntime
+from agent.infra.tracing import TextLogger, TraceLogger
+from agent.langgraph_loop import build_graph
+
+# Self-contained page so observe/execute can be benchmarked with no network: a search box,
+# category links and buttons that re-render the DOM (exercises dom_changed/progress paths).
+FIXTURE_HTML = """<!doctype html>
+<html>
+<head><meta charset="utf-8"><title>Bench catalog</title></head>
+<body>
+  <form id="search" onsubmit="event.preventDefault(); render('results for ' + this.q.value);">
+    <input name="q" aria-label="search" placeholder="Search catalog">
+    <button type="submit">Search</button>
+  </form>
+  <nav>
+    <a href="#books" onclick="render('books')">Books</a>
+    <a href="#python" onclick="render('python documentation')">Python documentation</a>
+    <a href="#music" onclick="render('music')">Music</a>
+  </nav>
+  <main id="content"></main>
+  <script>
+    function render(topic) {
+      const main = document.getElementById("content");
+      main.innerHTML = "";
+      for (let i = 1; i <= 12; i++) {
+        const item = document.createElement("button");
+        item.textContent = topic + " item " + i;
+        item.onclick = () => render(topic + " / " + i);
+        main.appendChild(item);
+      }
+      document.title = "Bench catalog - " + topic;
+    }
+    render("home");
+  </script>
+</body>
+</html>
+"""
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    return round(nearest_rank(sorted(values), q), 4)
+
+
+def _distribution(values: List[float]) -> Dict[str, Optional[float]]:
+    return {
+        "count": len(values),
+        "p50": percentile(values, 0.5),
+        "p90": percentile(values, 0.9),
+        "p99": percentile(values, 0.99),
+        "max": round(max(values), 4) if values else None,
+    }
+
+
+async def run_bench(
+    *,
+    goals: List[str],
+    runs: int,
+    policy: str,
+    replay_dir: Optional[Path],
+    latency: str,
+    max_steps: int,
+    start_url: Optional[str],
+    base_url: Optional[str],
+    headful: bool,
+    seed: Optional[int],
+    har: Optional[Path] = None,
+) -> Dict[str, Any]:
+    settings = Settings.load()
+    server = None
+    if not base_url:
+        server = start_mock_server(
+            policy=build_policy(policy, replay_dir=replay_dir, loop=True, max_steps=max_steps),
+            latency=LatencyModel.parse(latency, seed=seed),
+        )
+        base_url = server.base_url
+    bench_dir = settings.paths.logs_dir / "bench"
+    bench_dir.mkdir(parents=True, exist_ok=True)
+    if not start_url:
+        fixture = settings.paths.state_dir / "bench-fixture.html"
+        fixture.write_text(FIXTURE_HTML, encoding="utf-8")
+        start_url = fixture.resolve().as_uri()
+    if server is not None or not settings.openai_api_key:
+        settings.openai_api_key = "mock"
+    settings.openai_base_url = base_url
+    settings.start_url = start_url
+    settings.headless = not headful
+    settings.max_steps = max_steps
+    settings.auto_confirm = True
+    if har:
+        # Frozen copy of the sites: with a replayed planner this makes the whole run deterministic.
+        settings.har_mode = "replay"
+        settings.har_path = har
+
+    runtime = BrowserRuntime(settings)
+    await runtime.launch()
+    planner = Planner.from_settings(settings)
+    text_log = TextLogger(bench_dir / "agent.log")
+    trace = TraceLogger(bench_dir / "trace.jsonl")
+    runner = build_graph(
+        settings=settings,
+        planner=planner,
+        runtime=runtime,
+        execute_enabled=True,
+        text_log=text_log,
+        trace=trace,
+    )
+
+    goal_results: List[Dict[str, Any]] = []
+    goal_wall: List[float] = []
+    step_wall: List[float] = []
+    total_steps = 0
+    started = time.perf_counter()
+    try:
+        for run_idx in range(runs):
+            for goal in goals:
+                page = await runtime.ensure_page()
+                await page.goto(start_url)
+                if server is not None:
+                    # Progress is keyed by goal text: every run must start from step 0 again.
+                    server.policy.reset()
+                t0 = time.perf_counter()
+                result = await runner(goal=goal)
+                elapsed = time.perf_counter() - t0
+                steps = max(1, int(result.get("step") or 1))
+                total_steps += steps
+                goal_wall.append(elapsed)
+                step_wall.append(elapsed / steps)
+                goal_results.append(
+                    {
+                        "run": run_idx,
+                        "goal": goal,
+                        "session_id": result.get("session_id"),
+                        "stop_reason": result.get("stop_reason"),
+                        "steps": steps,
+                        "planner_calls": result.get("planner_calls"),
+                        "wall_s": round(elapsed, 4),
+                    }
+                )
+    finally:
+        await runtime.close()
+        await close_shared_clients()
+        if server:
+            server.shutdown()
+            server.server_close()
+    total = time.perf_counter() - started
+
+    summary = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "policy": policy if server else "external",
+        "latency": latency if server else None,
+        "base_url": base_url,
+        "start_url": start_url,
+        "har": str(har) if har else None,
+        "runs": runs,
+        "goals": len(goals),
+        "total_s": round(total, 4),
+        "total_steps": total_steps,
+        "steps_per_sec": round(total_steps / total, 4) if total > 0 else None,
+        "goal_wall_s": _distribution(goal_wall),
+        "step_wall_s": _distribution(step_wall),
+        "planner_requests_served": server.requests_served if server else None,
+        "results": goal_results,
+    }
+    out = bench_dir / f"bench-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    out.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    summary["path"] = str(out)
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline end-to-end graph benchmark against the mock planner.")
+    parser.add_argument("--goals", nargs="+", default=["find python documentation"], help="Goals to run.")
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions over the goal list.")
+    parser.add_argument("--policy", choices=["heuristic", "replay"], default="heuristic")
+    parser.add_argument("--replay-dir", type=Path, help="planner-*.json directory for the replay policy.")
+    parser.add_argument("--latency", default="lognormal:-1.2,0.4", help="Mock planner latency distribution.")
+    parser.add_argument("--max-steps", type=int, default=6)
+    parser.add_argument("--start-url", help="Start page (default: bundled offline fixture).")
+    parser.add_argument("--base-url", help="Use an already running OpenAI-compatible endpoint instead of the in-process mock.")
+    parser.add_argument("--headful", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--har", type=Path, help="Replay network traffic from this HAR (record one with --har-record).")
+    args = parser.parse_args()
+
+    summary = asyncio.run(
+        run_bench(
+            goals=args.goals,
+            runs=max(1, args.runs),
+            policy=args.policy,
+            replay_dir=args.replay_dir,
+            latency=args.latency,
+            max_steps=max(1, args.max_steps),
+            start_url=args.start_url,
+            base_url=args.base_url,
+            headful=args.headful,
+            seed=args.seed,
+            har=args.har,
+        )
+    )
+    print(
+        f"[bench] goals={summary['goals']} runs={summary['runs']} steps={summary['total_steps']} "
+        f"steps/s={summary['steps_per_sec']} goal p50={summary['goal_wall_s']['p50']}s p90={summary['goal_wall_s']['p90']}s "
+        f"step p50={summary['step_wall_s']['p50']}s p90={summary['step_wall_s']['p90']}s"
+    )
+    print(f"[bench] Report: {summary['path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Local stand-in for the chat-completions tool-call protocol used by core/planner.py.
+# Answers come from a policy (recorded planner-*.json replay or simple heuristics) after a sampled latency.
+
+_MAPPING_RE = re.compile(r"Current mapping \(top elements\):\n(\{.*?\n\})\n", re.DOTALL)
+_GOAL_RE = re.compile(r"^Goal: (.*)$", re.MULTILINE)
+_STEP_RE = re.compile(r"-step(\d+)")
+
+
+@dataclass
+class LatencyModel:
+    """Latency distribution in seconds: fixed:S | uniform:A,B | normal:MU,SIGMA | lognormal:MU,SIGMA."""
+
+    kind: str = "fixed"
+    params: Tuple[float, ...] = (0.0,)
+    rng: random.Random = field(default_factory=random.Random)
+
+    @classmethod
+    def parse(cls, spec: str, *, seed: Optional[int] = None) -> "LatencyModel":
+        kind, _, raw = spec.partition(":")
+        kind = kind.strip().lower() or "fixed"
+        params = tuple(float(p) for p in raw.split(",") if p.strip()) or (0.0,)
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"Invalid latency spec {spec!r}; expected one of fixed:S, uniform:A,B, normal:MU,SIGMA, lognormal:MU,SIGMA")
+        return cls(kind=kind, params=params, rng=random.Random(seed))
+
+    def sample(self) -> float:
+        if self.kind == "uniform":
+            value = self.rng.uniform(*self.params)
+        elif self.kind == "normal":
+            value = self.rng.gauss(*self.params)
+        elif self.kind == "lognormal":
+            value = math.exp(self.rng.gauss(*self.params))
+        else:
+            value = self.params[0]
+        return max(0.0, value)
+
+
+def _action(action: str, element_id: Optional[int] = None, value: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "tool": "browser_action",
+        "action": action,
+        "element_id": element_id,
+        "value": value,
+        "requires_confirmation": False,
+        "confidence": 0.9,
+    }
+
+
+def _user_text(request: Dict[str, Any]) -> str:
+    for message in request.get("messages") or []:
+        if message.get("role") == "user" and isinstance(message.get("content"), str):
+            return message["content"]
+    return ""
+
+
+class ReplayPolicy:
+    """Replays tool-call arguments from raw planner logs (planner-*.json written with ENABLE_RAW_LOGS)."""
+
+    def __init__(self, replay_dir: Path, *, loop: bool = False) -> None:
+        files = list(replay_dir.glob("planner-*.json"))
+
+        def order(path: Path) -> Tuple[str, int, float]:
+            step_match = _STEP_RE.search(path.stem)
+            session = path.stem.split("-step")[0]
+            return (session, int(step_match.group(1)) if step_match else 0, path.stat().st_mtime)
+
+        self.arguments: List[Dict[str, Any]] = []
+        for path in sorted(files, key=order):
+            try:
+                raw = json.loads(path.read_text(encoding="utf-8"))
+                call = raw["choices"][0]["message"]["tool_calls"][0]
+                self.arguments.append(json.loads(call["function"]["arguments"]))
+            except Exception:
+                continue
+        self.loop = loop
+        self._idx = 0
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Start the recorded sequence over (one benchmark run)."""
+        with self._lock:
+            self._idx = 0
+
+    def decide(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            if not self.arguments or (self._idx >= len(self.arguments) and not self.loop):
+                return _action("done")
+            args = self.arguments[self._idx % len(self.arguments)]
+            self._idx += 1
+            return dict(args)
+
+
+class HeuristicPolicy:
+    """Search once if a search box exists, then click the best goal-token match, scroll otherwise; done after max_steps."""
+
+    def __init__(self, *, max_steps: int = 5) -> None:
+        self.max_steps = max_steps
+        self._progress: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Forget per-goal progress; without it a repeated goal would be answered "done" straight away."""
+        with self._lock:
+            self._progress.clear()
+
+    def decide(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        text = _user_text(request)
+        goal_match = _GOAL_RE.search(text)
+        goal = goal_match.group(1).strip() if goal_match else ""
+        mapping: List[Dict[str, Any]] = []
+        mapping_match = _MAPPING_RE.search(text)
+        if mapping_match:
+            try:
+                mapping = json.loads(mapping_match.group(1)).get("mapping") or []
+            except json.JSONDecodeError:
+                mapping = []
+        with self._lock:
+            progress = self._progress.setdefault(goal, {"steps": 0, "searched": False, "clicked": set()})
+            progress["steps"] += 1
+            if progress["steps"] > self.max_steps:
+                return _action("done")
+            tokens = [t for t in goal.lower().split() if len(t) > 3]
+            if not progress["searched"]:
+                for el in mapping:
+                    if el.get("tag") in {"input", "textarea"} and not el.get("is_disabled"):
+                        progress["searched"] = True
+                        return _action("search", int(el["id"]), goal)
+            best: Optional[Tuple[int, Dict[str, Any]]] = None
+            for el in mapping:
+                if el.get("is_disabled") or el.get("id") in progress["clicked"]:
+                    continue
+                if el.get("tag") not in {"a", "button"} and el.get("role") not in {"link", "button"}:
+                    continue
+                label = (el.get("text") or "").lower()
+                score = sum(1 for tok in tokens if tok in label)
+                if best is None or score > best[0]:
+                    best = (score, el)
+            if best is not None:
+                progress["clicked"].add(best[1].get("id"))
+                return _action("click", int(best[1]["id"]))
+            return _action("scroll")
+
+
+def _completion_payload(request: Dict[str, Any], arguments: str) -> Dict[str, Any]:
+    prompt_chars = len(json.dumps(request.get("messages") or [], ensure_ascii=False))
+    return {
+        "id": f"chatcmpl-mock-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model") or "mock",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "tool_calls",
+                "message": {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [
+                        {
+                            "id": f"call_{uuid.uuid4().hex[:12]}",
+                            "type": "function",
+                            "function": {"name": "browser_action", "arguments": arguments},
+                        }
+                    ],
+                },
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_chars // 4,
+            "completion_tokens": len(arguments) // 4,
+            "total_tokens": prompt_chars // 4 + len(arguments) // 4,
+        },
+    }
+
+
+def _stream_chunks(request: Dict[str, Any], arguments: str, *, pieces: int = 6) -> List[Dict[str, Any]]:
+    base = {
+        "id": f"chatcmpl-mock-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": request.get("model") or "mock",
+    }
+    size = max(1, math.ceil(len(arguments) / pieces))
+    chunks = [
+        {
+            **base,
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": None,
+                    "delta": {
+                        "role": "assistant",
+                        "tool_calls": [
+                            {
+                                "index": 0,
+                                "id": f"call_{uuid.uuid4().hex[:12]}",
+                                "type": "function",
+                                "function": {"name": "browser_action", "arguments": ""},
+                            }
+                        ],
+                    },
+                }
+            ],
+        }
+    ]
+    for start in range(0, len(arguments), size):
+        chunks.append(
+            {
+                **base,
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": None,
+                        "delta": {"tool_calls": [{"index": 0, "function": {"arguments": arguments[start : start + size]}}]},
+                    }
+                ],
+            }
+        )
+    chunks.append({**base, "choices": [{"index": 0, "finish_reason": "tool_calls", "delta": {}}]})
+    return chunks
+
+
+class MockPlannerServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], *, policy: Any, latency: LatencyModel, chunk_delay: float = 0.0) -> None:
+        super().__init__(address, _Handler)
+        self.policy = policy
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.requests_served = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockPlannerServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *_: Any) -> None:
+        return None
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.rstrip("/") in {"/v1/models", "/models"}:
+            self._send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "local"}]})
+            return
+        self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.rstrip("/") not in {"/v1/chat/completions", "/chat/completions"}:
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as exc:
+            self._send_json(400, {"error": {"message": f"invalid JSON: {exc}"}})
+            return
+        arguments = json.dumps(self.server.policy.decide(request), ensure_ascii=False)
+        time.sleep(self.server.latency.sample())
+        self.server.requests_served += 1
+        if not request.get("stream"):
+            self._send_json(200, _completion_payload(request, arguments))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for chunk in _stream_chunks(request, arguments):
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            if self.server.chunk_delay:
+                time.sleep(self.server.chunk_delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+
+def build_policy(name: str, *, replay_dir: Optional[Path] = None, loop: bool = False, max_steps: int = 5) -> Any:
+    if name == "replay":
+        if not replay_dir:
+            raise ValueError("Replay policy requires --replay-dir with planner-*.json files.")
+        return ReplayPolicy(replay_dir, loop=loop)
+    if name == "heuristic":
+        return HeuristicPolicy(max_steps=max_steps)
+    raise ValueError(f"Unknown policy: {name}")
+
+
+def start_mock_server(
+    *,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    policy: Any,
+    latency: Optional[LatencyModel] = None,
+    chunk_delay: float = 0.0,
+) -> MockPlannerServer:
+    """Start the server on a background thread (port=0 picks a free port); stop with server.shutdown()."""
+    server = MockPlannerServer((host, port), policy=policy, latency=latency or LatencyModel(), chunk_delay=chunk_delay)
+    threading.Thread(target=server.serve_forever, name="mock-planner", daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible mock planner for offline benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--policy", choices=["heuristic", "replay"], default="heuristic")
+    parser.add_argument("--replay-dir", type=Path, help="Directory with planner-*.json raw logs (replay policy).")
+    parser.add_argument("--loop", action="store_true", help="Cycle replayed responses instead of returning done.")
+    parser.add_argument("--max-steps", type=int, default=5, help="Heuristic policy: steps per goal before done.")
+    parser.add_argument("--latency", default="fixed:0", help="fixed:S | uniform:A,B | normal:MU,SIGMA | lognormal:MU,SIGMA")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="Delay between streamed chunks (seconds).")
+    parser.add_argument("--seed", type=int, help="Seed for the latency distribution.")
+    args = parser.parse_args()
+
+    policy = build_policy(args.policy, replay_dir=args.replay_dir, loop=args.loop, max_steps=args.max_steps)
+    latency = LatencyModel.parse(args.latency, seed=args.seed)
+    server = MockPlannerServer((args.host, args.port), policy=policy, latency=latency, chunk_delay=args.chunk_delay)
+    print(f"[mock] Serving chat completions at {server.base_url} policy={args.policy} latency={args.latency}")
+    print(f"[mock] Use OPENAI_BASE_URL={server.base_url} OPENAI_API_KEY=mock")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import argparse
+import json
+import pickle
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from agent.config.config import Settings
+from agent.core.history_store import (
+    ACTION_HISTORY_RING,
+    INTENT_HISTORY_RING,
+    RECORDS_RING,
+    UX_MESSAGES_RING,
+    add_record,
+    bounded_increment,
+    ring,
+    tail,
+)
+
+# Graph nodes that return {**state, ...} per step (observe → goal_check → planner → safety → execute → progress).
+_NODES_PER_STEP = 6
+
+
+def _tabs(step: int) -> List[Dict[str, Any]]:
+    return [
+        {"index": str(i), "id": f"page@{i}", "url": f"https://example.com/p/{step}/{i}", "title": f"Tab {i}", "active": str(i == 0)}
+        for i in range(4)
+    ]
+
+
+def _record(state: Dict[str, Any], step: int, ux: Any) -> Dict[str, Any]:
+    return {
+        "step": step,
+        "session_id": state["session_id"],
+        "step_id": f"{state['session_id']}-step{step}",
+        "action": {"action": "click", "element_id": step % 40, "value": None},
+        "execute_success": True,
+        "execute_error": None,
+        "url_changed": True,
+        "dom_changed": True,
+        "attempts_per_element": state["exec_fail_counts"],
+        "tabs": _tabs(step),
+        "intent_history": tail(state["intent_history"], 3),
+        "ux_messages": tail(ux, 3),
+    }
+
+
+def _legacy_step(state: Dict[str, Any], step: int) -> Dict[str, Any]:
+    """The pre-ring state model: unbounded lists/dicts, list copies for UX/intent history."""
+    for _ in range(_NODES_PER_STEP - 2):
+        state = {**state}
+    intent = list(state["intent_history"])
+    intent.append({"step": step, "action": "click", "element_id": step % 40})
+    intent = intent[-10:]
+    ux = list(state["ux_messages"])
+    ux.append(f"step {step}: plan click")
+    ux = ux[-30:]
+    state = {**state, "intent_history": intent, "ux_messages": ux}
+    url = f"https://example.com/p/{step}"
+    state["visited_urls"][url] = state["visited_urls"].get(url, 0) + 1
+    key = str(step % 40)  # data-agent-ids repeat across pages; URLs don't
+    state["visited_elements"][key] = state["visited_elements"].get(key, 0) + 1
+    state["exec_fail_counts"][key] = state["exec_fail_counts"].get(key, 0) + 1
+    state["records"].append(_record(state, step, ux))
+    state["action_history"].append({"action": "click", "element_id": step % 40, "url": url})
+    return {**state}
+
+
+def _bounded_step(state: Dict[str, Any], step: int) -> Dict[str, Any]:
+    """Ring buffers + capped counters; the full record only goes to the trace (not modelled here)."""
+    for _ in range(_NODES_PER_STEP - 2):
+        state = {**state}
+    state["intent_history"].append({"step": step, "action": "click", "element_id": step % 40})
+    state["ux_messages"].append(f"step {step}: plan click")
+    state = {**state}
+    url = f"https://example.com/p/{step}"
+    bounded_increment(state["visited_urls"], url)
+    key = str(step % 40)
+    bounded_increment(state["visited_elements"], key)
+    bounded_increment(state["exec_fail_counts"], key)
+    add_record(state, _record(state, step, state["ux_messages"]))
+    state["action_history"].append({"action": "click", "element_id": step % 40, "url": url})
+    return {**state}
+
+
+def _initial(mode: str) -> Dict[str, Any]:
+    if mode == "legacy":
+        history = {"records": [], "action_history": [], "intent_history": [], "ux_messages": []}
+    else:
+        history = {
+            "records": ring(RECORDS_RING),
+            "action_history": ring(ACTION_HISTORY_RING),
+            "intent_history": ring(INTENT_HISTORY_RING),
+            "ux_messages": ring(UX_MESSAGES_RING),
+            "record_seq": 0,
+        }
+    return {
+        "session_id": "bench",
+        "goal": "long session",
+        "visited_urls": {},
+        "visited_elements": {},
+        "exec_fail_counts": {},
+        **history,
+    }
+
+
+def run_mode(mode: str, *, steps: int, window: int, checkpoint: bool) -> Dict[str, Any]:
+    step_fn: Callable[[Dict[str, Any], int], Dict[str, Any]] = _legacy_step if mode == "legacy" else _bounded_step
+    state = _initial(mode)
+    per_step: List[float] = []
+    for step in range(1, steps + 1):
+        started = time.perf_counter()
+        state = step_fn(state, step)
+        if checkpoint:
+            # What a checkpointer pays every step: serialize the whole state.
+            pickle.dumps(state)
+        per_step.append(time.perf_counter() - started)
+    # Memory in a separate pass: tracemalloc would distort the timings.
+    tracemalloc.start()
+    mem_state = _initial(mode)
+    for step in range(1, steps + 1):
+        mem_state = step_fn(mem_state, step)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    windows = [
+        round(sum(per_step[i : i + window]) / len(per_step[i : i + window]) * 1e6, 1) for i in range(0, steps, window)
+    ]
+    return {
+        "mode": mode,
+        "steps": steps,
+        "mean_us_per_window": windows,
+        "first_window_us": windows[0],
+        "last_window_us": windows[-1],
+        "growth": round(windows[-1] / windows[0], 2) if windows[0] else None,
+        "state_bytes": len(pickle.dumps(state)),
+        "traced_mem_kb": round(current / 1024, 1),
+        "peak_mem_kb": round(peak / 1024, 1),
+    }
+
+
+def run_bench(*, steps: int, window: int, checkpoint: bool, out_dir: Path) -> Dict[str, Any]:
+    results = [run_mode(mode, steps=steps, window=window, checkpoint=checkpoint) for mode in ("legacy", "bounded")]
+    summary = {"steps": steps, "window": window, "checkpoint": checkpoint, "results": results}
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out = out_dir / f"state-bench-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    out.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    summary["path"] = str(out)
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-step GraphState cost over a long session: unbounded vs ring buffers.")
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--window", type=int, default=100, help="Steps per reported mean.")
+    parser.add_argument("--no-checkpoint", action="store_true", help="Skip the per-step state serialization.")
+    parser.add_argument("--out-dir", type=Path, help="Report directory (default: LOGS_DIR/bench).")
+    args = parser.parse_args()
+
+    summary = run_bench(
+        steps=max(1, args.steps),
+        window=max(1, args.window),
+        checkpoint=not args.no_checkpoint,
+        out_dir=args.out_dir or Settings.load().paths.logs_dir / "bench",
+    )
+    for item in summary["results"]:
+        print(
+            f"[state-bench] {item['mode']}: first={item['first_window_us']}us/step last={item['last_window_us']}us/step "
+            f"growth={item['growth']}x state={item['state_bytes']}B mem={item['traced_mem_kb']}KB"
+        )
+    print(f"[state-bench] Report: {summary['path']}")
+
+
+if __name__ == "__main__":
+    main()
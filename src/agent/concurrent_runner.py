@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import replace
+from typing import Any, Dict, List, Optional
+
+from agent.config.config import Settings
+from agent.core.planner import Planner
+from agent.infra.browser_pool import BrowserPool
+from agent.infra.tracing import TextLogger, TraceLogger, generate_step_id
+from agent.langgraph_loop import build_graph
+
+
+def _summarize(goal: str, session_id: str, result: Dict[str, Any], elapsed: float) -> Dict[str, Any]:
+    observation = result.get("observation")
+    return {
+        "goal": goal,
+        "session_id": session_id,
+        "stop_reason": result.get("stop_reason"),
+        "stop_details": result.get("stop_details"),
+        "url": getattr(observation, "url", None),
+        "steps": result.get("step"),
+        "planner_calls": result.get("planner_calls"),
+        "wall_s": round(elapsed, 3),
+    }
+
+
+async def run_goal_in_pool(
+    goal: str,
+    *,
+    settings: Settings,
+    planner: Planner,
+    pool: BrowserPool,
+    execute_enabled: bool,
+    session_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run one goal in its own pooled context; logs, state and screenshots go under <dir>/<session_id>."""
+    session_id = session_id or generate_step_id("session")
+    goal_settings = replace(settings, paths=settings.paths.scoped(session_id))
+    if settings.har_mode == "record":
+        # Contexts closing in parallel must not overwrite one HAR.
+        goal_settings.har_path = settings.har_path.with_name(f"{settings.har_path.stem}-{session_id}{settings.har_path.suffix}")
+    goal_settings.paths.ensure()
+    text_log = TextLogger(goal_settings.paths.logs_dir / "agent.log")
+    trace = TraceLogger(goal_settings.paths.logs_dir / "trace.jsonl")
+    started = time.perf_counter()
+    try:
+        async with pool.runtime(goal_settings) as runtime:
+            runner = build_graph(
+                settings=goal_settings,
+                planner=planner,
+                runtime=runtime,
+                execute_enabled=execute_enabled,
+                text_log=text_log,
+                trace=trace,
+            )
+            result = await runner(goal=goal, session_id=session_id)
+    except Exception as exc:
+        try:
+            text_log.write(f"[{session_id}] concurrent goal failed: {exc}")
+        except Exception:
+            pass
+        result = {"stop_reason": "error", "stop_details": str(exc)}
+    return _summarize(goal, session_id, result, time.perf_counter() - started)
+
+
+async def run_goals_concurrently(
+    goals: List[str],
+    *,
+    settings: Settings,
+    planner: Planner,
+    pool: BrowserPool,
+    execute_enabled: bool,
+    concurrency: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Run goals with at most `concurrency` in flight (further capped by the pool's context limit).
+
+    Results are returned in goal order; a failing goal is reported with stop_reason="error" and does not
+    cancel the others.
+    """
+    limit = asyncio.Semaphore(max(1, concurrency or settings.max_concurrent_goals))
+
+    async def _one(goal: str) -> Dict[str, Any]:
+        async with limit:
+            return await run_goal_in_pool(
+                goal,
+                settings=settings,
+                planner=planner,
+                pool=pool,
+                execute_enabled=execute_enabled,
+            )
+
+    return list(await asyncio.gather(*(_one(goal) for goal in goals)))
@@ -50,6 +50,59 @@ class Settings:
     scroll_step: int
     max_planner_calls: int
     max_no_progress_steps: int
+    planner_streaming: bool
+    planner_models: list[str]
+    planner_escalate_confidence: float
+    planner_hedge: bool
+    planner_hedge_quantile: float
+    planner_hedge_initial_delay_sec: float
+    planner_hedge_min_delay_sec: float
+    planner_hedge_model: Optional[str]
+    planner_hedge_base_url: Optional[str]
+    llm_max_connections: int
+    llm_max_keepalive: int
+    llm_keepalive_expiry_sec: float
+    llm_requests_per_minute: int
+    llm_tokens_per_minute: int
+    llm_max_retries: int
+    llm_backoff_base_sec: float
+    llm_backoff_max_sec: float
+    max_concurrent_goals: int
+    max_browser_contexts: int
+    farm_workers: int
+    farm_worker_retries: int
+    daemon_host: str
+    daemon_port: int
+    daemon_socket: Optional[str]
+    cdp_endpoint: Optional[str]
+    sidecar_port: int
+    sidecar_headless: bool
+    route_profile: str
+    route_block_types: list[str]
+    route_block_domains: list[str]
+    route_allow_domains: list[str]
+    har_mode: str
+    har_path: Path
+    har_url_filter: Optional[str]
+    har_not_found: str
+    tab_idle_ttl_sec: float
+    max_tabs: int
+    memory_recycle_mb: int
+    nav_wait_until: str
+    nav_settle_quiet_ms: int
+    nav_settle_max_ms: int
+    nav_timeout_min_sec: float
+    nav_timeout_multiplier: float
+    click_fast_path: bool
+    fused_actions: bool
+    fallback_learning: bool
+    fallback_min_attempts: int
+    observe_probe_reuse: bool
+    checkpoint_enabled: bool
+    checkpoint_path: Path
+    timing_spans: bool
+    profile_mode: str
+    profile_sample_ms: int
     paths: Paths
 
     @classmethod
@@ -126,6 +179,100 @@ class Settings:
         scroll_step = clamp_int(os.getenv("SCROLL_STEP", "600"), default=600)
         max_planner_calls = clamp_int(os.getenv("MAX_PLANNER_CALLS", "20"), default=20)
         max_no_progress_steps = clamp_int(os.getenv("MAX_NO_PROGRESS_STEPS", "20"), default=20)
+        planner_streaming = os.getenv("PLANNER_STREAMING", "false").lower() in {"1", "true", "yes", "on"}
+        # Cascade: ordered cheap -> strong; defaults to the single OPENAI_MODEL.
+        planner_models = [m.strip() for m in os.getenv("PLANNER_MODELS", "").split(",") if m.strip()] or [openai_model]
+        try:
+            planner_escalate_confidence = min(1.0, max(0.0, float(os.getenv("PLANNER_ESCALATE_CONFIDENCE", "0.5"))))
+        except Exception:
+            planner_escalate_confidence = 0.5
+        planner_hedge = os.getenv("PLANNER_HEDGE", "false").lower() in {"1", "true", "yes", "on"}
+        try:
+            planner_hedge_quantile = min(0.99, max(0.5, float(os.getenv("PLANNER_HEDGE_QUANTILE", "0.9"))))
+        except Exception:
+            planner_hedge_quantile = 0.9
+        try:
+            planner_hedge_initial_delay_sec = max(0.1, float(os.getenv("PLANNER_HEDGE_INITIAL_DELAY_SEC", "4")))
+        except Exception:
+            planner_hedge_initial_delay_sec = 4.0
+        try:
+            planner_hedge_min_delay_sec = max(0.05, float(os.getenv("PLANNER_HEDGE_MIN_DELAY_SEC", "0.5")))
+        except Exception:
+            planner_hedge_min_delay_sec = 0.5
+        planner_hedge_model = os.getenv("PLANNER_HEDGE_MODEL") or None
+        planner_hedge_base_url = os.getenv("PLANNER_HEDGE_BASE_URL") or None
+        llm_max_connections = clamp_int(os.getenv("LLM_MAX_CONNECTIONS", "20"), default=20)
+        llm_max_keepalive = clamp_int(os.getenv("LLM_MAX_KEEPALIVE", "10"), default=10, min_value=0)
+        try:
+            llm_keepalive_expiry_sec = max(1.0, float(os.getenv("LLM_KEEPALIVE_EXPIRY_SEC", "30")))
+        except Exception:
+            llm_keepalive_expiry_sec = 30.0
+        # 0 disables the corresponding token bucket.
+        llm_requests_per_minute = clamp_int(os.getenv("LLM_RPM", "0"), default=0, min_value=0)
+        llm_tokens_per_minute = clamp_int(os.getenv("LLM_TPM", "0"), default=0, min_value=0)
+        llm_max_retries = clamp_int(os.getenv("LLM_MAX_RETRIES", "4"), default=4, min_value=0)
+        try:
+            llm_backoff_base_sec = max(0.05, float(os.getenv("LLM_BACKOFF_BASE_SEC", "0.5")))
+        except Exception:
+            llm_backoff_base_sec = 0.5
+        try:
+            llm_backoff_max_sec = max(llm_backoff_base_sec, float(os.getenv("LLM_BACKOFF_MAX_SEC", "20")))
+        except Exception:
+            llm_backoff_max_sec = 20.0
+        max_concurrent_goals = clamp_int(os.getenv("MAX_CONCURRENT_GOALS", "1"), default=1)
+        max_browser_contexts = clamp_int(os.getenv("MAX_BROWSER_CONTEXTS", "4"), default=4)
+        farm_workers = clamp_int(os.getenv("FARM_WORKERS", str(min(4, os.cpu_count() or 1))), default=min(4, os.cpu_count() or 1))
+        farm_worker_retries = clamp_int(os.getenv("FARM_WORKER_RETRIES", "1"), default=1, min_value=0)
+        daemon_host = os.getenv("DAEMON_HOST", "127.0.0.1")
+        daemon_port = clamp_int(os.getenv("DAEMON_PORT", "8770"), default=8770)
+        daemon_socket = os.getenv("DAEMON_SOCKET") or None
+        cdp_endpoint = os.getenv("CDP_ENDPOINT") or None
+        sidecar_port = clamp_int(os.getenv("SIDECAR_PORT", "9222"), default=9222)
+        sidecar_headless = os.getenv("SIDECAR_HEADLESS", "true").lower() in {"1", "true", "yes", "on"}
+        route_profile = os.getenv("ROUTE_PROFILE", "off").lower()
+        if route_profile not in {"off", "light", "aggressive"}:
+            route_profile = "off"
+        route_block_types = [t.strip().lower() for t in os.getenv("ROUTE_BLOCK_TYPES", "").split(",") if t.strip()]
+        route_block_domains = [d.strip().lower() for d in os.getenv("ROUTE_BLOCK_DOMAINS", "").split(",") if d.strip()]
+        route_allow_domains = [d.strip().lower() for d in os.getenv("ROUTE_ALLOW_DOMAINS", "").split(",") if d.strip()]
+        har_mode = os.getenv("HAR_MODE", "off").lower()
+        if har_mode not in {"off", "record", "replay"}:
+            har_mode = "off"
+        # cache_dir, not state_dir: state_dir is wiped between goals (main.clean_between_goals).
+        har_path = Path(os.getenv("HAR_PATH") or (paths.cache_dir / "har" / "run.har")).expanduser()
+        har_url_filter = os.getenv("HAR_URL_FILTER") or None
+        har_not_found = os.getenv("HAR_NOT_FOUND", "abort").lower()
+        if har_not_found not in {"abort", "fallback"}:
+            har_not_found = "abort"
+        try:
+            tab_idle_ttl_sec = max(0.0, float(os.getenv("TAB_IDLE_TTL_SEC", "600")))
+        except Exception:
+            tab_idle_ttl_sec = 600.0
+        max_tabs = clamp_int(os.getenv("MAX_TABS", "8"), default=8, min_value=0)
+        memory_recycle_mb = clamp_int(os.getenv("MEMORY_RECYCLE_MB", "1024"), default=1024, min_value=0)
+        nav_wait_until = os.getenv("NAV_WAIT_UNTIL", "")
+        nav_settle_quiet_ms = clamp_int(os.getenv("NAV_SETTLE_QUIET_MS", "300"), default=300, min_value=0)
+        nav_settle_max_ms = clamp_int(os.getenv("NAV_SETTLE_MAX_MS", "2000"), default=2000, min_value=0)
+        try:
+            nav_timeout_min_sec = max(0.5, float(os.getenv("NAV_TIMEOUT_MIN_SEC", "3")))
+        except Exception:
+            nav_timeout_min_sec = 3.0
+        try:
+            nav_timeout_multiplier = max(1.0, float(os.getenv("NAV_TIMEOUT_MULTIPLIER", "3")))
+        except Exception:
+            nav_timeout_multiplier = 3.0
+        click_fast_path = os.getenv("CLICK_FAST_PATH", "true").lower() in {"1", "true", "yes", "on"}
+        fused_actions = os.getenv("FUSED_ACTIONS", "true").lower() in {"1", "true", "yes", "on"}
+        fallback_learning = os.getenv("FALLBACK_LEARNING", "true").lower() in {"1", "true", "yes", "on"}
+        fallback_min_attempts = clamp_int(os.getenv("FALLBACK_MIN_ATTEMPTS", "3"), default=3)
+        observe_probe_reuse = os.getenv("OBSERVE_PROBE_REUSE", "true").lower() in {"1", "true", "yes", "on"}
+        checkpoint_enabled = os.getenv("CHECKPOINT_ENABLED", "false").lower() in {"1", "true", "yes", "on"}
+        checkpoint_path = Path(os.getenv("CHECKPOINT_PATH") or (paths.cache_dir / "checkpoints.sqlite")).expanduser()
+        timing_spans = os.getenv("TIMING_SPANS", "true").lower() in {"1", "true", "yes", "on"}
+        profile_mode = os.getenv("PROFILE_MODE", "off").lower()
+        if profile_mode not in {"off", "cprofile", "sample", "both"}:
+            profile_mode = "off"
+        profile_sample_ms = clamp_int(os.getenv("PROFILE_SAMPLE_MS", "5"), default=5)
 
         return cls(
             openai_api_key=openai_api_key,
@@ -162,5 +309,58 @@ class Settings:
             scroll_step=scroll_step,
             max_planner_calls=max_planner_calls,
             max_no_progress_steps=max_no_progress_steps,
+            planner_streaming=planner_streaming,
+            planner_models=planner_models,
+            planner_escalate_confidence=planner_escalate_confidence,
+            planner_hedge=planner_hedge,
+            planner_hedge_quantile=planner_hedge_quantile,
+            planner_hedge_initial_delay_sec=planner_hedge_initial_delay_sec,
+            planner_hedge_min_delay_sec=planner_hedge_min_delay_sec,
+            planner_hedge_model=planner_hedge_model,
+            planner_hedge_base_url=planner_hedge_base_url,
+            llm_max_connections=llm_max_connections,
+            llm_max_keepalive=llm_max_keepalive,
+            llm_keepalive_expiry_sec=llm_keepalive_expiry_sec,
+            llm_requests_per_minute=llm_requests_per_minute,
+            llm_tokens_per_minute=llm_tokens_per_minute,
+            llm_max_retries=llm_max_retries,
+            llm_backoff_base_sec=llm_backoff_base_sec,
+            llm_backoff_max_sec=llm_backoff_max_sec,
+            max_concurrent_goals=max_concurrent_goals,
+            max_browser_contexts=max_browser_contexts,
+            farm_workers=farm_workers,
+            farm_worker_retries=farm_worker_retries,
+            daemon_host=daemon_host,
+            daemon_port=daemon_port,
+            daemon_socket=daemon_socket,
+            cdp_endpoint=cdp_endpoint,
+            sidecar_port=sidecar_port,
+            sidecar_headless=sidecar_headless,
+            route_profile=route_profile,
+            route_block_types=route_block_types,
+            route_block_domains=route_block_domains,
+            route_allow_domains=route_allow_domains,
+            har_mode=har_mode,
+            har_path=har_path,
+            har_url_filter=har_url_filter,
+            har_not_found=har_not_found,
+            tab_idle_ttl_sec=tab_idle_ttl_sec,
+            max_tabs=max_tabs,
+            memory_recycle_mb=memory_recycle_mb,
+            nav_wait_until=nav_wait_until,
+            nav_settle_quiet_ms=nav_settle_quiet_ms,
+            nav_settle_max_ms=nav_settle_max_ms,
+            nav_timeout_min_sec=nav_timeout_min_sec,
+            nav_timeout_multiplier=nav_timeout_multiplier,
+            click_fast_path=click_fast_path,
+            fused_actions=fused_actions,
+            fallback_learning=fallback_learning,
+            fallback_min_attempts=fallback_min_attempts,
+            observe_probe_reuse=observe_probe_reuse,
+            checkpoint_enabled=checkpoint_enabled,
+            checkpoint_path=checkpoint_path,
+            timing_spans=timing_spans,
+            profile_mode=profile_mode,
+            profile_sample_ms=profile_sample_ms,
             paths=paths,
         )
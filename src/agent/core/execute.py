@@ -2,15 +2,19 @@ from __future__ import annotations
 
 import json
 import re
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from playwright.async_api import Page
 
 from agent.config.config import Settings
+from agent.core.fallback_stats import FallbackStats
 from agent.core.observe import Observation, capture_observation
+from agent.infra.navigation import NavigationStrategy
+from agent.infra.timing import CDP, IO, timed
 
 
 @dataclass
@@ -20,6 +24,8 @@ class ExecutionResult:
     error: Optional[str]
     screenshot_path: Optional[Path]
     recorded_at: str
+    # Timing/diagnostics (e.g. "navigation": wait state, nav_ms, settle_ms, timeout).
+    details: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -28,9 +34,11 @@ class ExecutionResult:
             "action": self.action,
             "error": self.error,
             "screenshot_path": str(self.screenshot_path) if self.screenshot_path else None,
+            "details": self.details,
         }
 
 
+@timed("artifact.execute", IO)
 def save_execution_result(result: ExecutionResult, state_dir: Path, *, label: Optional[str] = None) -> Path:
     state_dir.mkdir(parents=True, exist_ok=True)
     timestamp_for_file = result.recorded_at.replace(":", "").replace("-", "")
@@ -49,6 +57,125 @@ async def _locate_element(page: Page, element_id: int):
     return locator.first
 
 
+# Fused locate → scroll → visible/enabled check → (hit-test | focus → set value → submit) in one round trip.
+# Failures report the sub-step in `stage` so the fallback chain can pick the matching remedy.
+_ACT_JS = """
+({ id, op, value, submit }) => {
+  const fail = (stage, reason) => ({ ok: false, stage, reason });
+  let el = document.querySelector(`[data-agent-id="${id}"]`);
+  if (!el) return fail("locate", "element not found");
+  if (op === "fill" && el instanceof HTMLLabelElement && el.control) el = el.control;
+  const inView = (r) => {
+    const cx = r.left + r.width / 2;
+    const cy = r.top + r.height / 2;
+    return cx >= 0 && cy >= 0 && cx < window.innerWidth && cy < window.innerHeight;
+  };
+  let r = el.getBoundingClientRect();
+  let scrolled = false;
+  if (!inView(r)) {
+    el.scrollIntoView({ block: "center", inline: "center", behavior: "instant" });
+    r = el.getBoundingClientRect();
+    scrolled = true;
+  }
+  const style = window.getComputedStyle(el);
+  if (r.width < 1 || r.height < 1 || style.visibility === "hidden" || style.display === "none" || !inView(r)) {
+    return fail("visible", "element is not visible");
+  }
+  if (el.disabled || el.getAttribute("aria-disabled") === "true") return fail("enabled", "element is disabled");
+  const box = { x: r.left + window.scrollX, y: r.top + window.scrollY, width: r.width, height: r.height };
+  if (op === "click") {
+    const cx = r.left + r.width / 2;
+    const cy = r.top + r.height / 2;
+    const hit = document.elementFromPoint(cx, cy);
+    if (!hit || !(hit === el || el.contains(hit))) return fail("obscured", "another element covers the target");
+    return { ok: true, x: cx, y: cy, scrolled, box };
+  }
+  const nonText = ["checkbox", "radio", "button", "submit", "reset", "file", "image", "hidden", "range", "color"];
+  const isInput = el instanceof HTMLInputElement && !nonText.includes(el.type);
+  if (!(isInput || el instanceof HTMLTextAreaElement || el.isContentEditable) || el.readOnly) {
+    return fail("editable", "element does not accept text");
+  }
+  el.focus();
+  if (document.activeElement !== el && !el.contains(document.activeElement)) return fail("focus", "element did not take focus");
+  const text = String(value ?? "");
+  if (el.isContentEditable) {
+    el.textContent = text;
+  } else {
+    // The prototype setter (not el.value =) so framework-controlled inputs see the change.
+    const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, "value").set.call(el, text);
+  }
+  el.dispatchEvent(new Event("input", { bubbles: true }));
+  el.dispatchEvent(new Event("change", { bubbles: true }));
+  if ((el.isContentEditable ? el.textContent : el.value) !== text) return fail("value", "value was rejected");
+  if (!submit) return { ok: true, scrolled, box, submitted: false };
+  if (el.form) {
+    try {
+      el.form.requestSubmit();
+    } catch (e) {
+      return fail("submit", String(e));
+    }
+    return { ok: true, scrolled, box, submitted: true };
+  }
+  return { ok: true, scrolled, box, submitted: false, needs_enter: true };
+}
+"""
+
+
+class ActionStageError(RuntimeError):
+    """A fused in-page action failed at `stage` (locate/visible/enabled/obscured/editable/focus/value/submit)."""
+
+    def __init__(self, stage: str, reason: str) -> None:
+        super().__init__(f"{stage}: {reason}")
+        self.stage = stage
+
+
+def _mark_by_id(observation: Observation, element_id: Optional[int]):
+    if element_id is None:
+        return None
+    for el in observation.mapping:
+        if el.id == element_id:
+            return el
+    return None
+
+
+@timed("act_js", CDP)
+async def _fused_act(
+    page: Page, element_id: int, op: str, *, value: Optional[str] = None, submit: bool = False
+) -> Dict[str, Any]:
+    try:
+        return await page.evaluate(_ACT_JS, {"id": element_id, "op": op, "value": value, "submit": submit})
+    except Exception as exc:
+        if submit and "context was destroyed" in str(exc).lower():
+            # requestSubmit navigated before evaluate could return.
+            return {"ok": True, "submitted": True}
+        return {"ok": False, "stage": "evaluate", "reason": str(exc)}
+
+
+def _moved(observation: Observation, element_id: int, box: Optional[Dict[str, float]]) -> bool:
+    mark = _mark_by_id(observation, element_id)
+    if mark is None or not box:
+        return False
+    cached = mark.bbox
+    return any(
+        abs(a - b) > 2
+        for a, b in zip(
+            (cached.x, cached.y, cached.width, cached.height), (box["x"], box["y"], box["width"], box["height"])
+        )
+    )
+
+
+async def prepare_element(page: Page, element_id: int, *, timeout_ms: float = 2000) -> bool:
+    """Best-effort pre-resolve: scroll the target into view while the planner response is still streaming."""
+    try:
+        locator = page.locator(f'[data-agent-id="{element_id}"]').first
+        await locator.scroll_into_view_if_needed(timeout=timeout_ms)
+        return True
+    except Exception:
+        return False
+
+
+@timed("execute_action", CDP)
 async def execute_action(
     page: Page,
     observation: Observation,
@@ -58,6 +185,9 @@ async def execute_action(
     submit_after_type: bool = False,
     screenshot_label: Optional[str] = None,
     scroll_step: int = 600,
+    navigator: Optional[NavigationStrategy] = None,
+    fast_click: bool = False,
+    fused: bool = False,
 ) -> ExecutionResult:
     now = datetime.now(timezone.utc)
     recorded_at = now.isoformat()
@@ -75,26 +205,30 @@ async def execute_action(
         )
 
     try:
-        if action_type == "go_back":
-            await page.go_back()
-            screenshot = await _maybe_capture(page, screenshots_dir, prefix="exec-back", label=screenshot_label)
-            return ExecutionResult(True, action, None, screenshot, recorded_at)
-        if action_type == "go_forward":
-            await page.go_forward()
-            screenshot = await _maybe_capture(page, screenshots_dir, prefix="exec-forward", label=screenshot_label)
-            return ExecutionResult(True, action, None, screenshot, recorded_at)
-        if action_type == "navigate":
-            if not value:
+        if action_type in {"go_back", "go_forward", "navigate"}:
+            if action_type == "navigate" and not value:
                 raise RuntimeError("Navigate action requires a URL in 'value'.")
-            await page.goto(str(value))
-            screenshot = await _maybe_capture(page, screenshots_dir, prefix="exec-navigate", label=screenshot_label)
-            return ExecutionResult(True, action, None, screenshot, recorded_at)
+            details: Dict[str, Any] = {}
+            if navigator is not None:
+                details["navigation"] = await navigator.navigate(page, action_type, str(value) if value else None)
+            elif action_type == "go_back":
+                await page.go_back()
+            elif action_type == "go_forward":
+                await page.go_forward()
+            else:
+                await page.goto(str(value))
+            prefix = {"go_back": "exec-back", "go_forward": "exec-forward"}.get(action_type, "exec-navigate")
+            screenshot = await _maybe_capture(page, screenshots_dir, prefix=prefix, label=screenshot_label)
+            return ExecutionResult(True, action, None, screenshot, recorded_at, details)
         if action_type == "search":
             if not value:
                 raise RuntimeError("Search action requires a query in 'value'.")
             # If element_id is provided, focus that element before typing; otherwise fallback to omnibox.
             query = str(value)
-            if element_id is not None:
+            details = {}
+            if element_id is not None and fused:
+                details["fused"] = await _fill_fused(page, int(element_id), query, submit=True)
+            elif element_id is not None:
                 locator = await _locate_element(page, int(element_id))
                 await locator.scroll_into_view_if_needed()
                 try:
@@ -114,8 +248,11 @@ async def execute_action(
                     await page.keyboard.press("Control+L")
                     await page.keyboard.type(query)
                     await page.keyboard.press("Enter")
+            if navigator is not None:
+                # Enter usually triggers a results navigation or re-render; wait for the DOM to go quiet.
+                details["navigation"] = {"action": "search", **await navigator.settle(page)}
             screenshot = await _maybe_capture(page, screenshots_dir, prefix="exec-search", label=screenshot_label)
-            return ExecutionResult(True, action, None, screenshot, recorded_at)
+            return ExecutionResult(True, action, None, screenshot, recorded_at, details)
         if action_type == "scroll":
             if element_id is None:
                 await page.mouse.wheel(0, scroll_step)
@@ -128,25 +265,60 @@ async def execute_action(
         if action_type == "click":
             if element_id is None:
                 raise RuntimeError("Click action requires element_id.")
-            locator = await _locate_element(page, int(element_id))
-            await locator.scroll_into_view_if_needed()
-            await locator.click()
+            details = await _click_element(page, observation, int(element_id), fast_click=fast_click)
             screenshot = await _maybe_capture(page, screenshots_dir, prefix="exec-click", label=screenshot_label)
-            return ExecutionResult(True, action, None, screenshot, recorded_at)
+            return ExecutionResult(True, action, None, screenshot, recorded_at, details)
 
         if action_type == "type":
             if value is None:
                 raise RuntimeError("Type action requires a non-null value.")
-            locator = await _locate_element(page, int(element_id))
-            await locator.scroll_into_view_if_needed()
-            await locator.fill(str(value))
-            if submit_after_type:
-                try:
-                    await page.keyboard.press("Enter")
-                except Exception:
-                    pass
+            details = {}
+            if fused:
+                details["fused"] = await _fill_fused(page, int(element_id), str(value), submit=submit_after_type)
+            else:
+                locator = await _locate_element(page, int(element_id))
+                await locator.scroll_into_view_if_needed()
+                await locator.fill(str(value))
+                if submit_after_type:
+                    try:
+                        await page.keyboard.press("Enter")
+                    except Exception:
+                        pass
             screenshot = await _maybe_capture(page, screenshots_dir, prefix="exec-type", label=screenshot_label)
-            return ExecutionResult(True, action, None, screenshot, recorded_at)
+            return ExecutionResult(True, action, None, screenshot, recorded_at, details)
+
+        if action_type == "fill_form":
+            fields = action.get("fields") or []
+            if not fields:
+                raise RuntimeError("fill_form action requires a non-empty 'fields' list.")
+            results = []
+            for item in fields:
+                field_id, field_value = int(item["element_id"]), str(item.get("value") or "")
+                entry: Dict[str, Any] = {"element_id": field_id, "ok": True}
+                try:
+                    if fused:
+                        entry.update(await _fill_fused(page, field_id, field_value, submit=False))
+                    else:
+                        locator = await _locate_element(page, field_id)
+                        await locator.scroll_into_view_if_needed()
+                        await locator.fill(field_value)
+                except Exception as exc:
+                    entry.update(ok=False, error=str(exc), stage=getattr(exc, "stage", None))
+                results.append(entry)
+            details = {"fields": results}
+            failed = [entry for entry in results if not entry["ok"]]
+            if failed:
+                # Never submit a partially filled form.
+                details["failed_stage"] = failed[0].get("stage")
+                return ExecutionResult(
+                    False, action, f"{len(failed)} of {len(results)} fields failed", None, recorded_at, details
+                )
+            if element_id is not None:
+                details["submit"] = await _click_element(page, observation, int(element_id), fast_click=fast_click)
+            if navigator is not None:
+                details["navigation"] = {"action": "fill_form", **await navigator.settle(page)}
+            screenshot = await _maybe_capture(page, screenshots_dir, prefix="exec-form", label=screenshot_label)
+            return ExecutionResult(True, action, None, screenshot, recorded_at, details)
 
         if action_type == "screenshot":
             screenshot = await _capture(page, screenshots_dir, prefix="exec-shot", label=screenshot_label)
@@ -160,9 +332,43 @@ async def execute_action(
             error=str(exc),
             screenshot_path=None,
             recorded_at=recorded_at,
+            details={"failed_stage": exc.stage} if isinstance(exc, ActionStageError) else {},
         )
 
 
+async def _click_element(page: Page, observation: Observation, element_id: int, *, fast_click: bool) -> Dict[str, Any]:
+    details: Dict[str, Any] = {"click_path": "slow"}
+    fast = await _fused_act(page, element_id, "click") if fast_click else None
+    if fast and fast.get("ok") and not _moved(observation, element_id, fast.get("box")):
+        await page.mouse.click(fast["x"], fast["y"])
+        details.update(click_path="fast", scrolled=fast.get("scrolled"))
+        return details
+    if fast and not fast.get("ok") and fast.get("stage") != "evaluate":
+        # The locator path would only wait out its timeout on the same condition.
+        raise ActionStageError(fast["stage"], fast.get("reason") or "")
+    if fast:
+        # A layout shift since the observation (moved) means the page may still be settling: let Playwright's
+        # actionability checks drive the click instead of trusting a coordinate.
+        details["fast_miss"] = "moved" if fast.get("ok") else fast.get("reason")
+    locator = await _locate_element(page, element_id)
+    await locator.scroll_into_view_if_needed()
+    await locator.click()
+    return details
+
+
+async def _fill_fused(page: Page, element_id: int, value: str, *, submit: bool) -> Dict[str, Any]:
+    outcome = await _fused_act(page, element_id, "fill", value=value, submit=submit)
+    if not outcome.get("ok"):
+        raise ActionStageError(outcome.get("stage") or "evaluate", outcome.get("reason") or "")
+    if outcome.get("needs_enter"):
+        # No enclosing form: sites listen for the key itself.
+        try:
+            await page.keyboard.press("Enter")
+        except Exception:
+            pass
+    return {k: outcome.get(k) for k in ("scrolled", "submitted", "needs_enter") if k in outcome}
+
+
 def _timestamped_path(folder: Path, prefix: str, *, label: Optional[str] = None) -> Path:
     ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     if label:
@@ -171,6 +377,7 @@ def _timestamped_path(folder: Path, prefix: str, *, label: Optional[str] = None)
     return folder / f"{prefix}-{ts}.png"
 
 
+@timed("screenshot", CDP)
 async def _capture(page: Page, folder: Path, *, prefix: str, label: Optional[str] = None) -> Path:
     folder.mkdir(parents=True, exist_ok=True)
     path = _timestamped_path(folder, prefix, label=label)
@@ -200,12 +407,8 @@ async def _execute_js_click(page: Page, element_id: int) -> None:
 
 
 def _text_by_element_id(observation: Observation, element_id: Optional[int]) -> str:
-    if element_id is None:
-        return ""
-    for el in observation.mapping:
-        if el.id == element_id:
-            return el.text or ""
-    return ""
+    mark = _mark_by_id(observation, element_id)
+    return (mark.text or "") if mark else ""
 
 
 async def _execute_by_text(page: Page, text: str) -> None:
@@ -218,6 +421,40 @@ async def _execute_by_text(page: Page, text: str) -> None:
     await locator.click()
 
 
+# Remedy order per failed stage; stages the fused primitive did not report (or non-fused failures) use the default.
+_STAGE_REMEDIES: Dict[str, Tuple[str, ...]] = {
+    "locate": ("reobserve", "text_click"),
+    "visible": ("reobserve", "locator", "js_click", "text_click"),
+    "enabled": ("reobserve",),
+    "obscured": ("js_click", "reobserve", "text_click"),
+    "editable": ("locator", "reobserve"),
+    "focus": ("locator", "reobserve"),
+    "value": ("locator", "reobserve"),
+    "submit": ("locator",),
+}
+_DEFAULT_REMEDIES: Tuple[str, ...] = ("reobserve", "js_click", "text_click")
+_CLICK_REMEDIES = {"js_click", "text_click"}
+
+
+def _has_target(action: Dict[str, Any]) -> bool:
+    """An element to act on: element_id, or (fill_form) any field's element_id."""
+    if action.get("element_id") is not None:
+        return True
+    return any(isinstance(item, dict) and item.get("element_id") is not None for item in action.get("fields") or [])
+
+
+def remedy_plan(action: Dict[str, Any], failed_stage: Optional[str]) -> List[str]:
+    """Remedies to try, in order, for an action that failed at `failed_stage` (None = unknown)."""
+    action_type = action.get("action")
+    plan = _STAGE_REMEDIES.get(failed_stage or "", _DEFAULT_REMEDIES)
+    return [
+        name
+        for name in plan
+        if (action_type == "click" or name not in _CLICK_REMEDIES)
+        and (name not in {"locator", "js_click"} or _has_target(action))
+    ]
+
+
 async def execute_with_fallbacks(
     page: Page,
     settings: Settings,
@@ -229,6 +466,8 @@ async def execute_with_fallbacks(
     trace: Optional[Any] = None,
     session_id: Optional[str] = None,
     step: Optional[int] = None,
+    navigator: Optional[NavigationStrategy] = None,
+    fallback_stats: Optional[FallbackStats] = None,
 ) -> Tuple[ExecutionResult, Observation]:
     current_observation = observation
     label = observation_label or (f"{session_id}-step{step}" if session_id is not None and step is not None else None)
@@ -241,91 +480,119 @@ async def execute_with_fallbacks(
         submit_after_type=settings.type_submit_fallback,
         screenshot_label=label,
         scroll_step=settings.scroll_step,
+        navigator=navigator,
+        fast_click=settings.click_fast_path,
+        fused=settings.fused_actions,
     )
     if result.success or action.get("action") in {"ask_user", "done"}:
         return result, current_observation
 
-    scroll_direction = 1
-    for attempt_idx in range(max_reobserve_attempts):
-        if action.get("action") != "scroll":
-            try:
-                scroll_delta = settings.scroll_step * scroll_direction
-                await page.mouse.wheel(0, scroll_delta)
-                scroll_direction *= -1  # alternate direction
-            except Exception:
-                pass
-        setattr(page, "_hide_overlay", settings.hide_overlay)
-        current_observation = await capture_observation(page, settings, label=label)
-        retry_result = await execute_action(
+    async def reobserve() -> ExecutionResult:
+        nonlocal current_observation
+        retry_result = result
+        scroll_direction = 1
+        for attempt_idx in range(max_reobserve_attempts):
+            if action.get("action") != "scroll":
+                try:
+                    scroll_delta = settings.scroll_step * scroll_direction
+                    await page.mouse.wheel(0, scroll_delta)
+                    scroll_direction *= -1  # alternate direction
+                except Exception:
+                    pass
+            setattr(page, "_hide_overlay", settings.hide_overlay)
+            current_observation = await capture_observation(page, settings, label=label)
+            retry_result = await execute_action(
+                page,
+                current_observation,
+                action,
+                screenshots_dir=settings.paths.screenshots_dir,
+                scroll_step=settings.scroll_step,
+                navigator=navigator,
+                fast_click=settings.click_fast_path,
+                fused=settings.fused_actions,
+            )
+            if retry_result.success:
+                return retry_result
+            if trace and session_id is not None:
+                try:
+                    trace.write(
+                        {
+                            "step": step,
+                            "session_id": session_id,
+                            "action": action,
+                            "reobserve_attempt": attempt_idx + 1,
+                            "scroll_direction": scroll_direction,
+                            "success": retry_result.success,
+                            "error": retry_result.error,
+                        }
+                    )
+                except Exception:
+                    pass
+        return retry_result
+
+    async def locator() -> ExecutionResult:
+        # Playwright's own actionability waits and real keyboard input, for pages the in-page primitive can't drive.
+        return await execute_action(
             page,
             current_observation,
             action,
             screenshots_dir=settings.paths.screenshots_dir,
+            submit_after_type=settings.type_submit_fallback,
+            screenshot_label=label,
             scroll_step=settings.scroll_step,
+            navigator=navigator,
+        )
+
+    async def js_click() -> ExecutionResult:
+        await _execute_js_click(page, int(action["element_id"]))
+        return ExecutionResult(
+            success=True,
+            action=action,
+            error=None,
+            screenshot_path=await _maybe_capture(page, settings.paths.screenshots_dir, prefix="exec-js-click", label=label),
+            recorded_at=datetime.now(timezone.utc).isoformat(),
+        )
+
+    async def text_click() -> ExecutionResult:
+        await _execute_by_text(page, _text_by_element_id(current_observation, action.get("element_id")))
+        return ExecutionResult(
+            success=True,
+            action=action,
+            error=None,
+            screenshot_path=await _maybe_capture(
+                page, settings.paths.screenshots_dir, prefix="exec-text-click", label=label
+            ),
+            recorded_at=datetime.now(timezone.utc).isoformat(),
         )
-        if retry_result.success:
-            return retry_result, current_observation
-        result = retry_result
-        if trace and session_id is not None:
-            try:
-                trace.write(
-                    {
-                        "step": step,
-                        "session_id": session_id,
-                        "action": action,
-                        "reobserve_attempt": attempt_idx + 1,
-                        "scroll_direction": scroll_direction,
-                        "success": retry_result.success,
-                        "error": retry_result.error,
-                    }
-                )
-            except Exception:
-                pass
 
-    if action.get("action") == "click" and action.get("element_id") is not None:
+    remedies = {"reobserve": reobserve, "locator": locator, "js_click": js_click, "text_click": text_click}
+    failed_stage = result.details.get("failed_stage")
+    plan = remedy_plan(action, failed_stage)
+    stats_key = None
+    if fallback_stats is not None:
+        stats_key = FallbackStats.key_for(observation.url, _mark_by_id(observation, action.get("element_id")))
+        plan = fallback_stats.order(stats_key, plan)
+    for name in plan:
+        if name == "text_click" and not _text_by_element_id(current_observation, action.get("element_id")):
+            continue
+        started = time.perf_counter()
         try:
-            await _execute_js_click(page, int(action["element_id"]))
-            js_result = ExecutionResult(
-                success=True,
-                action=action,
-                error=None,
-                screenshot_path=await _maybe_capture(
-                    page, settings.paths.screenshots_dir, prefix="exec-js-click", label=label
-                ),
-                recorded_at=datetime.now(timezone.utc).isoformat(),
-            )
-            return js_result, current_observation
+            remedy_result = await remedies[name]()
         except Exception as exc:
-            result = ExecutionResult(
+            remedy_result = ExecutionResult(
                 success=False,
                 action=action,
                 error=str(exc),
                 screenshot_path=None,
                 recorded_at=datetime.now(timezone.utc).isoformat(),
             )
-
-    if action.get("action") == "click":
-        text = _text_by_element_id(current_observation, action.get("element_id"))
-        if text:
-            try:
-                await _execute_by_text(page, text)
-                text_result = ExecutionResult(
-                    success=True,
-                    action=action,
-                    error=None,
-                    screenshot_path=await _maybe_capture(
-                        page, settings.paths.screenshots_dir, prefix="exec-text-click", label=label
-                    ),
-                    recorded_at=datetime.now(timezone.utc).isoformat(),
-                )
-                return text_result, current_observation
-            except Exception as exc:
-                result = ExecutionResult(
-                    success=False,
-                    action=action,
-                    error=str(exc),
-                    screenshot_path=None,
-                    recorded_at=datetime.now(timezone.utc).isoformat(),
-                )
+        if fallback_stats is not None and stats_key is not None:
+            fallback_stats.record(stats_key, name, remedy_result.success, time.perf_counter() - started)
+        remedy_result.details.setdefault("remedy", name)
+        if failed_stage:
+            remedy_result.details.setdefault("initial_failed_stage", failed_stage)
+        if remedy_result.success:
+            return remedy_result, current_observation
+        result = remedy_result
 
     return result, current_observation
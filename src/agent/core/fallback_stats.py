@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from agent.core.observe import ElementMark
+
+
+class FallbackStats:
+    """Which execute remedies work where: attempts/successes/time per (domain, element role or tag) and remedy.
+
+    order() puts the historically best remedy first (smoothed success rate, then mean time) and drops remedies
+    that failed every one of at least min_attempts tries; a dropped remedy is still retried every
+    explore_every-th time so a site change can bring it back.
+    """
+
+    def __init__(self, path: Optional[Path] = None, *, min_attempts: int = 3, explore_every: int = 10) -> None:
+        self.path = path
+        self.min_attempts = max(1, min_attempts)
+        self.explore_every = max(1, explore_every)
+        self._stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path, **kwargs: Any) -> "FallbackStats":
+        stats = cls(path, **kwargs)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if isinstance(data, dict):
+                stats._stats = data
+        except (OSError, ValueError):
+            pass
+        return stats
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Concurrent runs share the file: write whole and swap, last writer wins.
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self._stats, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    @staticmethod
+    def key_for(url: Optional[str], mark: Optional[ElementMark]) -> str:
+        domain = (urlsplit(url or "").hostname or "").lower()
+        kind = (mark.role or mark.tag or "").lower() if mark is not None else ""
+        return f"{domain}|{kind or '-'}"
+
+    def _entry(self, key: str, remedy: str) -> Dict[str, float]:
+        return self._stats.setdefault(key, {}).setdefault(
+            remedy, {"attempts": 0, "successes": 0, "total_ms": 0.0, "skipped": 0}
+        )
+
+    def record(self, key: str, remedy: str, success: bool, seconds: float) -> None:
+        entry = self._entry(key, remedy)
+        entry["attempts"] += 1
+        entry["successes"] += 1 if success else 0
+        entry["total_ms"] = round(entry["total_ms"] + seconds * 1000, 1)
+        self._dirty = True
+
+    def order(self, key: str, plan: List[str]) -> List[str]:
+        known = self._stats.get(key, {})
+
+        def score(remedy: str) -> tuple:
+            entry = known.get(remedy)
+            if not entry or not entry["attempts"]:
+                return (-0.5, 0.0)
+            rate = (entry["successes"] + 1) / (entry["attempts"] + 2)
+            return (-rate, entry["total_ms"] / entry["attempts"])
+
+        ordered: List[str] = []
+        for remedy in sorted(plan, key=score):  # stable: ties keep the stage-specific order
+            entry = known.get(remedy)
+            if entry and entry["attempts"] >= self.min_attempts and not entry["successes"]:
+                entry["skipped"] = entry.get("skipped", 0) + 1
+                self._dirty = True
+                if entry["skipped"] % self.explore_every:
+                    continue
+            ordered.append(remedy)
+        return ordered
+
+    def summary(self, key: str) -> Dict[str, Dict[str, float]]:
+        return {remedy: dict(entry) for remedy, entry in self._stats.get(key, {}).items()}
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional
 
 from agent.core.graph_state import GraphState
 
@@ -13,7 +13,7 @@ except ImportError as e:  # pragma: no cover
 Node = Callable[[GraphState], Any]
 
 
-def compile_graph(nodes: Dict[str, Node]) -> Any:
+def compile_graph(nodes: Dict[str, Node], checkpointer: Optional[Any] = None) -> Any:
     workflow = StateGraph(GraphState)
 
     workflow.add_node("observe", nodes["observe"])
@@ -77,5 +77,5 @@ def compile_graph(nodes: Dict[str, Node]) -> Any:
         {"observe": "observe", END: END},
     )
 
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
 
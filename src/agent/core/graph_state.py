@@ -3,7 +3,7 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, TypedDict
+from typing import Any, Deque, Dict, List, Optional, TypedDict
 
 from agent.core.observe import Observation
 
@@ -56,16 +56,21 @@ class GraphState(TypedDict, total=False):
     avoid_elements: List[str]
     visited_urls: Dict[str, int]
     visited_elements: Dict[str, int]
-    action_history: List[Dict[str, Any]]
+    # Bounded rings (core/history_store.py); full records go to trace.jsonl.
+    action_history: Deque[Dict[str, Any]]
     last_error_context: Optional[str]
     last_progress_score: Optional[int]
     last_progress_evidence: Optional[List[str]]
-    records: List[Dict[str, Any]]
+    records: Deque[Dict[str, Any]]
+    record_seq: int
     loop_trigger: Optional[str]
     loop_trigger_sig: Optional[tuple[Any, Any, Any]]
     last_state_change: Optional[dict[str, Any]]
     url_changed: Optional[bool]
     dom_changed: Optional[bool]
+    probe: Any
+    probe_change: Optional[Dict[str, Any]]
+    observation_reused: bool
     exec_fail_counts: Dict[str, int]
     conservative_probe_done: bool
     error_retries: int
@@ -88,8 +93,8 @@ class GraphState(TypedDict, total=False):
     tab_events: List[Dict[str, Any]]
     context_events: List[Dict[str, Any]]
     intent_text: Optional[str]
-    intent_history: List[Dict[str, Any]]
-    ux_messages: List[str]
+    intent_history: Deque[Dict[str, Any]]
+    ux_messages: Deque[str]
 
 
 def mapping_hash(obs: Optional[Observation]) -> Optional[int]:
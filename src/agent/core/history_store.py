@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+# Ring sizes for the history kept in GraphState; full records live in trace.jsonl.
+RECORDS_RING = 50
+ACTION_HISTORY_RING = 50
+INTENT_HISTORY_RING = 10
+UX_MESSAGES_RING = 30
+COUNTER_CAP = 500
+
+
+def ring(maxlen: int, items: Sequence[Any] = ()) -> Deque[Any]:
+    return deque(items, maxlen=maxlen)
+
+
+def tail(items: Optional[Sequence[Any]], n: int) -> List[Any]:
+    """Last n items of a list or deque (deques can't be sliced)."""
+    if not items or n <= 0:
+        return []
+    return list(islice(items, max(0, len(items) - n), None))
+
+
+def bounded_increment(counts: Dict[str, int], key: str, *, cap: int = COUNTER_CAP) -> int:
+    """counts[key] += 1 in O(1); beyond cap keys, the least recently touched key is evicted."""
+    value = counts.pop(key, 0) + 1
+    counts[key] = value  # re-insert: dict order doubles as recency order
+    if len(counts) > cap:
+        del counts[next(iter(counts))]
+    return value
+
+
+def _summary(record_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    action = record.get("action")
+    return {
+        "id": record_id,
+        "step": record.get("step"),
+        "action": action.get("action") if isinstance(action, dict) else action,
+        "element_id": action.get("element_id") if isinstance(action, dict) else None,
+        "execute_success": record.get("execute_success"),
+        "stop_reason": record.get("stop_reason"),
+    }
+
+
+def add_record(state: Dict[str, Any], record: Dict[str, Any]) -> str:
+    """Stamp record["record_id"] and push its summary into the bounded state["records"].
+
+    Callers write the full record to trace.jsonl right after; the id finds it there, so no second copy is kept.
+    """
+    seq = int(state.get("record_seq") or 0) + 1
+    record_id = f"{state.get('session_id')}-r{seq}"
+    record["record_id"] = record_id
+    records = state.get("records")
+    if not isinstance(records, deque):
+        records = ring(RECORDS_RING, records or ())
+        state["records"] = records
+    records.append(_summary(record_id, record))
+    state["record_seq"] = seq
+    return record_id
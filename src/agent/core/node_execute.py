@@ -1,18 +1,27 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 from agent.config.config import Settings
 from agent.core.graph_state import GraphState, candidate_hash, extract_candidates, goal_tokens, mapping_hash
 from agent.core.execute import ExecutionResult, execute_with_fallbacks, save_execution_result
+from agent.core.fallback_stats import FallbackStats
+from agent.core.history_store import ACTION_HISTORY_RING, add_record, bounded_increment, ring, tail
+from agent.core.probe import probe_diff, probe_page
 from agent.infra.capture import capture_with_retry
 from agent.io.ux_narration import append_ux
 from agent.infra.runtime import BrowserRuntime
 from agent.infra.tracing import generate_step_id
 
 
+def _action_ring(state: GraphState):
+    history = state.get("action_history")
+    return history if isinstance(history, deque) else ring(ACTION_HISTORY_RING, history or ())
+
+
 def make_execute_node(
     *,
     settings: Settings,
@@ -20,6 +29,7 @@ def make_execute_node(
     execute_enabled: bool,
     text_log: Any,
     trace: Optional[Any] = None,
+    fallback_stats: Optional[FallbackStats] = None,
 ) -> Any:
     async def execute_node(state: GraphState) -> GraphState:
         observation = state["observation"]
@@ -131,17 +141,16 @@ def make_execute_node(
                 "active_tab_id": active_tab_id,
                 "tab_events": tab_events[-3:] if tab_events else [],
                 "intent": state.get("intent_text"),
-                "intent_history": (state.get("intent_history") or [])[-3:],
-                "ux_messages": ux_messages[-3:] if ux_messages else [],
+                "intent_history": tail(state.get("intent_history"), 3),
+                "ux_messages": tail(ux_messages, 3),
             }
-            records = state.get("records", [])
-            records.append(record)
+            add_record(state, record)
             if trace:
                 try:
                     trace.write(record)
                 except Exception:
                     pass
-            action_history = state.get("action_history", [])
+            action_history = _action_ring(state)
             action_history.append(
                 {
                     "action": action.get("action"),
@@ -151,15 +160,14 @@ def make_execute_node(
                     "dom_changed": dom_changed,
                 }
             )
-            visited_urls = dict(state.get("visited_urls", {}))
+            visited_urls = state.get("visited_urls", {})
             if new_obs:
-                visited_urls[new_obs.url] = visited_urls.get(new_obs.url, 0) + 1
+                bounded_increment(visited_urls, new_obs.url)
             candidate_list = extract_candidates(new_obs.mapping, goal_tokens(state["goal"]), limit=10) if new_obs else state.get("candidate_elements", [])
             return {
                 **state,
                 "planner_result": planner_result,
                 "exec_result": exec_result,
-                "records": records,
                 "visited_elements": state.get("visited_elements", {}),
                 "visited_urls": visited_urls,
                 "avoid_elements": list(state.get("avoid_elements", [])),
@@ -182,7 +190,6 @@ def make_execute_node(
 
         if action.get("action") in {"done", "ask_user"}:
             if state.get("goal_stage") in {"orient", "context"}:
-                records = state.get("records", [])
                 record = {
                     "step": state.get("step", 0),
                     "session_id": state["session_id"],
@@ -198,13 +205,13 @@ def make_execute_node(
                     "stop_reason": "planner_disallowed_action",
                     "stop_details": f"action={action.get('action')}; stage={state.get('goal_stage')}",
                 }
-                records.append(record)
+                add_record(state, record)
                 if trace:
                     try:
                         trace.write(record)
                     except Exception:
                         pass
-                return {**state, "records": records, "stop_reason": "planner_disallowed_action", "stop_details": f"action={action.get('action')}; stage={state.get('goal_stage')}"}
+                return {**state, "stop_reason": "planner_disallowed_action", "stop_details": f"action={action.get('action')}; stage={state.get('goal_stage')}"}
             record = {
                 "step": state.get("step", 0),
                 "session_id": state["session_id"],
@@ -220,8 +227,7 @@ def make_execute_node(
                 "stop_reason": f"meta_{action.get('action')}",
                 "stop_details": None,
             }
-            records = state.get("records", [])
-            records.append(record)
+            add_record(state, record)
             if trace:
                 try:
                     trace.write(record)
@@ -229,7 +235,6 @@ def make_execute_node(
                     pass
             return {
                 **state,
-                "records": records,
                 "stop_reason": f"meta_{action.get('action')}",
                 "stop_details": None,
                 "exec_result": None,
@@ -253,6 +258,8 @@ def make_execute_node(
                             trace=trace,
                             session_id=state["session_id"],
                             step=state.get("step", 0),
+                            navigator=runtime.navigation,
+                            fallback_stats=fallback_stats,
                         ),
                         timeout=settings.execute_timeout_sec,
                     )
@@ -268,6 +275,8 @@ def make_execute_node(
                             observation,
                             max_reobserve_attempts=settings.max_reobserve_attempts,
                             observation_label=f"{state['session_id']}-step{state.get('step', 0)}",
+                            navigator=runtime.navigation,
+                            fallback_stats=fallback_stats,
                         ),
                         timeout=settings.execute_timeout_sec,
                     )
@@ -302,14 +311,13 @@ def make_execute_node(
                     "loop_trigger_sig": state.get("loop_trigger_sig"),
                     "attempts_per_element": state.get("exec_fail_counts", {}),
                 }
-                records = state.get("records", [])
-                records.append(record)
+                add_record(state, record)
                 if trace:
                     try:
                         trace.write(record)
                     except Exception:
                         pass
-                return {**state, "records": records, "stop_reason": "execute_timeout", "stop_details": f"step={state.get('step', 0)}"}
+                return {**state, "stop_reason": "execute_timeout", "stop_details": f"step={state.get('step', 0)}"}
             except Exception as exc:
                 exec_success = False
                 exec_error = str(exc)
@@ -320,23 +328,28 @@ def make_execute_node(
         avoid = set(state.get("avoid_elements", []))
         if observation:
             url = observation.url
-            visited_urls[url] = visited_urls.get(url, 0) + 1
+            bounded_increment(visited_urls, url)
         elem_id = action.get("element_id")
         if elem_id is not None:
             key = str(elem_id)
-            visited_elements[key] = visited_elements.get(key, 0) + 1
+            bounded_increment(visited_elements, key)
             if exec_success is False:
                 avoid.add(key)
             fail_counts = state.get("exec_fail_counts", {})
-            fail_counts[key] = fail_counts.get(key, 0) + 1
-            if fail_counts[key] >= settings.max_attempts_per_element:
+            if bounded_increment(fail_counts, key) >= settings.max_attempts_per_element:
                 avoid.add(key)
             state["exec_fail_counts"] = fail_counts
 
         url_changed = bool(obs_before and observation and obs_before.url != observation.url)
         dom_changed = bool(mapping_hash(obs_before) != mapping_hash(observation)) if obs_before and observation else False
+        # observation is usually still the pre-action one; the probe sees what the action actually did.
+        probe_change = probe_diff(state.get("probe"), await probe_page(await runtime.ensure_page()))
+        if probe_change["available"]:
+            url_changed = url_changed or probe_change["url_changed"]
+            dom_changed = dom_changed or probe_change["dom_changed"]
         state["last_state_change"] = {"url_changed": url_changed, "dom_changed": dom_changed}
         state["last_action_no_effect"] = not url_changed and not dom_changed
+        state["probe_change"] = probe_change
         tabs_after = await runtime.get_pages_meta()
         active_tab_id = runtime.get_active_page_id()
         tab_events = (state.get("tab_events") or []) + _tab_events(tabs_after)
@@ -382,6 +395,8 @@ def make_execute_node(
             "execute_success": exec_success,
             "execute_error": exec_error,
             "exec_result_path": str(exec_result_path) if exec_result_path else None,
+            "exec_details": exec_result.details if exec_result else None,
+            "probe_change": probe_change,
             "planner_raw_path": str(planner_result.raw_path) if planner_result and planner_result.raw_path else None,
             "loop_trigger": state.get("loop_trigger"),
             "stop_reason": state.get("stop_reason"),
@@ -396,19 +411,18 @@ def make_execute_node(
             "tab_events": tab_events[-3:] if tab_events else [],
             "context_events": context_events[-3:] if context_events else [],
             "intent": state.get("intent_text"),
-            "intent_history": (state.get("intent_history") or [])[-3:],
-            "ux_messages": ux_messages[-3:] if ux_messages else [],
+            "intent_history": tail(state.get("intent_history"), 3),
+            "ux_messages": tail(ux_messages, 3),
         }
 
-        records = state.get("records", [])
-        records.append(record)
+        add_record(state, record)
         if trace:
             try:
                 trace.write(record)
             except Exception:
                 pass
 
-        action_history = state.get("action_history", [])
+        action_history = _action_ring(state)
         action_history.append(
             {
                 "action": action.get("action"),
@@ -423,7 +437,6 @@ def make_execute_node(
             **state,
             "planner_result": planner_result,
             "exec_result": exec_result,
-            "records": records,
             "visited_elements": visited_elements,
             "visited_urls": visited_urls,
             "avoid_elements": list(avoid),
@@ -14,6 +14,7 @@ from agent.core.graph_state import (
 )
 from agent.infra.capture import capture_with_retry
 from agent.core.observe import Observation
+from agent.core.probe import probe_diff, probe_page
 from agent.infra.runtime import BrowserRuntime
 
 
@@ -27,46 +28,60 @@ def make_observe_node(
         page = await runtime.ensure_page()
         setattr(page, "_hide_overlay", settings.hide_overlay)
         setattr(page, "_mapping_boost", 0)
-        observation = await capture_with_retry(
-            runtime,
-            settings,
-            capture_screenshot=False,
-            label=f"{state['session_id']}-step{state.get('step', 0)}",
+        # Nothing the mapping is built from changed since the last capture: skip the full observation.
+        baseline = state.get("probe")
+        probe = await probe_page(page) if settings.observe_probe_reuse and baseline and state.get("observation") else None
+        # Execute locates by data-agent-id: if a re-render dropped the ids, the old mapping is unusable.
+        reused = (
+            probe is not None
+            and not probe_diff(baseline, probe)["changed"]
+            and (probe.tagged > 0 or not state["observation"].mapping)
         )
-        list_like = False
-        _, _, _, detail_confidence_tmp, _, listing_score_tmp, detail_score_tmp = progress_score(
-            state["goal"], state.get("prev_observation"), observation, {}, [kw.lower() for kw in settings.progress_keywords]
-        )
-        list_like = listing_score_tmp > detail_score_tmp and not detail_confidence_tmp
-        if list_like and len(observation.mapping) < max(5, int(settings.mapping_limit * 0.5)):
-            merged = list(observation.mapping)
-            for _ in range(2):
-                try:
-                    await asyncio.sleep(0.3)
-                except Exception:
-                    pass
-                extra = await capture_with_retry(
-                    runtime,
-                    settings,
-                    capture_screenshot=False,
-                    label=f"{state['session_id']}-step{state.get('step', 0)}-retry",
-                )
-                merged.extend(extra.mapping)
-            seen = set()
-            unique = []
-            for m in merged:
-                key = (m.tag, m.text, m.role, int(m.bbox.x), int(m.bbox.y), int(m.bbox.width), int(m.bbox.height))
-                if key in seen:
-                    continue
-                seen.add(key)
-                unique.append(m)
-            observation = Observation(
-                url=observation.url,
-                title=observation.title,
-                mapping=sorted(unique, key=lambda m: (m.bbox.y, m.bbox.x)),
-                screenshot_path=observation.screenshot_path,
-                recorded_at=observation.recorded_at,
+        if reused:
+            observation = state["observation"]
+        else:
+            observation = await capture_with_retry(
+                runtime,
+                settings,
+                capture_screenshot=False,
+                label=f"{state['session_id']}-step{state.get('step', 0)}",
             )
+            list_like = False
+            _, _, _, detail_confidence_tmp, _, listing_score_tmp, detail_score_tmp = progress_score(
+                state["goal"], state.get("prev_observation"), observation, {}, [kw.lower() for kw in settings.progress_keywords]
+            )
+            list_like = listing_score_tmp > detail_score_tmp and not detail_confidence_tmp
+            if list_like and len(observation.mapping) < max(5, int(settings.mapping_limit * 0.5)):
+                merged = list(observation.mapping)
+                for _ in range(2):
+                    try:
+                        await asyncio.sleep(0.3)
+                    except Exception:
+                        pass
+                    extra = await capture_with_retry(
+                        runtime,
+                        settings,
+                        capture_screenshot=False,
+                        label=f"{state['session_id']}-step{state.get('step', 0)}-retry",
+                    )
+                    merged.extend(extra.mapping)
+                seen = set()
+                unique = []
+                for m in merged:
+                    key = (m.tag, m.text, m.role, int(m.bbox.x), int(m.bbox.y), int(m.bbox.width), int(m.bbox.height))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    unique.append(m)
+                observation = Observation(
+                    url=observation.url,
+                    title=observation.title,
+                    mapping=sorted(unique, key=lambda m: (m.bbox.y, m.bbox.x)),
+                    screenshot_path=observation.screenshot_path,
+                    recorded_at=observation.recorded_at,
+                )
+
+            probe = await probe_page(await runtime.ensure_page())
 
         repeat_count = state.get("repeat_count", 0)
         stagnation = state.get("stagnation_count", 0)
@@ -115,6 +130,8 @@ def make_observe_node(
             "candidate_hash": candidate_hash(candidates),
             "tabs": tabs_snapshot,
             "active_tab_id": active_tab_id,
+            "probe": probe,
+            "observation_reused": reused,
         }
         if goal_satisfied:
             new_state["stop_reason"] = "goal_satisfied"
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 from agent.config.config import Settings
+from agent.core.execute import prepare_element
 from agent.core.graph_state import GraphState, classify_task_mode, goal_is_find_only, pick_committed_action, progress_score
+from agent.core.history_store import INTENT_HISTORY_RING, add_record, ring, tail
 from agent.infra.capture import capture_with_retry
 from agent.io.ux_narration import append_ux
 from agent.core.planner import Planner, PlannerResult
@@ -49,7 +52,11 @@ def make_planner_node(
         include_screenshot = len(observation.mapping) <= max(10, int(settings.mapping_limit * 0.5))
         if error_context != "none":
             include_screenshot = True
-        if include_screenshot and not observation.screenshot_path:
+        images_blocked = include_screenshot and runtime.router.require_visual()
+        if images_blocked:
+            # The page was loaded without images: fetch them, and retake a screenshot captured before that.
+            await runtime.router.reload_images(await runtime.ensure_page())
+        if include_screenshot and (images_blocked or not observation.screenshot_path):
             observation = await capture_with_retry(
                 runtime,
                 settings,
@@ -89,7 +96,7 @@ def make_planner_node(
             progress_context_parts.append(f"search_available={search_controls}")
         actions_context = "; ".join(
             f"{a.get('action')} el={a.get('element_id')} url_changed={a.get('url_changed')} dom_changed={a.get('dom_changed')}"
-            for a in state.get("action_history", [])[-5:]
+            for a in tail(state.get("action_history"), 5)
         ) or "none"
         loop_context = f"loop_trigger={state.get('loop_trigger')} auto_scrolls_used={state.get('auto_scrolls_used')} avoid={state.get('avoid_elements')} max_attempts_per_element={settings.max_attempts_per_element}"
         fail_counts = state.get("exec_fail_counts", {})
@@ -98,11 +105,11 @@ def make_planner_node(
         goal_len = len(state["goal"]) if state.get("goal") else 0
         dynamic_limit = base_limit + (10 if goal_len > 120 else 0) + (settings.loop_retry_mapping_boost if error_context != "none" else 0)
         mapping_limit = min(150, dynamic_limit)
-        allowed_actions = ["click", "scroll", "navigate", "search", "go_back", "go_forward", "switch_tab", "type"]
+        allowed_actions = ["click", "scroll", "navigate", "search", "go_back", "go_forward", "switch_tab", "type", "fill_form"]
         if goal_stage in {"context"}:
             allowed_actions = ["click", "scroll", "search", "go_back"]
         elif goal_stage in {"locate"}:
-            allowed_actions = ["click", "type", "scroll", "search", "go_back", "navigate"]
+            allowed_actions = ["click", "type", "fill_form", "scroll", "search", "go_back", "navigate"]
         elif goal_stage in {"verify"}:
             allowed_actions = ["click", "scroll", "screenshot", "go_back"]
         allowed_meta = ["done", "ask_user"] if goal_stage in {"locate", "verify"} else []
@@ -122,6 +129,14 @@ def make_planner_node(
                 "terminal_reason": None,
                 "ux_messages": ux_messages,
             }
+
+        async def prefetch_target(partial: Dict[str, Any]) -> None:
+            # Streaming mode: start resolving the target before the full tool call arrives.
+            if partial.get("action") not in {"click", "type", "search", "scroll"} or partial.get("element_id") is None:
+                return
+            page = await runtime.ensure_page()
+            await prepare_element(page, int(partial["element_id"]))
+
         try:
             planner_result = await asyncio.wait_for(
                 planner.plan(
@@ -150,10 +165,26 @@ def make_planner_node(
                     search_controls=search_controls,
                     state_change_hint=state_change_hint,
                     allowed_actions=allowed_actions,
+                    on_partial=prefetch_target if settings.planner_streaming else None,
+                    accepted_actions=allowed_actions_meta,
                 ),
                 timeout=settings.planner_timeout_sec,
             )
             state["planner_calls"] = state.get("planner_calls", 0) + (1 + planner_result.retries_used)
+            if trace:
+                plan_record = {
+                    "step": state.get("step", 0),
+                    "session_id": state["session_id"],
+                    "node": "planner",
+                    "action": planner_result.action,
+                    "planner_model": planner_result.model,
+                }
+                if len(planner.models) > 1:
+                    plan_record["planner_tiers"] = planner_result.tiers
+                try:
+                    trace.write(plan_record)
+                except Exception:
+                    pass
             action_type = planner_result.action.get("action")
             if action_type not in allowed_actions_meta:
                 state["stop_reason"] = "planner_disallowed_action"
@@ -174,7 +205,6 @@ def make_planner_node(
                 return state
         except asyncio.TimeoutError:
             text_log.write(f"[{state['session_id']}] planner timeout at step={state.get('step', 0)}; stopping")
-            records = state.get("records", [])
             planner_record = {
                 "step": state.get("step", 0),
                 "session_id": state["session_id"],
@@ -192,7 +222,7 @@ def make_planner_node(
                 "loop_trigger_sig": state.get("loop_trigger_sig"),
                 "attempts_per_element": state.get("exec_fail_counts", {}),
             }
-            records.append(planner_record)
+            add_record(state, planner_record)
             if trace:
                 try:
                     trace.write(planner_record)
@@ -200,14 +230,12 @@ def make_planner_node(
                     pass
             return {
                 **state,
-                "records": records,
                 "observation": observation,
                 "stop_reason": "planner_timeout",
                 "stop_details": f"step={state.get('step', 0)}",
             }
         except Exception as exc:
             text_log.write(f"[{state['session_id']}] planner error at step={state.get('step', 0)}: {exc}")
-            records = state.get("records", [])
             planner_record = {
                 "step": state.get("step", 0),
                 "session_id": state["session_id"],
@@ -225,7 +253,7 @@ def make_planner_node(
                 "loop_trigger_sig": state.get("loop_trigger_sig"),
                 "attempts_per_element": state.get("exec_fail_counts", {}),
             }
-            records.append(planner_record)
+            add_record(state, planner_record)
             if trace:
                 try:
                     trace.write(planner_record)
@@ -233,7 +261,6 @@ def make_planner_node(
                     pass
             return {
                 **state,
-                "records": records,
                 "observation": observation,
                 "stop_reason": "planner_error",
                 "stop_details": str(exc),
@@ -243,7 +270,9 @@ def make_planner_node(
             f"el={planner_result.action.get('element_id')} val={planner_result.action.get('value')} "
             f"reason={planner_result.action.get('reason') or 'planner_decision'} stage={goal_stage}"
         )
-        intent_history = list(state.get("intent_history") or [])
+        intent_history = state.get("intent_history")
+        if not isinstance(intent_history, deque):
+            intent_history = ring(INTENT_HISTORY_RING, intent_history or ())
         intent_history.append(
             {
                 "step": state.get("step", 0),
@@ -255,7 +284,6 @@ def make_planner_node(
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             }
         )
-        intent_history = intent_history[-10:]
         ux_messages = append_ux(state, text_log, f"plan: {intent_text}")
         return {
             **state,
@@ -11,6 +11,7 @@ from agent.core.graph_state import (
     page_type_from_scores,
     progress_score,
 )
+from agent.core.history_store import add_record
 from agent.infra.tracing import generate_step_id
 
 
@@ -34,6 +35,10 @@ def make_progress_node(
             [kw.lower() for kw in settings.progress_keywords],
         )
         state_changed = url_changed or (mapping_hash(prev_observation) != mapping_hash(observation) if prev_observation else False)
+        probe_change = state.get("probe_change") or {}
+        if probe_change.get("available"):
+            # prev_observation/observation lag one step behind the action; the post-action probe does not.
+            state_changed = state_changed or bool(probe_change.get("url_changed") or probe_change.get("dom_changed"))
         page_type = page_type_from_scores(listing_score, detail_score, detail_confidence)
         print(f"[graph] progress score={score} evidence={evidence} url_changed={url_changed} detail_confidence={detail_confidence} listing_score={listing_score} detail_score={detail_score}")
         single_hit = mapping_goal_hits >= 1 and listing_score <= 5
@@ -45,26 +50,25 @@ def make_progress_node(
             if state.get("goal_stage") in {"orient", "context"}:
                 pass
             elif mode == "auto" and detail_confidence and (not require_url or url_changed):
-                state["records"].append(
-                    {
-                        "step": state.get("step", 0),
-                        "session_id": state["session_id"],
-                        "step_id": generate_step_id(f"{state['session_id']}-progress"),
-                        "action": {"action": "done", "tool": "browser_action", "element_id": None, "value": None},
-                        "planner_retries": state.get("planner_result").retries_used if state.get("planner_result") else 0,
-                        "security_requires_confirmation": False,
-                        "execute_success": True,
-                        "execute_error": None,
-                        "exec_result_path": None,
-                        "planner_raw_path": str(state.get("planner_result").raw_path) if state.get("planner_result") and state.get("planner_result").raw_path else None,
-                        "loop_trigger": state.get("loop_trigger"),
-                        "stop_reason": "progress_auto_done",
-                        "stop_details": str(evidence),
-                    }
-                )
+                record = {
+                    "step": state.get("step", 0),
+                    "session_id": state["session_id"],
+                    "step_id": generate_step_id(f"{state['session_id']}-progress"),
+                    "action": {"action": "done", "tool": "browser_action", "element_id": None, "value": None},
+                    "planner_retries": state.get("planner_result").retries_used if state.get("planner_result") else 0,
+                    "security_requires_confirmation": False,
+                    "execute_success": True,
+                    "execute_error": None,
+                    "exec_result_path": None,
+                    "planner_raw_path": str(state.get("planner_result").raw_path) if state.get("planner_result") and state.get("planner_result").raw_path else None,
+                    "loop_trigger": state.get("loop_trigger"),
+                    "stop_reason": "progress_auto_done",
+                    "stop_details": str(evidence),
+                }
+                add_record(state, record)
                 if trace:
                     try:
-                        trace.write(state["records"][-1])
+                        trace.write(record)
                     except Exception:
                         pass
                     return {**state, "stop_reason": "progress_auto_done", "stop_details": str(evidence)}
@@ -73,51 +77,49 @@ def make_progress_node(
                     pass
                 else:
                     if not INTERACTIVE_PROMPTS:
-                        state["records"].append(
-                            {
-                                "step": state.get("step", 0),
-                                "session_id": state["session_id"],
-                                "step_id": generate_step_id(f"{state['session_id']}-progress"),
-                                "action": {"action": "ask_user", "tool": "browser_action", "element_id": None, "value": None},
-                                "planner_retries": state.get("planner_result").retries_used if state.get("planner_result") else 0,
-                                "security_requires_confirmation": False,
-                                "execute_success": True,
-                                "execute_error": None,
-                                "exec_result_path": None,
-                                "planner_raw_path": str(state.get("planner_result").raw_path) if state.get("planner_result") and state.get("planner_result").raw_path else None,
-                                "loop_trigger": state.get("loop_trigger"),
-                                "stop_reason": "progress_ask_user",
-                                "stop_details": str(evidence),
-                            }
-                        )
+                        record = {
+                            "step": state.get("step", 0),
+                            "session_id": state["session_id"],
+                            "step_id": generate_step_id(f"{state['session_id']}-progress"),
+                            "action": {"action": "ask_user", "tool": "browser_action", "element_id": None, "value": None},
+                            "planner_retries": state.get("planner_result").retries_used if state.get("planner_result") else 0,
+                            "security_requires_confirmation": False,
+                            "execute_success": True,
+                            "execute_error": None,
+                            "exec_result_path": None,
+                            "planner_raw_path": str(state.get("planner_result").raw_path) if state.get("planner_result") and state.get("planner_result").raw_path else None,
+                            "loop_trigger": state.get("loop_trigger"),
+                            "stop_reason": "progress_ask_user",
+                            "stop_details": str(evidence),
+                        }
+                        add_record(state, record)
                         if trace:
                             try:
-                                trace.write(state["records"][-1])
+                                trace.write(record)
                             except Exception:
                                 pass
                         return {**state, "stop_reason": "progress_ask_user", "stop_details": str(evidence)}
                     reply = input("[graph] Looks like goal may be done. Stop? (y/N): ").strip().lower()
                     if reply in {"y", "yes"}:
-                        state["records"].append(
-                            {
-                                "step": state.get("step", 0),
-                                "session_id": state["session_id"],
-                                "step_id": generate_step_id(f"{state['session_id']}-progress"),
-                                "action": {"action": "ask_user", "tool": "browser_action", "element_id": None, "value": None},
-                                "planner_retries": state.get("planner_result").retries_used if state.get("planner_result") else 0,
-                                "security_requires_confirmation": False,
-                                "execute_success": True,
-                                "execute_error": None,
-                                "exec_result_path": None,
-                                "planner_raw_path": str(state.get("planner_result").raw_path) if state.get("planner_result") and state.get("planner_result").raw_path else None,
-                                "loop_trigger": state.get("loop_trigger"),
-                                "stop_reason": "progress_ask_user",
-                                "stop_details": str(evidence),
-                            }
-                        )
+                        record = {
+                            "step": state.get("step", 0),
+                            "session_id": state["session_id"],
+                            "step_id": generate_step_id(f"{state['session_id']}-progress"),
+                            "action": {"action": "ask_user", "tool": "browser_action", "element_id": None, "value": None},
+                            "planner_retries": state.get("planner_result").retries_used if state.get("planner_result") else 0,
+                            "security_requires_confirmation": False,
+                            "execute_success": True,
+                            "execute_error": None,
+                            "exec_result_path": None,
+                            "planner_raw_path": str(state.get("planner_result").raw_path) if state.get("planner_result") and state.get("planner_result").raw_path else None,
+                            "loop_trigger": state.get("loop_trigger"),
+                            "stop_reason": "progress_ask_user",
+                            "stop_details": str(evidence),
+                        }
+                        add_record(state, record)
                         if trace:
                             try:
-                                trace.write(state["records"][-1])
+                                trace.write(record)
                             except Exception:
                                 pass
                         return {**state, "stop_reason": "progress_ask_user", "stop_details": str(evidence)}
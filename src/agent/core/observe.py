@@ -10,6 +10,7 @@ import re
 from playwright.async_api import Page
 
 from agent.config.config import Settings
+from agent.infra.timing import CDP, IO, span, timed
 
 JS_SET_OF_MARK = r"""
 ({ maxElements = 30, viewports = 1, hideOverlay = false } = {}) => {
@@ -225,6 +226,7 @@ class ObservationRecorder:
         self.state_dir = state_dir
         self.state_dir.mkdir(parents=True, exist_ok=True)
 
+    @timed("artifact.observation", IO)
     def save(self, observation: Observation, *, label: Optional[str] = None) -> Path:
         safe_label = _sanitize_label(label)
         timestamp_for_file = observation.recorded_at.replace(":", "").replace("-", "")
@@ -235,6 +237,7 @@ class ObservationRecorder:
         return path
 
 
+@timed("collect_marks", CDP)
 async def collect_marks(page: Page, *, max_elements: int = 30, viewports: int = 1) -> List[ElementMark]:
     raw_marks = await page.evaluate(
         JS_SET_OF_MARK,
@@ -307,7 +310,8 @@ async def capture_observation(
         safe_label = _sanitize_label(label)
         name = f"observe-{safe_label}-{ts_label}.png" if safe_label else f"observe-{ts_label}.png"
         screenshot_path = settings.paths.screenshots_dir / name
-        await page.screenshot(path=str(screenshot_path), full_page=False)
+        with span("screenshot", CDP):
+            await page.screenshot(path=str(screenshot_path), full_page=False)
 
     title = await page.title()
     observation = Observation(
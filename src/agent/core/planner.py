@@ -1,16 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
 import os
-from dataclasses import dataclass
+import re
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from jsonschema import Draft7Validator
-from openai import AsyncOpenAI
 
+from agent.config.config import Settings
 from agent.core.observe import Observation
+from agent.infra.hedging import HedgePolicy, LatencyHistory, run_hedged
+from agent.infra.llm_client import LLMClientConfig, SharedLLMClient, get_shared_client
+from agent.infra.timing import IO, LLM, span
 
 
 BROWSER_ACTION_SCHEMA: Dict[str, Any] = {
@@ -22,6 +28,7 @@ BROWSER_ACTION_SCHEMA: Dict[str, Any] = {
             "enum": [
                 "click",
                 "type",
+                "fill_form",
                 "scroll",
                 "screenshot",
                 "navigate",
@@ -35,7 +42,20 @@ BROWSER_ACTION_SCHEMA: Dict[str, Any] = {
         },
         "element_id": {"type": ["integer", "null"]},
         "value": {"type": ["string", "null"]},
+        # fill_form only: fields to fill in order; element_id is then the optional submit control.
+        "fields": {
+            "type": "array",
+            "minItems": 1,
+            "maxItems": 20,
+            "items": {
+                "type": "object",
+                "properties": {"element_id": {"type": "integer"}, "value": {"type": "string"}},
+                "required": ["element_id", "value"],
+                "additionalProperties": False,
+            },
+        },
         "requires_confirmation": {"type": "boolean"},
+        "confidence": {"type": ["number", "null"], "minimum": 0, "maximum": 1},
     },
     "required": ["tool", "action", "element_id", "value", "requires_confirmation"],
     "additionalProperties": False,
@@ -43,6 +63,13 @@ BROWSER_ACTION_SCHEMA: Dict[str, Any] = {
 
 _VALIDATOR = Draft7Validator(BROWSER_ACTION_SCHEMA)
 
+# Streaming: detect fields early from the partially received tool-call arguments.
+# element_id must be followed by a delimiter so "12" is not read as "1" mid-stream.
+_PARTIAL_ACTION_RE = re.compile(r'"action"\s*:\s*"([a-z_]+)"')
+_PARTIAL_ELEMENT_RE = re.compile(r'"element_id"\s*:\s*(null|-?\d+)\s*[,}]')
+
+PartialCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
 
 @dataclass
 class PlannerResult:
@@ -50,6 +77,8 @@ class PlannerResult:
     raw_response: Dict[str, Any]
     retries_used: int
     raw_path: Optional[Path] = None
+    model: Optional[str] = None
+    tiers: List[Dict[str, Any]] = field(default_factory=list)
 
 
 def _load_base64_image(path: Path) -> Optional[str]:
@@ -145,12 +174,94 @@ def _goal_tokens_from_title(title: str) -> list[str]:
     return [t for t in title.lower().replace(",", " ").split() if len(t) > 3]
 
 
+def _parse_partial_arguments(buffer: str) -> Dict[str, Any]:
+    """Extract action/element_id from incomplete tool-call JSON (keys absent until fully received)."""
+    parsed: Dict[str, Any] = {}
+    action_match = _PARTIAL_ACTION_RE.search(buffer)
+    if action_match:
+        parsed["action"] = action_match.group(1)
+    element_match = _PARTIAL_ELEMENT_RE.search(buffer)
+    if element_match:
+        raw_id = element_match.group(1)
+        parsed["element_id"] = None if raw_id == "null" else int(raw_id)
+    return parsed
+
+
 class Planner:
-    def __init__(self, api_key: str, model: str, *, base_url: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        *,
+        base_url: Optional[str] = None,
+        stream: bool = False,
+        models: Optional[List[str]] = None,
+        escalate_confidence: float = 0.0,
+        hedge: Optional[HedgePolicy] = None,
+        llm_config: Optional[LLMClientConfig] = None,
+    ) -> None:
         if not api_key:
             raise ValueError("OPENAI_API_KEY is required for Planner.")
-        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url)
-        self.model = model
+        # Shared per (key, endpoint): planners in one process reuse the pool and rate limits.
+        self.client = get_shared_client(api_key, base_url, llm_config)
+        self.hedge = hedge if hedge and hedge.enabled else None
+        self.hedge_client = (
+            get_shared_client(api_key, hedge.base_url, llm_config) if self.hedge and hedge.base_url else self.client
+        )
+        self.latency: Dict[str, LatencyHistory] = {}
+        # Cascade tiers: cheapest first; a single model means no escalation.
+        self.models = list(models) if models else [model]
+        self.model = self.models[0]
+        self.stream = stream
+        self.escalate_confidence = escalate_confidence
+        self.tier_stats: List[Dict[str, Any]] = [
+            {
+                "model": m,
+                "calls": 0,
+                "accepted": 0,
+                "escalations": 0,
+                "latency_ms_total": 0.0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+            }
+            for m in self.models
+        ]
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "Planner":
+        return cls(
+            api_key=settings.openai_api_key or "",
+            model=settings.openai_model,
+            base_url=settings.openai_base_url,
+            stream=settings.planner_streaming,
+            models=settings.planner_models,
+            escalate_confidence=settings.planner_escalate_confidence,
+            hedge=HedgePolicy.from_settings(settings),
+            llm_config=LLMClientConfig.from_settings(settings),
+        )
+
+    def cascade_summary(self) -> List[Dict[str, Any]]:
+        """Per-tier counters with derived mean latency and escalation rate."""
+        summary = []
+        for tier, stats in enumerate(self.tier_stats):
+            calls = stats["calls"]
+            summary.append(
+                {
+                    **stats,
+                    "tier": tier,
+                    "mean_latency_ms": round(stats["latency_ms_total"] / calls, 1) if calls else None,
+                    "escalation_rate": round(stats["escalations"] / calls, 3) if calls else None,
+                }
+            )
+        return summary
+
+    def _escalation_reason(self, action: Dict[str, Any], accepted_actions: Optional[List[str]]) -> Optional[str]:
+        if accepted_actions and action.get("action") not in accepted_actions:
+            return "disallowed_action"
+        confidence = action.get("confidence")
+        if confidence is not None and confidence < self.escalate_confidence:
+            return "low_confidence"
+        return None
 
     async def plan(
         self,
@@ -179,66 +290,177 @@ class Planner:
         candidate_elements: Optional[List[Dict[str, Any]]] = None,
         search_controls: Optional[List[int]] = None,
         state_change_hint: Optional[str] = None,
-        backoff_on_rate_limit: float = 1.0,
         allowed_actions: Optional[List[str]] = None,
+        on_partial: Optional[PartialCallback] = None,
+        accepted_actions: Optional[List[str]] = None,
+    ) -> PlannerResult:
+        context: Dict[str, Any] = {
+            "goal": goal,
+            "observation": observation,
+            "recent_observations": recent_observations or [],
+            "include_screenshot": include_screenshot,
+            "mapping_limit": mapping_limit,
+            "loop_flag": loop_flag,
+            "loop_exhausted": loop_exhausted,
+            "avoid_elements": avoid_elements,
+            "error_context": error_context,
+            "progress_context": progress_context,
+            "actions_context": actions_context,
+            "listing_detected": listing_detected,
+            "explore_mode": explore_mode,
+            "avoid_search": avoid_search,
+            "search_no_change": search_no_change,
+            "page_type": page_type,
+            "task_mode": task_mode,
+            "avoid_actions": avoid_actions,
+            "candidate_elements": candidate_elements,
+            "search_controls": search_controls,
+            "state_change_hint": state_change_hint,
+            "allowed_actions": allowed_actions,
+            "on_partial": on_partial,
+        }
+        tiers: List[Dict[str, Any]] = []
+        start_tier = 0
+        if len(self.models) > 1:
+            # Hard steps skip the cheap tier entirely.
+            if loop_flag:
+                start_tier = 1
+                tiers.append({"tier": 0, "model": self.models[0], "outcome": "skipped", "reason": "loop_flag"})
+            elif error_context and error_context != "none":
+                start_tier = 1
+                tiers.append({"tier": 0, "model": self.models[0], "outcome": "skipped", "reason": "error_context"})
+        accepted = accepted_actions or (allowed_actions + ["done", "ask_user"] if allowed_actions else None)
+        calls_used = 0
+        last_error: Optional[Exception] = None
+        for tier in range(start_tier, len(self.models)):
+            model = self.models[tier]
+            is_last = tier == len(self.models) - 1
+            stats = self.tier_stats[tier]
+            started = time.monotonic()
+            try:
+                # Cheap tiers get a single attempt: a failure escalates instead of retrying.
+                result = await self._plan_with_model(
+                    model,
+                    context,
+                    max_retries=max_retries if is_last else 0,
+                    raw_log_dir=raw_log_dir,
+                    step_id=step_id,
+                )
+            except Exception as e:
+                latency_ms = round((time.monotonic() - started) * 1000, 1)
+                calls_used += (max_retries + 1) if is_last else 1
+                stats["calls"] += 1
+                stats["latency_ms_total"] += latency_ms
+                if not is_last:
+                    stats["escalations"] += 1
+                tiers.append({"tier": tier, "model": model, "outcome": "error", "reason": str(e), "latency_ms": latency_ms})
+                last_error = e
+                continue
+            latency_ms = round((time.monotonic() - started) * 1000, 1)
+            calls_used += 1 + result.retries_used
+            usage = result.raw_response.get("usage") or {}
+            stats["calls"] += 1
+            stats["latency_ms_total"] += latency_ms
+            stats["prompt_tokens"] += int(usage.get("prompt_tokens") or 0)
+            stats["completion_tokens"] += int(usage.get("completion_tokens") or 0)
+            tier_record = {
+                "tier": tier,
+                "model": model,
+                "latency_ms": latency_ms,
+                "prompt_tokens": usage.get("prompt_tokens"),
+                "completion_tokens": usage.get("completion_tokens"),
+                "confidence": result.action.get("confidence"),
+            }
+            reason = self._escalation_reason(result.action, accepted)
+            if reason and not is_last:
+                stats["escalations"] += 1
+                tiers.append({**tier_record, "outcome": "escalated", "reason": reason})
+                continue
+            stats["accepted"] += 1
+            tiers.append({**tier_record, "outcome": "accepted", "reason": reason})
+            result.retries_used = calls_used - 1
+            result.model = model
+            result.tiers = tiers
+            return result
+        if len(self.models) == 1:
+            raise last_error if last_error else RuntimeError("Planner failed without a result.")
+        raise RuntimeError(f"Planner cascade exhausted after {len(tiers)} tiers: {last_error}")
+
+    async def _plan_with_model(
+        self,
+        model: str,
+        context: Dict[str, Any],
+        *,
+        max_retries: int,
+        raw_log_dir: Optional[Path],
+        step_id: Optional[str],
     ) -> PlannerResult:
         retries_used = 0
         last_error: Optional[Exception] = None
         for attempt in range(max_retries + 1):
             try:
-                action, raw = await self._plan_once(
-                    goal=goal,
-                    observation=observation,
-                    recent_observations=recent_observations or [],
-                    include_screenshot=include_screenshot,
-                    mapping_limit=mapping_limit,
-                    loop_flag=loop_flag,
-                    loop_exhausted=loop_exhausted,
-                    avoid_elements=avoid_elements,
-                    error_context=error_context,
-                    progress_context=progress_context,
-                    actions_context=actions_context,
-                    listing_detected=listing_detected,
-                    explore_mode=explore_mode,
-                    avoid_search=avoid_search,
-                    search_no_change=search_no_change,
-                    page_type=page_type,
-                    task_mode=task_mode,
-                    avoid_actions=avoid_actions,
-                    candidate_elements=candidate_elements,
-                    search_controls=search_controls,
-                    state_change_hint=state_change_hint,
-                    allowed_actions=allowed_actions,
-                )
-                _VALIDATOR.validate(action)
+                action, raw = await self._plan_once_hedged(model, context)
+                with span("schema_validate"):
+                    _VALIDATOR.validate(action)
                 raw_path = None
                 if raw_log_dir:
                     raw_log_dir.mkdir(parents=True, exist_ok=True)
                     label = step_id or f"step-{attempt}"
                     raw_path = raw_log_dir / f"planner-{label}.json"
-                    with raw_path.open("w", encoding="utf-8") as f:
+                    with span("artifact.planner_raw", IO), raw_path.open("w", encoding="utf-8") as f:
                         json.dump(raw, f, ensure_ascii=False, indent=2)
                 return PlannerResult(action=action, raw_response=raw, retries_used=retries_used, raw_path=raw_path)
             except Exception as e:
-                msg = str(e).lower()
-                if ("rate limit" in msg or "rate_limit" in msg) and attempt < max_retries:
-                    retries_used = attempt
-                    last_error = e
-                    try:
-                        import asyncio
-                        if backoff_on_rate_limit > 0:
-                            await asyncio.sleep(backoff_on_rate_limit)
-                    except Exception:
-                        pass
-                    continue
+                # Rate limits/transient HTTP errors are retried inside SharedLLMClient.
                 retries_used = attempt
                 last_error = e
                 continue
         raise RuntimeError(f"Planner failed after {max_retries + 1} attempts: {last_error}")
 
+    async def _plan_once_hedged(self, model: str, context: Dict[str, Any]) -> (Dict[str, Any], Dict[str, Any]):
+        """Fire a second identical request after a p-quantile delay; the first response wins."""
+        history = self.latency.setdefault(model, LatencyHistory())
+        if not self.hedge:
+            started = time.monotonic()
+            action, raw = await self._plan_once(model=model, **context)
+            history.record(time.monotonic() - started)
+            return action, raw
+        delay = self.hedge.delay_for(history)
+        hedge_model = self.hedge.model or model
+
+        async def primary() -> (Dict[str, Any], Dict[str, Any]):
+            primary_started = time.monotonic()
+            try:
+                result = await self._plan_once(model=model, **context)
+            except asyncio.CancelledError:
+                # Lost to the hedge: the primary took at least this long. Dropping the sample would leave only
+                # calls faster than the delay in the history and walk the delay down to its floor.
+                history.record(time.monotonic() - primary_started)
+                raise
+            history.record(time.monotonic() - primary_started)
+            return result
+
+        started = time.monotonic()
+        (action, raw), winner = await run_hedged(
+            primary,
+            lambda: self._plan_once(model=hedge_model, client=self.hedge_client, **context),
+            delay=delay,
+        )
+        elapsed = time.monotonic() - started
+        raw["hedge"] = {
+            "delay_s": round(delay, 3),
+            "hedged": elapsed >= delay,
+            "winner": winner,
+            "model": hedge_model if winner == "hedge" else model,
+            "elapsed_s": round(elapsed, 3),
+        }
+        return action, raw
+
     async def _plan_once(
         self,
         *,
+        model: str,
+        client: Optional[SharedLLMClient] = None,
         goal: str,
         observation: Observation,
         recent_observations: List[Observation],
@@ -261,6 +483,7 @@ class Planner:
         search_controls: Optional[List[int]],
         state_change_hint: Optional[str],
         allowed_actions: Optional[List[str]],
+        on_partial: Optional[PartialCallback] = None,
     ) -> (Dict[str, Any], Dict[str, Any]):
         mapping_text = _format_observation(observation, limit=mapping_limit)
         recent_text = _recent_context_text(recent_observations)
@@ -280,6 +503,7 @@ class Planner:
             "Use 'search' with value as query in the site search box or omnibox when goal is an open-ended search. "
             "Use 'go_back' / 'go_forward' to navigate browser history when цель требует вернуться/двигаться вперёд. "
             "Use 'switch_tab' to activate a tab by index, url, or title (value should contain a hint). "
+            "Use 'fill_form' to fill several inputs of one form in a single step. "
             "Otherwise use only the provided element mapping; element_id corresponds to data-agent-id overlays. "
             "Return a single tool call that strictly matches the JSON schema."
         )
@@ -312,6 +536,9 @@ class Planner:
             "Use 'go_back' / 'go_forward' to move through history when appropriate. "
             "Use 'switch_tab' with value containing index/url/title when you need another tab (element_id null). "
             "If you plan to type, include 'value'. For scrolling, set element_id to null. "
+            "When a form needs several inputs (login, filters), prefer 'fill_form' with 'fields' = [{element_id, value}, ...] "
+            "and element_id = the submit button to press afterwards (null to only fill); value null. "
+            "Set 'confidence' (0..1) to how sure you are that this action advances the goal. "
             "In find/browse tasks, follow a micro-plan: 1) find relevant section/category, 2) open listing, 3) choose a candidate by goal match, 4) act (open/add/continue). "
             "Avoid repeating the same action that had no effect; prefer a different action type when prior attempts failed. "
             "If a search bar is visible, use it before iterating alphabet tabs or header links; avoid clicking nav/alphabet tabs when a search control exists."
@@ -347,22 +574,26 @@ class Planner:
             },
         }
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            temperature=0,
-            messages=messages,
-            tools=[tool_def],
-            tool_choice={"type": "function", "function": {"name": "browser_action"}},
-        )
-
-        raw = response.model_dump()
-        choice = response.choices[0]
-        if not choice.message.tool_calls:
-            raise ValueError("Planner did not return a tool call.")
+        request = {
+            "model": model,
+            "temperature": 0,
+            "messages": messages,
+            "tools": [tool_def],
+            "tool_choice": {"type": "function", "function": {"name": "browser_action"}},
+        }
+        client = client or self.client
+        if self.stream:
+            arguments, raw = await self._stream_tool_call(client, request, on_partial=on_partial)
+        else:
+            response = await client.create_chat_completion(**request)
+            raw = response.model_dump()
+            choice = response.choices[0]
+            if not choice.message.tool_calls:
+                raise ValueError("Planner did not return a tool call.")
+            arguments = choice.message.tool_calls[0].function.arguments
 
-        tool_call = choice.message.tool_calls[0]
         try:
-            args = json.loads(tool_call.function.arguments)
+            args = json.loads(arguments)
         except json.JSONDecodeError as e:
             raise ValueError(f"Failed to parse tool arguments: {e}") from e
 
@@ -377,9 +608,91 @@ class Planner:
             args["value"] = None
         if "requires_confirmation" not in args:
             args["requires_confirmation"] = False
+        if "confidence" not in args:
+            args["confidence"] = None
 
         return args, raw
 
+    async def _stream_tool_call(
+        self,
+        client: SharedLLMClient,
+        request: Dict[str, Any],
+        *,
+        on_partial: Optional[PartialCallback] = None,
+    ) -> (str, Dict[str, Any]):
+        """Stream the completion, firing on_partial once action/element_id are known; returns (arguments, raw)."""
+        started = time.monotonic()
+        stream = await client.create_chat_completion(**request, stream=True)
+        fragments: List[str] = []
+        call_id: Optional[str] = None
+        call_name: Optional[str] = None
+        response_id: Optional[str] = None
+        response_model: Optional[str] = None
+        finish_reason: Optional[str] = None
+        chunks = 0
+        target_known_ms: Optional[float] = None
+        partial_task: Optional[asyncio.Task] = None
+        # create_chat_completion only times until the first chunk; the body arrives here.
+        with span("llm.stream", LLM, model=request.get("model")):
+            async for chunk in stream:
+                chunks += 1
+                response_id = response_id or getattr(chunk, "id", None)
+                response_model = response_model or getattr(chunk, "model", None)
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                finish_reason = choice.finish_reason or finish_reason
+                for delta_call in choice.delta.tool_calls or []:
+                    # Only the first tool call is used (tool_choice forces browser_action).
+                    if (delta_call.index or 0) != 0:
+                        continue
+                    call_id = call_id or delta_call.id
+                    if delta_call.function is None:
+                        continue
+                    call_name = call_name or delta_call.function.name
+                    if delta_call.function.arguments:
+                        fragments.append(delta_call.function.arguments)
+                if target_known_ms is None and fragments:
+                    partial = _parse_partial_arguments("".join(fragments))
+                    if "action" in partial and "element_id" in partial:
+                        target_known_ms = round((time.monotonic() - started) * 1000, 1)
+                        if on_partial:
+                            partial_task = asyncio.create_task(on_partial(partial))
+        if partial_task:
+            # Prefetch is best-effort; never let it fail the plan.
+            await asyncio.gather(partial_task, return_exceptions=True)
+        if not fragments:
+            raise ValueError("Planner did not return a tool call.")
+        arguments = "".join(fragments)
+        raw = {
+            "id": response_id,
+            "model": response_model,
+            "object": "chat.completion",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": finish_reason,
+                    "message": {
+                        "role": "assistant",
+                        "content": None,
+                        "tool_calls": [
+                            {
+                                "id": call_id,
+                                "type": "function",
+                                "function": {"name": call_name or "browser_action", "arguments": arguments},
+                            }
+                        ],
+                    },
+                }
+            ],
+            "stream": {
+                "chunks": chunks,
+                "target_known_ms": target_known_ms,
+                "total_ms": round((time.monotonic() - started) * 1000, 1),
+            },
+        }
+        return arguments, raw
+
 
 def load_recent_observations(state_dir: Path, *, limit: int = 3) -> List[Observation]:
     if not state_dir.exists():
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from playwright.async_api import Page
+
+from agent.infra.timing import CDP, timed
+
+# One evaluate: a per-document mutation counter (installed on first probe), focus, and an FNV-1a hash over the
+# interactive elements in the viewport (same selector as JS_SET_OF_MARK: position, size, text/value, plus what the
+# mapping filters or records on: CSS visibility/display/opacity, disabled state, and the data-agent-id it assigned).
+_PROBE_JS = r"""
+(limit) => {
+  let st = window.__agentProbe;
+  if (!st) {
+    st = window.__agentProbe = { doc: Math.random().toString(36).slice(2), mutations: 0 };
+    try {
+      new MutationObserver((records) => { st.mutations += records.length; }).observe(
+        document.documentElement || document,
+        { subtree: true, childList: true, attributes: true, characterData: true },
+      );
+    } catch (e) {}
+  }
+  let h = 0x811c9dc5;
+  const mix = (s) => {
+    for (let i = 0; i < s.length; i++) {
+      h ^= s.charCodeAt(i);
+      h = Math.imul(h, 0x01000193);
+    }
+  };
+  let count = 0;
+  for (const el of document.querySelectorAll("a,button,input,textarea,select,[role='button'],[onclick]")) {
+    const r = el.getBoundingClientRect();
+    if (!r.width || !r.height || r.bottom < 0 || r.right < 0 || r.top > window.innerHeight || r.left > window.innerWidth) continue;
+    const text = (el.value || el.textContent || "").trim().slice(0, 60);
+    const style = window.getComputedStyle(el);
+    const shown = style.visibility !== "hidden" && style.display !== "none" && parseFloat(style.opacity || "1") > 0.05;
+    const disabled = el.getAttribute("disabled") !== null || el.getAttribute("aria-disabled") === "true";
+    const id = el.getAttribute("data-agent-id") || "";
+    mix(`${el.tagName}|${Math.round(r.left)},${Math.round(r.top)},${Math.round(r.width)},${Math.round(r.height)}|${text}|${shown ? 1 : 0}${disabled ? 1 : 0}|${id};`);
+    if (++count >= limit) break;
+  }
+  const a = document.activeElement;
+  const focused = a && a !== document.body && a !== document.documentElement
+    ? `${a.tagName.toLowerCase()}#${a.getAttribute("data-agent-id") || a.id || ""}`
+    : "";
+  return {
+    title: document.title,
+    doc: st.doc,
+    mutations: st.mutations,
+    focused,
+    fingerprint: (h >>> 0).toString(16),
+    marks: count,
+    tagged: document.querySelectorAll("[data-agent-id]").length,
+    ready_state: document.readyState,
+  };
+}
+"""
+
+
+@dataclass
+class PageProbe:
+    page_id: Optional[str]
+    url: str
+    title: str
+    doc: str
+    mutations: int
+    focused: str
+    fingerprint: str
+    marks: int
+    ready_state: str
+    tagged: int = 0  # elements still carrying a data-agent-id from the last capture
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@timed("probe_page", CDP)
+async def probe_page(page: Page, *, limit: int = 300) -> Optional[PageProbe]:
+    """Cheap page-state probe (no mapping rebuild, no artifacts). None if the page can't be evaluated right now."""
+    try:
+        raw = await page.evaluate(_PROBE_JS, limit)
+    except Exception:
+        return None
+    return PageProbe(
+        page_id=getattr(page, "guid", None),
+        url=page.url,
+        title=str(raw.get("title") or ""),
+        doc=str(raw.get("doc") or ""),
+        mutations=int(raw.get("mutations") or 0),
+        focused=str(raw.get("focused") or ""),
+        fingerprint=str(raw.get("fingerprint") or ""),
+        marks=int(raw.get("marks") or 0),
+        ready_state=str(raw.get("ready_state") or ""),
+        tagged=int(raw.get("tagged") or 0),
+    )
+
+
+def probe_diff(before: Optional[PageProbe], after: Optional[PageProbe]) -> Dict[str, Any]:
+    """What changed between two probes. dom_changed follows the viewport fingerprint (what the mapping is built
+    from); the raw mutation count is reported but not used, so ticking clocks/carousels don't count as an effect."""
+    if before is None or after is None:
+        return {"available": False, "changed": True, "url_changed": False, "dom_changed": False}
+    new_document = before.page_id != after.page_id or before.doc != after.doc
+    diff: Dict[str, Any] = {
+        "available": True,
+        "url_changed": before.url != after.url,
+        "title_changed": before.title != after.title,
+        "new_document": new_document,
+        "mutations": None if new_document else after.mutations - before.mutations,
+        "focus_changed": before.focused != after.focused,
+        "fingerprint_changed": before.fingerprint != after.fingerprint,
+    }
+    diff["dom_changed"] = new_document or diff["fingerprint_changed"]
+    diff["changed"] = diff["url_changed"] or diff["title_changed"] or diff["dom_changed"]
+    return diff
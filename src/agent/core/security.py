@@ -66,6 +66,17 @@ def analyze_action(action: Dict[str, Any], observation: Observation) -> Security
     if action_type in {"ask_user", "done"}:
         return SecurityDecision(False, None)
 
+    if action_type == "fill_form":
+        # Each field is judged as the type action it stands for; the submit control as a click.
+        parts = [{"action": "type", "element_id": f.get("element_id"), "value": f.get("value")} for f in action.get("fields") or []]
+        if element_id is not None:
+            parts.append({"action": "click", "element_id": element_id, "value": None})
+        for part in parts:
+            decision = analyze_action(part, observation)
+            if decision.requires_confirmation:
+                return SecurityDecision(True, f"{part['action']} element_id={part['element_id']}: {decision.reason}")
+        return SecurityDecision(bool(action.get("requires_confirmation")), None)
+
     element_text = _get_element_text(observation, element_id)
     combined_text = f"{value} {element_text}".strip()
 
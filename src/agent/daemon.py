@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from agent.config.config import Settings
+from agent.core.planner import Planner
+from agent.engine import AgentEngine
+from agent.infra.runtime import BrowserRuntime
+from agent.infra.tracing import TextLogger, TraceLogger, generate_step_id
+
+_MAX_BODY_BYTES = 1 << 20
+_FINISHED = {"done", "cancelled", "error"}
+
+
+@dataclass
+class Job:
+    id: str
+    goal: str
+    start_url: Optional[str] = None
+    status: str = "queued"
+    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    finished_at: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    task: Optional[asyncio.Task] = None
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "goal": self.goal,
+            "start_url": self.start_url,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "events": len(self.events),
+        }
+
+    async def emit(self, kind: str, data: Optional[Dict[str, Any]] = None) -> None:
+        self.events.append({"seq": len(self.events), "ts": time.time(), "type": kind, "data": data or {}})
+        async with self.changed:
+            self.changed.notify_all()
+
+    def emit_nowait(self, kind: str, data: Optional[Dict[str, Any]] = None) -> None:
+        # Trace writes are synchronous; schedule the wake-up instead of awaiting it.
+        self.events.append({"seq": len(self.events), "ts": time.time(), "type": kind, "data": data or {}})
+        try:
+            asyncio.get_running_loop().create_task(self._notify())
+        except RuntimeError:
+            pass
+
+    async def _notify(self) -> None:
+        async with self.changed:
+            self.changed.notify_all()
+
+
+_current_job: ContextVar[Optional[Job]] = ContextVar("agent_daemon_job", default=None)
+
+
+def _event_kind(record: Dict[str, Any]) -> str:
+    if record.get("summary"):
+        return "terminal"
+    if record.get("node") == "planner" and "action" in record:
+        return "plan"
+    if "execute_success" in record:
+        return "execute" if record.get("execute_success") is not None else "plan_error"
+    return "trace"
+
+
+class _JobTraceLogger(TraceLogger):
+    """Daemon-wide trace file plus per-job fan-out of each record as a step event."""
+
+    def write(self, record: Any) -> None:
+        super().write(record)
+        job = _current_job.get()
+        if job is None or not isinstance(record, dict):
+            return
+        try:
+            data = json.loads(json.dumps(record, ensure_ascii=False, default=str))
+        except Exception:
+            data = {"value": str(record)}
+        job.emit_nowait(_event_kind(record), data)
+
+
+class _JobTextLogger(TextLogger):
+    def write(self, message: str) -> None:
+        super().write(message)
+        job = _current_job.get()
+        if job is not None:
+            job.emit_nowait("log", {"message": message.rstrip()})
+
+
+class AgentDaemon:
+    """Serves an AgentEngine (warm browser, compiled graph, planner client) and runs submitted goals one after another.
+
+    Jobs share the single BrowserRuntime, so they are executed sequentially from a FIFO queue; queued jobs can be
+    cancelled before they start and running jobs are cancelled by cancelling their task.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        runtime: BrowserRuntime,
+        planner: Planner,
+        *,
+        execute_enabled: bool = True,
+        max_finished_jobs: int = 500,
+    ) -> None:
+        self.settings = settings
+        self.runtime = runtime
+        self.planner = planner
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs: Dict[str, Job] = {}
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self.text_log = _JobTextLogger(settings.paths.logs_dir / "agent.log")
+        self.trace = _JobTraceLogger(settings.paths.logs_dir / "trace.jsonl")
+        # Also brings checkpointing (CHECKPOINT_ENABLED): daemon sessions can be continued with --resume.
+        self.engine = AgentEngine(
+            settings,
+            runtime,
+            planner,
+            execute_enabled=execute_enabled,
+            text_log=self.text_log,
+            trace=self.trace,
+        )
+        self.started_at = time.time()
+
+    # --- job lifecycle -------------------------------------------------------------------------------------------
+
+    async def submit(self, goal: str, start_url: Optional[str] = None) -> Job:
+        job = Job(id=generate_step_id("job"), goal=goal, start_url=start_url)
+        self.jobs[job.id] = job
+        await job.emit("queued", {"goal": goal, "position": self._queue.qsize()})
+        await self._queue.put(job.id)
+        self._prune()
+        return job
+
+    async def cancel(self, job: Job) -> None:
+        if job.status == "queued":
+            job.status = "cancelled"
+            job.finished_at = datetime.now(timezone.utc).isoformat()
+            await job.emit("cancelled", {"while": "queued"})
+        elif job.status == "running" and job.task is not None:
+            job.task.cancel()
+
+    async def _run_job(self, job: Job) -> None:
+        _current_job.set(job)
+        session_id = generate_step_id("session")
+        await job.emit("started", {"session_id": session_id})
+        if job.start_url:
+            page = await self.runtime.ensure_page()
+            await page.goto(job.start_url)
+        result = await self.engine.run(job.goal, session_id=session_id)
+        observation = result.get("observation")
+        job.result = {
+            "session_id": session_id,
+            "stop_reason": result.get("stop_reason"),
+            "stop_details": result.get("stop_details"),
+            "terminal_reason": result.get("terminal_reason"),
+            "url": getattr(observation, "url", None),
+            "steps": result.get("step"),
+            "planner_calls": result.get("planner_calls"),
+        }
+
+    async def worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            if job is None or job.status != "queued":
+                continue
+            job.status = "running"
+            # A fresh task gets its own context copy, so _current_job never leaks between jobs.
+            job.task = asyncio.create_task(self._run_job(job))
+            try:
+                await job.task
+                job.status = "done"
+                await job.emit("done", job.result)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if current is not None and current.cancelling():
+                    # The daemon itself is shutting down, not just this job.
+                    job.status = "cancelled"
+                    raise
+                job.status = "cancelled"
+                await job.emit("cancelled", {"while": "running"})
+            except Exception as exc:
+                job.status = "error"
+                job.result = {"stop_reason": "error", "stop_details": str(exc)}
+                await job.emit("error", job.result)
+            finally:
+                job.finished_at = datetime.now(timezone.utc).isoformat()
+                job.task = None
+            try:
+                await self.engine.between_goals()
+            except Exception as exc:
+                self.text_log.write(f"[daemon] hygiene failed after {job.id}: {exc}")
+
+    def _prune(self) -> None:
+        finished = [job for job in self.jobs.values() if job.status in _FINISHED]
+        for job in finished[: max(0, len(finished) - self.max_finished_jobs)]:
+            self.jobs.pop(job.id, None)
+
+    # --- HTTP ----------------------------------------------------------------------------------------------------
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            method, path, body = await _read_request(reader)
+        except Exception as exc:
+            await _respond(writer, 400, {"error": f"bad request: {exc}"})
+            return
+        try:
+            await self._route(method, path, body, writer)
+        except Exception as exc:
+            try:
+                await _respond(writer, 500, {"error": str(exc)})
+            except Exception:
+                pass
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        parts = [p for p in urlsplit(path).path.split("/") if p]
+        if method == "GET" and parts == ["health"]:
+            await _respond(
+                writer,
+                200,
+                {
+                    "status": "ok",
+                    "uptime_s": round(time.time() - self.started_at, 1),
+                    "queued": self._queue.qsize(),
+                    "running": [job.id for job in self.jobs.values() if job.status == "running"],
+                },
+            )
+            return
+        if parts == ["jobs"]:
+            if method == "GET":
+                await _respond(writer, 200, {"jobs": [job.to_dict() for job in self.jobs.values()]})
+                return
+            if method == "POST":
+                try:
+                    payload = json.loads(body or b"{}")
+                except ValueError:
+                    await _respond(writer, 400, {"error": "body must be JSON"})
+                    return
+                goal = str(payload.get("goal") or "").strip() if isinstance(payload, dict) else ""
+                if not goal:
+                    await _respond(writer, 400, {"error": "missing 'goal'"})
+                    return
+                job = await self.submit(goal, start_url=payload.get("start_url") or None)
+                await _respond(writer, 202, job.to_dict())
+                return
+        if len(parts) >= 2 and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                await _respond(writer, 404, {"error": "unknown job"})
+                return
+            if method == "GET" and len(parts) == 2:
+                await _respond(writer, 200, {**job.to_dict(), "event_log": job.events})
+                return
+            if method == "GET" and parts[2:] == ["events"]:
+                await self._stream_events(job, writer)
+                return
+            if method == "POST" and parts[2:] == ["cancel"]:
+                await self.cancel(job)
+                await _respond(writer, 202, job.to_dict())
+                return
+        await _respond(writer, 404, {"error": "not found"})
+
+    async def _stream_events(self, job: Job, writer: asyncio.StreamWriter) -> None:
+        """NDJSON stream: replays past events, then follows live ones until the job finishes."""
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nCache-Control: no-cache\r\nConnection: close\r\n\r\n"
+        )
+        sent = 0
+        while True:
+            while sent < len(job.events):
+                writer.write(json.dumps(job.events[sent], ensure_ascii=False).encode("utf-8") + b"\n")
+                sent += 1
+            await writer.drain()
+            if job.status in _FINISHED and sent >= len(job.events):
+                break
+            async with job.changed:
+                # Re-check under the lock: emit() appends before notifying, so nothing is missed.
+                if sent >= len(job.events) and job.status not in _FINISHED:
+                    try:
+                        await asyncio.wait_for(job.changed.wait(), timeout=15.0)
+                    except asyncio.TimeoutError:
+                        pass
+        writer.close()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    method, path, _ = request_line.split(" ", 2)
+    headers: Dict[str, str] = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1")
+        if line in ("\r\n", "\n", ""):
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length") or 0)
+    if length > _MAX_BODY_BYTES:
+        raise ValueError("body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path, body
+
+
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+async def _respond(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any]) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    try:
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve_daemon(
+    settings: Settings,
+    runtime: BrowserRuntime,
+    planner: Planner,
+    *,
+    execute_enabled: bool = True,
+) -> None:
+    """Serve the job API on DAEMON_SOCKET (unix) or DAEMON_HOST:DAEMON_PORT until cancelled."""
+    daemon = AgentDaemon(settings, runtime, planner, execute_enabled=execute_enabled)
+    if settings.daemon_socket:
+        server = await asyncio.start_unix_server(daemon.handle, path=settings.daemon_socket)
+        where = f"unix:{settings.daemon_socket}"
+    else:
+        server = await asyncio.start_server(daemon.handle, host=settings.daemon_host, port=settings.daemon_port)
+        where = f"http://{settings.daemon_host}:{settings.daemon_port}"
+    print(f"[daemon] Listening on {where} (POST /jobs, GET /jobs/<id>/events, POST /jobs/<id>/cancel)")
+    worker = asyncio.create_task(daemon.worker())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        worker.cancel()
+        try:
+            await worker
+        except (asyncio.CancelledError, Exception):
+            pass
+        await daemon.engine.close()
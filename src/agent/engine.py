@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from agent.config.config import Settings
+from agent.core.planner import Planner
+from agent.infra.checkpoint import CheckpointStore
+from agent.infra.runtime import BrowserRuntime
+from agent.infra.tracing import TextLogger, TraceLogger, generate_step_id
+from agent.langgraph_loop import build_graph
+
+
+class AgentEngine:
+    """Everything that should outlive a goal: compiled graph, planner client, loggers and checkpoint store.
+
+    Warm state carries over from goal to goal: fallback remedy stats, planner cascade/latency history, per-domain
+    navigation timeouts and the tab registry. Goals share one BrowserRuntime, so they run one after another.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        runtime: BrowserRuntime,
+        planner: Optional[Planner] = None,
+        *,
+        execute_enabled: bool = True,
+        text_log: Optional[TextLogger] = None,
+        trace: Optional[TraceLogger] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+    ) -> None:
+        self.settings = settings
+        self.runtime = runtime
+        self.planner = planner or Planner.from_settings(settings)
+        self.text_log = text_log or TextLogger(settings.paths.logs_dir / "agent.log")
+        self.trace = trace or TraceLogger(settings.paths.logs_dir / "trace.jsonl")
+        if checkpoints is None and settings.checkpoint_enabled:
+            checkpoints = CheckpointStore(settings.checkpoint_path)
+        self.checkpoints = checkpoints
+        # Compiled once; every goal reuses it.
+        self._runner = build_graph(
+            settings=settings,
+            planner=self.planner,
+            runtime=runtime,
+            execute_enabled=execute_enabled,
+            text_log=self.text_log,
+            trace=self.trace,
+            checkpoints=checkpoints,
+        )
+        self.goals_run = 0
+
+    async def run(self, goal: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        self.goals_run += 1
+        return await self._runner(goal=goal, session_id=session_id or generate_step_id("session"))
+
+    async def resume(self, session_id: str) -> Dict[str, Any]:
+        """Continue a checkpointed session; raises ValueError when checkpointing is off or nothing is left to run."""
+        self.goals_run += 1
+        return await self._runner(session_id=session_id, resume=True)
+
+    async def between_goals(self) -> Dict[str, Any]:
+        """Tab/heap hygiene on the shared runtime (never mid-goal); a no-op before the first goal."""
+        if not self.goals_run:
+            return {"closed_tabs": [], "heap": None, "recycled": False}
+        report = await self.runtime.between_goals()
+        if report.get("closed_tabs") or report.get("recycled"):
+            try:
+                self.trace.write({"hygiene": report})
+            except Exception:
+                pass
+        return report
+
+    async def run_many(self, goals: Iterable[str]) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        for goal in goals:
+            await self.between_goals()
+            results.append(await self.run(goal))
+        return results
+
+    async def close(self) -> None:
+        if self.checkpoints is not None:
+            await self.checkpoints.close()
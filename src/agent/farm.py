@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing as mp
+import queue as queue_mod
+import time
+from collections import Counter
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from agent.config.config import Settings
+from agent.infra.tracing import TextLogger, TraceLogger, generate_step_id
+
+_LIVENESS_INTERVAL_SEC = 1.0
+
+
+class _ForwardingTraceLogger(TraceLogger):
+    """Writes the worker-local trace and streams each record to the coordinator."""
+
+    def __init__(self, path: Path, out_queue: Any, *, worker_id: int, goal_id: str) -> None:
+        super().__init__(path)
+        self._out = out_queue
+        self._worker_id = worker_id
+        self._goal_id = goal_id
+
+    def write(self, record: Any) -> None:
+        super().write(record)
+        payload = record if isinstance(record, dict) else {"value": str(record)}
+        try:
+            # Round-trip through JSON so unpicklable objects never reach the queue.
+            payload = json.loads(json.dumps(payload, ensure_ascii=False, default=str))
+            self._out.put({"type": "trace", "worker": self._worker_id, "goal_id": self._goal_id, "record": payload})
+        except Exception:
+            pass
+
+
+def load_goals_file(path: Path) -> List[Dict[str, Any]]:
+    """JSONL goals: each line is {"goal": ..., "id"?: ...} or a bare JSON string. Blank lines are skipped."""
+    tasks: List[Dict[str, Any]] = []
+    with path.open("r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if isinstance(item, str):
+                item = {"goal": item}
+            if not isinstance(item, dict) or not str(item.get("goal") or "").strip():
+                raise ValueError(f"{path}:{line_no}: expected a goal string or an object with 'goal'")
+            tasks.append({"id": str(item.get("id") or f"goal-{line_no}"), "goal": item["goal"].strip(), "attempts": 0})
+    return tasks
+
+
+async def _worker_loop(worker_id: int, settings: Settings, execute_enabled: bool, in_queue: Any, out_queue: Any) -> None:
+    from agent.core.planner import Planner
+    from agent.infra.llm_client import close_shared_clients
+    from agent.infra.runtime import BrowserRuntime
+    from agent.langgraph_loop import build_graph
+
+    worker_settings = replace(
+        settings,
+        headless=True,
+        # Each worker owns a fresh browser; N workers sharing one attached browser would fight over its tabs.
+        cdp_endpoint=None,
+        paths=settings.paths.scoped(f"worker-{worker_id}", include_profile=True),
+    )
+    worker_settings.paths.ensure()
+    if settings.har_mode == "record":
+        worker_settings.har_path = settings.har_path.with_name(f"{settings.har_path.stem}-worker-{worker_id}{settings.har_path.suffix}")
+    runtime = BrowserRuntime(worker_settings)
+    await runtime.launch()
+    planner = Planner.from_settings(worker_settings)
+    out_queue.put({"type": "ready", "worker": worker_id})
+    try:
+        while True:
+            task = await asyncio.to_thread(in_queue.get)
+            if task is None:
+                break
+            session_id = generate_step_id("session")
+            goal_settings = replace(worker_settings, paths=worker_settings.paths.scoped(session_id))
+            goal_settings.paths.ensure()
+            text_log = TextLogger(goal_settings.paths.logs_dir / "agent.log")
+            trace = _ForwardingTraceLogger(
+                goal_settings.paths.logs_dir / "trace.jsonl", out_queue, worker_id=worker_id, goal_id=task["id"]
+            )
+            started = time.perf_counter()
+            try:
+                page = await runtime.ensure_page()
+                if worker_settings.start_url:
+                    await page.goto(worker_settings.start_url)
+                runner = build_graph(
+                    settings=goal_settings,
+                    planner=planner,
+                    runtime=runtime,
+                    execute_enabled=execute_enabled,
+                    text_log=text_log,
+                    trace=trace,
+                )
+                result = await runner(goal=task["goal"], session_id=session_id)
+            except Exception as exc:
+                result = {"stop_reason": "error", "stop_details": str(exc)}
+            observation = result.get("observation")
+            try:
+                await runtime.between_goals()
+            except Exception:
+                pass
+            out_queue.put(
+                {
+                    "type": "result",
+                    "worker": worker_id,
+                    "goal_id": task["id"],
+                    "goal": task["goal"],
+                    "session_id": session_id,
+                    "stop_reason": result.get("stop_reason"),
+                    "stop_details": result.get("stop_details"),
+                    "url": getattr(observation, "url", None),
+                    "steps": result.get("step"),
+                    "planner_calls": result.get("planner_calls"),
+                    "wall_s": round(time.perf_counter() - started, 3),
+                    "attempts": task["attempts"] + 1,
+                }
+            )
+    finally:
+        await runtime.close()
+        await close_shared_clients()
+
+
+def _worker_main(worker_id: int, settings: Settings, execute_enabled: bool, in_queue: Any, out_queue: Any) -> None:
+    asyncio.run(_worker_loop(worker_id, settings, execute_enabled, in_queue, out_queue))
+
+
+class WorkerFarm:
+    """Shards goals across worker processes, each with its own headless BrowserRuntime and private profile dir.
+
+    Goals are dispatched one at a time per worker, so the coordinator always knows which goal a dead worker held;
+    that goal is requeued (up to worker_retries times) and the worker is replaced.
+    """
+
+    def __init__(self, settings: Settings, *, workers: Optional[int] = None, worker_retries: Optional[int] = None, execute_enabled: bool = True) -> None:
+        self.settings = settings
+        self.workers = max(1, workers or settings.farm_workers)
+        self.worker_retries = max(0, settings.farm_worker_retries if worker_retries is None else worker_retries)
+        self.execute_enabled = execute_enabled
+        # spawn: Playwright/asyncio state must not be inherited through fork.
+        self._ctx = mp.get_context("spawn")
+        self._out: Any = self._ctx.Queue()
+        self._procs: Dict[int, Any] = {}
+        self._inboxes: Dict[int, Any] = {}
+        self._in_flight: Dict[int, Optional[Dict[str, Any]]] = {}
+        self._next_worker_id = 0
+
+    def _spawn(self) -> int:
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        inbox = self._ctx.Queue()
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self.settings, self.execute_enabled, inbox, self._out),
+            name=f"agent-worker-{worker_id}",
+            daemon=True,
+        )
+        proc.start()
+        self._procs[worker_id] = proc
+        self._inboxes[worker_id] = inbox
+        self._in_flight[worker_id] = None
+        return worker_id
+
+    def _retire(self, worker_id: int) -> None:
+        self._procs.pop(worker_id, None)
+        self._inboxes.pop(worker_id, None)
+        self._in_flight.pop(worker_id, None)
+
+    def run(self, tasks: List[Dict[str, Any]], out_dir: Path) -> Dict[str, Any]:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        coordinator_log = TextLogger(out_dir / "farm.log")
+        trace_path = out_dir / "trace.jsonl"
+        results_path = out_dir / "results.jsonl"
+        pending = list(tasks)
+        results: List[Dict[str, Any]] = []
+        crashes = 0
+        startup_failures = 0
+        ready: set[int] = set()
+        started = time.perf_counter()
+        for _ in range(min(self.workers, len(pending)) or 1):
+            self._spawn()
+        idle: List[int] = []
+
+        with trace_path.open("a", encoding="utf-8") as trace_f, results_path.open("a", encoding="utf-8") as results_f:
+
+            def record_result(item: Dict[str, Any]) -> None:
+                results.append(item)
+                results_f.write(json.dumps(item, ensure_ascii=False) + "\n")
+                results_f.flush()
+                print(f"[farm] [{len(results)}/{len(tasks)}] worker={item.get('worker')} reason={item.get('stop_reason')} goal={item.get('goal')}")
+
+            def handle(msg: Dict[str, Any]) -> None:
+                kind = msg.get("type")
+                worker_id = msg.get("worker")
+                if kind == "trace":
+                    trace_f.write(json.dumps({"worker": worker_id, "goal_id": msg.get("goal_id"), **msg["record"]}, ensure_ascii=False) + "\n")
+                elif kind == "ready":
+                    ready.add(worker_id)
+                    idle.append(worker_id)
+                elif kind == "result":
+                    self._in_flight[worker_id] = None
+                    idle.append(worker_id)
+                    record_result({k: v for k, v in msg.items() if k != "type"})
+
+            next_liveness_check = time.monotonic() + _LIVENESS_INTERVAL_SEC
+            while len(results) < len(tasks):
+                while idle and pending:
+                    worker_id = idle.pop(0)
+                    if worker_id not in self._procs:
+                        continue
+                    task = pending.pop(0)
+                    self._in_flight[worker_id] = task
+                    self._inboxes[worker_id].put(task)
+                try:
+                    handle(self._out.get(timeout=_LIVENESS_INTERVAL_SEC))
+                except queue_mod.Empty:
+                    pass
+                # On a timer, not only when the queue goes quiet: trace traffic from busy workers would hide a crash.
+                if time.monotonic() < next_liveness_check:
+                    continue
+                next_liveness_check = time.monotonic() + _LIVENESS_INTERVAL_SEC
+                if self._procs and all(proc.is_alive() for proc in self._procs.values()):
+                    continue
+                # Take whatever is already queued first, so a result posted just before the exit is not requeued.
+                while True:
+                    try:
+                        handle(self._out.get_nowait())
+                    except queue_mod.Empty:
+                        break
+                for worker_id, proc in list(self._procs.items()):
+                    if proc.is_alive():
+                        continue
+                    crashes += 1
+                    task = self._in_flight.get(worker_id)
+                    self._retire(worker_id)
+                    coordinator_log.write(f"worker {worker_id} exited with code {proc.exitcode}; in_flight={task and task['id']}")
+                    if task is not None:
+                        task = {**task, "attempts": task["attempts"] + 1}
+                        if task["attempts"] <= self.worker_retries:
+                            pending.insert(0, task)
+                        else:
+                            record_result(
+                                {
+                                    "worker": worker_id,
+                                    "goal_id": task["id"],
+                                    "goal": task["goal"],
+                                    "stop_reason": "error",
+                                    "stop_details": f"worker_crashed (exit code {proc.exitcode})",
+                                    "attempts": task["attempts"],
+                                }
+                            )
+                    if worker_id not in ready:
+                        startup_failures += 1
+                    if startup_failures >= self.workers * 2:
+                        # Workers cannot even start (browser/profile broken); fail the rest instead of respawning forever.
+                        for task in pending:
+                            record_result({"goal_id": task["id"], "goal": task["goal"], "stop_reason": "error", "stop_details": "worker_start_failed", "attempts": task["attempts"]})
+                        pending = []
+                    if pending and len(self._procs) < self.workers:
+                        self._spawn()
+                if not pending and not self._procs:
+                    break
+
+        for inbox in self._inboxes.values():
+            inbox.put(None)
+        for proc in self._procs.values():
+            proc.join(timeout=30)
+            if proc.is_alive():
+                proc.terminate()
+
+        total = time.perf_counter() - started
+        order = {task["id"]: idx for idx, task in enumerate(tasks)}
+        summary = {
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "goals": len(tasks),
+            "workers": self.workers,
+            "worker_crashes": crashes,
+            "total_s": round(total, 3),
+            "goals_per_min": round(len(results) / total * 60, 3) if total > 0 else None,
+            "stop_reasons": dict(Counter(str(r.get("stop_reason")) for r in results)),
+            "results": sorted(results, key=lambda r: order.get(r["goal_id"], len(order))),
+            "trace": str(trace_path),
+        }
+        (out_dir / "summary.json").write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+        return summary
+
+
+def run_batch(
+    goals_path: Path,
+    settings: Settings,
+    *,
+    workers: Optional[int] = None,
+    worker_retries: Optional[int] = None,
+    execute_enabled: bool = True,
+) -> Dict[str, Any]:
+    tasks = load_goals_file(goals_path)
+    out_dir = settings.paths.logs_dir / "farm" / f"farm-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
+    farm = WorkerFarm(settings, workers=workers, worker_retries=worker_retries, execute_enabled=execute_enabled)
+    summary = farm.run(tasks, out_dir)
+    summary["path"] = str(out_dir / "summary.json")
+    return summary
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from playwright.async_api import Browser, Playwright, async_playwright
+
+from agent.config.config import Settings
+from agent.infra.runtime import BrowserRuntime
+
+
+class BrowserPool:
+    """One Chromium process hosting up to max_contexts isolated BrowserContexts.
+
+    Each context is seeded from the persistent profile's storage state (cookies + localStorage), so goals start
+    logged in without sharing a profile directory (Chromium locks it to a single persistent context).
+    """
+
+    def __init__(self, settings: Settings, *, max_contexts: Optional[int] = None) -> None:
+        self.settings = settings
+        self.max_contexts = max(1, max_contexts or settings.max_browser_contexts)
+        self._semaphore = asyncio.Semaphore(self.max_contexts)
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._storage_state: Optional[dict] = None
+        self.active = 0
+        self.peak_active = 0
+
+    async def start(self, *, storage_state: Optional[dict] = None) -> None:
+        """Launch the shared browser. Without storage_state, it is exported from the persistent profile."""
+        if self._browser:
+            return
+        self._playwright = await async_playwright().start()
+        if storage_state is None:
+            storage_state = await self._export_profile_state()
+        self._storage_state = storage_state
+        self._browser = await self._playwright.chromium.launch(headless=self.settings.headless)
+
+    async def _export_profile_state(self) -> Optional[dict]:
+        # Briefly open the persistent profile just to snapshot it; fails if another process holds the profile lock.
+        assert self._playwright is not None
+        try:
+            context = await self._playwright.chromium.launch_persistent_context(
+                user_data_dir=str(self.settings.paths.user_data_dir),
+                headless=True,
+            )
+        except Exception as exc:
+            print(f"[pool] Could not read persistent profile state ({exc}); contexts start empty.")
+            return None
+        try:
+            return await context.storage_state()
+        except Exception:
+            return None
+        finally:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+    @asynccontextmanager
+    async def runtime(self, settings: Optional[Settings] = None) -> AsyncIterator[BrowserRuntime]:
+        """Lease a fresh context wrapped in a BrowserRuntime; it is closed when the block exits."""
+        if not self._browser:
+            raise RuntimeError("BrowserPool.start() must be called first.")
+        settings = settings or self.settings
+        async with self._semaphore:
+            viewport = None
+            if settings.viewport_width and settings.viewport_height:
+                viewport = {"width": settings.viewport_width, "height": settings.viewport_height}
+            context = await self._browser.new_context(storage_state=self._storage_state, viewport=viewport)
+            runtime = BrowserRuntime.from_context(settings, context)
+            await runtime.prepare_context()
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+            try:
+                page = await runtime.ensure_page()
+                if settings.start_url:
+                    await page.goto(settings.start_url)
+                yield runtime
+            finally:
+                self.active -= 1
+                await runtime.close()
+
+    async def close(self) -> None:
+        try:
+            if self._browser:
+                await self._browser.close()
+        except Exception:
+            pass
+        finally:
+            self._browser = None
+        try:
+            if self._playwright:
+                await self._playwright.stop()
+        except Exception:
+            pass
+        finally:
+            self._playwright = None
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List
+
+from agent.core.execute import ExecutionResult
+from agent.core.observe import BoundingBox, ElementMark, Observation
+from agent.core.planner import PlannerResult
+from agent.core.probe import PageProbe
+from agent.core.security import SecurityDecision
+from agent.infra.timing import span
+
+try:
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer  # type: ignore
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver  # type: ignore
+except ImportError:  # pragma: no cover - optional: pip install langgraph-checkpoint-sqlite
+    JsonPlusSerializer = None  # type: ignore
+    AsyncSqliteSaver = None  # type: ignore
+
+_TAG = "__cp__"
+# Element marks are stored as positional rows (trailing Nones trimmed) instead of 12-key dicts.
+_FLAG_FIXED, _FLAG_NAV, _FLAG_DISABLED = 1, 2, 4
+
+
+def _pack_mark(mark: ElementMark) -> List[Any]:
+    flags = (_FLAG_FIXED if mark.is_fixed else 0) | (_FLAG_NAV if mark.is_nav else 0) | (_FLAG_DISABLED if mark.is_disabled else 0)
+    bbox = mark.bbox
+    row = [
+        mark.id,
+        mark.tag,
+        mark.text,
+        mark.role,
+        mark.zone,
+        round(bbox.x, 1),
+        round(bbox.y, 1),
+        round(bbox.width, 1),
+        round(bbox.height, 1),
+        flags,
+        mark.attr_name,
+        mark.attr_id,
+        mark.aria_label,
+    ]
+    while row and row[-1] is None:
+        row.pop()
+    return row
+
+
+def _unpack_mark(row: List[Any]) -> ElementMark:
+    row = list(row) + [None] * (13 - len(row))
+    flags = int(row[9] or 0)
+    return ElementMark(
+        id=int(row[0]),
+        tag=str(row[1] or ""),
+        text=str(row[2] or ""),
+        role=row[3],
+        zone=row[4],
+        bbox=BoundingBox(x=float(row[5] or 0.0), y=float(row[6] or 0.0), width=float(row[7] or 0.0), height=float(row[8] or 0.0)),
+        is_fixed=bool(flags & _FLAG_FIXED),
+        is_nav=bool(flags & _FLAG_NAV),
+        is_disabled=bool(flags & _FLAG_DISABLED),
+        attr_name=row[10],
+        attr_id=row[11],
+        aria_label=row[12],
+    )
+
+
+class _Encoder:
+    """One dump: the same Observation (observation / prev_observation / recent_observations) is stored once."""
+
+    def __init__(self) -> None:
+        self._seen: Dict[int, int] = {}
+
+    def encode(self, obj: Any) -> Any:
+        if isinstance(obj, Observation):
+            index = self._seen.get(id(obj))
+            if index is not None:
+                return {_TAG: "obs_ref", "i": index}
+            index = self._seen[id(obj)] = len(self._seen)
+            return {
+                _TAG: "obs",
+                "i": index,
+                "u": obj.url,
+                "t": obj.title,
+                "s": str(obj.screenshot_path) if obj.screenshot_path else None,
+                "r": obj.recorded_at,
+                "m": [_pack_mark(m) for m in obj.mapping],
+            }
+        if isinstance(obj, PlannerResult):
+            # raw_response is already persisted at raw_path; nothing downstream of the planner node reads it.
+            return {
+                _TAG: "plan",
+                "action": self.encode(obj.action),
+                "retries": obj.retries_used,
+                "raw_path": str(obj.raw_path) if obj.raw_path else None,
+                "model": obj.model,
+                "tiers": self.encode(obj.tiers),
+            }
+        if isinstance(obj, SecurityDecision):
+            return {_TAG: "sec", "c": obj.requires_confirmation, "r": obj.reason}
+        if isinstance(obj, ExecutionResult):
+            return {_TAG: "exec", **self.encode(obj.to_dict())}
+        if isinstance(obj, PageProbe):
+            return {_TAG: "probe", **obj.to_dict()}
+        if isinstance(obj, deque):
+            return {_TAG: "deque", "n": obj.maxlen, "v": [self.encode(item) for item in obj]}
+        if isinstance(obj, tuple):
+            return {_TAG: "tuple", "v": [self.encode(item) for item in obj]}
+        if isinstance(obj, list):
+            return [self.encode(item) for item in obj]
+        if isinstance(obj, dict):
+            return {key: self.encode(value) for key, value in obj.items()}
+        if isinstance(obj, Path):
+            return str(obj)
+        return obj
+
+
+class _Decoder:
+    def __init__(self) -> None:
+        self._observations: Dict[int, Observation] = {}
+
+    def collect(self, obj: Any) -> None:
+        """First pass: build every stored Observation, so references resolve whatever order they come back in."""
+        if isinstance(obj, dict):
+            if obj.get(_TAG) == "obs":
+                screenshot = obj.get("s")
+                self._observations[int(obj["i"])] = Observation(
+                    url=str(obj.get("u") or ""),
+                    title=str(obj.get("t") or ""),
+                    mapping=[_unpack_mark(row) for row in obj.get("m") or []],
+                    screenshot_path=Path(screenshot) if screenshot else None,
+                    recorded_at=str(obj.get("r") or ""),
+                )
+                return
+            for value in obj.values():
+                self.collect(value)
+        elif isinstance(obj, (list, tuple)):
+            for item in obj:
+                self.collect(item)
+
+    def decode(self, obj: Any) -> Any:
+        if isinstance(obj, (list, tuple)):
+            return type(obj)(self.decode(item) for item in obj)
+        if not isinstance(obj, dict):
+            return obj
+        tag = obj.get(_TAG)
+        if tag is None:
+            return {key: self.decode(value) for key, value in obj.items()}
+        if tag in {"obs", "obs_ref"}:
+            return self._observations.get(int(obj["i"]))
+        if tag == "plan":
+            raw_path = obj.get("raw_path")
+            return PlannerResult(
+                action=self.decode(obj.get("action") or {}),
+                raw_response={},
+                retries_used=int(obj.get("retries") or 0),
+                raw_path=Path(raw_path) if raw_path else None,
+                model=obj.get("model"),
+                tiers=self.decode(obj.get("tiers") or []),
+            )
+        if tag == "sec":
+            return SecurityDecision(requires_confirmation=bool(obj.get("c")), reason=obj.get("r"))
+        if tag == "exec":
+            screenshot = obj.get("screenshot_path")
+            return ExecutionResult(
+                success=bool(obj.get("success")),
+                action=self.decode(obj.get("action") or {}),
+                error=obj.get("error"),
+                screenshot_path=Path(screenshot) if screenshot else None,
+                recorded_at=str(obj.get("recorded_at") or ""),
+                details=self.decode(obj.get("details") or {}),
+            )
+        if tag == "probe":
+            return PageProbe(**{key: value for key, value in obj.items() if key != _TAG})
+        if tag == "deque":
+            return deque((self.decode(item) for item in obj.get("v") or []), maxlen=obj.get("n"))
+        if tag == "tuple":
+            return tuple(self.decode(item) for item in obj.get("v") or [])
+        return {key: self.decode(value) for key, value in obj.items()}
+
+
+def encode_state(obj: Any) -> Any:
+    """GraphState (or any checkpoint payload) → plain dicts/lists with compact, de-duplicated observations."""
+    return _Encoder().encode(obj)
+
+
+def decode_state(obj: Any) -> Any:
+    decoder = _Decoder()
+    decoder.collect(obj)
+    return decoder.decode(obj)
+
+
+class CompactSerializer:
+    """LangGraph serializer that flattens agent dataclasses before delegating to the stock JSON+ serializer."""
+
+    def __init__(self) -> None:
+        if JsonPlusSerializer is None:
+            raise RuntimeError("Checkpointing requires langgraph-checkpoint-sqlite. Install langgraph-checkpoint-sqlite.")
+        self._inner = JsonPlusSerializer()
+
+    def dumps_typed(self, obj: Any) -> Any:
+        with span("checkpoint.encode"):
+            return self._inner.dumps_typed(encode_state(obj))
+
+    def loads_typed(self, data: Any) -> Any:
+        return decode_state(self._inner.loads_typed(data))
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._inner.dumps(encode_state(obj))
+
+    def loads(self, data: bytes) -> Any:
+        return decode_state(self._inner.loads(data))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+
+class CheckpointStore:
+    """SQLite checkpointer opened on first use and shared by every run of the process; threads are session_ids."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._conn: Any = None
+        self._saver: Any = None
+        self._lock = asyncio.Lock()
+
+    async def saver(self) -> Any:
+        async with self._lock:
+            if self._saver is None:
+                if AsyncSqliteSaver is None:
+                    raise RuntimeError("Checkpointing requires langgraph-checkpoint-sqlite. Install langgraph-checkpoint-sqlite.")
+                import aiosqlite  # type: ignore
+
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = await aiosqlite.connect(str(self.path))
+                self._saver = AsyncSqliteSaver(self._conn, serde=CompactSerializer())
+            return self._saver
+
+    async def close(self) -> None:
+        conn, self._conn, self._saver = self._conn, None, None
+        if conn is not None:
+            try:
+                await conn.close()
+            except Exception:
+                pass
+
+
+def thread_config(base: Dict[str, Any], session_id: str) -> Dict[str, Any]:
+    return {**base, "configurable": {**(base.get("configurable") or {}), "thread_id": session_id}}
+
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Sequence, Tuple, TypeVar
+
+from agent.config.config import Settings
+
+T = TypeVar("T")
+
+
+def nearest_rank(ordered: Sequence[float], q: float) -> float:
+    """Nearest-rank q-quantile of an already sorted, non-empty sequence (shared by latency stats and benches)."""
+    idx = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+class LatencyHistory:
+    """Sliding window of observed call latencies (seconds)."""
+
+    def __init__(self, window: int = 50) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(max(0.0, seconds))
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        return nearest_rank(sorted(self._samples), q)
+
+
+@dataclass
+class HedgePolicy:
+    enabled: bool
+    quantile: float = 0.9
+    initial_delay_sec: float = 4.0
+    min_delay_sec: float = 0.5
+    max_delay_sec: float = 12.5
+    min_samples: int = 5
+    model: Optional[str] = None
+    base_url: Optional[str] = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "HedgePolicy":
+        return cls(
+            enabled=settings.planner_hedge,
+            quantile=settings.planner_hedge_quantile,
+            initial_delay_sec=settings.planner_hedge_initial_delay_sec,
+            min_delay_sec=settings.planner_hedge_min_delay_sec,
+            # Hedging past half the timeout leaves the second request no time to win.
+            max_delay_sec=max(settings.planner_hedge_min_delay_sec, settings.planner_timeout_sec * 0.5),
+            model=settings.planner_hedge_model,
+            base_url=settings.planner_hedge_base_url,
+        )
+
+    def delay_for(self, history: LatencyHistory) -> float:
+        observed = history.quantile(self.quantile) if len(history) >= self.min_samples else None
+        delay = observed if observed is not None else self.initial_delay_sec
+        return min(self.max_delay_sec, max(self.min_delay_sec, delay))
+
+
+async def run_hedged(
+    primary: Callable[[], Awaitable[T]],
+    hedge: Callable[[], Awaitable[T]],
+    *,
+    delay: float,
+) -> Tuple[T, str]:
+    """Run primary; if it has not finished after delay, also run hedge. First success wins, the loser is cancelled.
+
+    Returns (result, winner) where winner is "primary" or "hedge". If both fail, the last error is raised.
+    """
+    primary_task = asyncio.ensure_future(primary())
+    tasks = {primary_task: "primary"}
+    try:
+        done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        if done:
+            return primary_task.result(), "primary"
+        hedge_task = asyncio.ensure_future(hedge())
+        tasks[hedge_task] = "hedge"
+        pending = set(tasks)
+        last_error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.cancelled():
+                    continue
+                exc = task.exception()
+                if exc is None:
+                    return task.result(), tasks[task]
+                last_error = exc
+        raise last_error if last_error else RuntimeError("Hedged call produced no result.")
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, RateLimitError
+
+from agent.config.config import Settings
+from agent.infra.timing import LLM, span
+
+
+@dataclass(frozen=True)
+class LLMClientConfig:
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry_sec: float = 30.0
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    max_retries: int = 4
+    backoff_base_sec: float = 0.5
+    backoff_max_sec: float = 20.0
+    request_timeout_sec: float = 60.0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "LLMClientConfig":
+        return cls(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_keepalive,
+            keepalive_expiry_sec=settings.llm_keepalive_expiry_sec,
+            requests_per_minute=settings.llm_requests_per_minute,
+            tokens_per_minute=settings.llm_tokens_per_minute,
+            max_retries=settings.llm_max_retries,
+            backoff_base_sec=settings.llm_backoff_base_sec,
+            backoff_max_sec=settings.llm_backoff_max_sec,
+            request_timeout_sec=max(settings.planner_timeout_sec, 1.0),
+        )
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at per_minute / 60 per second; per_minute <= 0 disables it."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(max(0, per_minute))
+        self.rate = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Take amount tokens, sleeping until available; returns seconds waited."""
+        if not self.enabled:
+            return 0.0
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+    def adjust(self, delta: float) -> None:
+        """Correct an earlier estimate (positive delta consumes more; the balance may go negative)."""
+        if not self.enabled:
+            return
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - delta)
+
+
+def _estimate_tokens(request: Dict[str, Any]) -> int:
+    # ~4 chars per token over message text; each image counts as a flat budget instead of its base64 length.
+    chars = 0
+    images = 0
+    for message in request.get("messages") or []:
+        content = message.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            for part in content:
+                if part.get("type") == "image_url":
+                    images += 1
+                else:
+                    chars += len(str(part.get("text") or ""))
+    try:
+        chars += len(json.dumps(request.get("tools") or [], ensure_ascii=False))
+    except Exception:
+        pass
+    return max(1, chars // 4 + images * 1000)
+
+
+def _retry_after_seconds(exc: Exception) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    raw_ms = headers.get("retry-after-ms")
+    if raw_ms:
+        try:
+            return max(0.0, float(raw_ms) / 1000.0)
+        except ValueError:
+            pass
+    raw = headers.get("retry-after")
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class SharedLLMClient:
+    """Process-wide OpenAI client: pooled keep-alive HTTP, RPM/TPM token buckets, retry-after + jittered backoff."""
+
+    def __init__(self, api_key: str, base_url: Optional[str], config: LLMClientConfig) -> None:
+        self.config = config
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry_sec,
+            ),
+            timeout=httpx.Timeout(config.request_timeout_sec, connect=10.0),
+        )
+        # Retries are handled here so that limits and backoff are shared by every caller.
+        self.openai = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=self.http_client, max_retries=0)
+        self.request_bucket = TokenBucket(config.requests_per_minute)
+        self.token_bucket = TokenBucket(config.tokens_per_minute)
+        self._blocked_until = 0.0
+        self.stats: Dict[str, Any] = {
+            "requests": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "throttle_wait_s": 0.0,
+        }
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform(0, min(cap, base * 2^attempt)).
+        ceiling = min(self.config.backoff_max_sec, self.config.backoff_base_sec * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def _wait_for_capacity(self, estimated_tokens: int) -> None:
+        waited = 0.0
+        pause = self._blocked_until - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+            waited += pause
+        waited += await self.request_bucket.acquire(1)
+        waited += await self.token_bucket.acquire(estimated_tokens)
+        self.stats["throttle_wait_s"] = round(self.stats["throttle_wait_s"] + waited, 3)
+
+    async def create_chat_completion(self, **request: Any) -> Any:
+        estimated = _estimate_tokens(request)
+        attempt = 0
+        while True:
+            with span("llm.throttle", LLM):
+                await self._wait_for_capacity(estimated)
+            self.stats["requests"] += 1
+            try:
+                with span("llm.chat_completion", LLM, model=request.get("model"), attempt=attempt):
+                    response = await self.openai.chat.completions.create(**request)
+            except (RateLimitError, InternalServerError, APIConnectionError) as exc:
+                if attempt >= self.config.max_retries:
+                    raise
+                delay = _retry_after_seconds(exc)
+                if isinstance(exc, RateLimitError):
+                    self.stats["rate_limited"] += 1
+                    # Pause every caller sharing this client, not just this one.
+                    delay = delay if delay is not None else self._backoff(attempt)
+                    self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+                else:
+                    delay = delay if delay is not None else self._backoff(attempt)
+                    await asyncio.sleep(delay)
+                self.stats["retries"] += 1
+                attempt += 1
+                continue
+            usage = getattr(response, "usage", None)
+            total = getattr(usage, "total_tokens", None) if usage else None
+            if total:
+                self.token_bucket.adjust(total - estimated)
+            return response
+
+    async def aclose(self) -> None:
+        try:
+            await self.http_client.aclose()
+        except Exception:
+            pass
+
+
+_SHARED_CLIENTS: Dict[Tuple[str, Optional[str], int], SharedLLMClient] = {}
+
+
+def get_shared_client(api_key: str, base_url: Optional[str], config: Optional[LLMClientConfig] = None) -> SharedLLMClient:
+    """Return the client for (api_key, base_url) on the current event loop, creating it on first use."""
+    try:
+        loop_id = id(asyncio.get_running_loop())
+    except RuntimeError:
+        loop_id = 0
+    key = (api_key, base_url, loop_id)
+    client = _SHARED_CLIENTS.get(key)
+    if client is None:
+        client = SharedLLMClient(api_key, base_url, config or LLMClientConfig())
+        _SHARED_CLIENTS[key] = client
+    return client
+
+
+async def close_shared_clients() -> None:
+    for key, client in list(_SHARED_CLIENTS.items()):
+        await client.aclose()
+        _SHARED_CLIENTS.pop(key, None)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from playwright.async_api import Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from agent.config.config import Settings
+from agent.infra.hedging import LatencyHistory
+from agent.infra.timing import CDP, timed
+
+_WAIT_STATES = {"commit", "domcontentloaded", "load", "networkidle"}
+DEFAULT_WAIT_UNTIL = {
+    "navigate": "domcontentloaded",
+    "go_back": "commit",
+    "go_forward": "commit",
+}
+
+# Resolves once the DOM has had no mutations for quietMs (or maxMs passed).
+_SETTLE_JS = """
+([quietMs, maxMs]) => new Promise((resolve) => {
+  const start = performance.now();
+  let last = start;
+  const root = document.documentElement || document;
+  const observer = new MutationObserver(() => { last = performance.now(); });
+  observer.observe(root, { subtree: true, childList: true, attributes: true, characterData: true });
+  const tick = () => {
+    const now = performance.now();
+    if (now - last >= quietMs || now - start >= maxMs) {
+      observer.disconnect();
+      resolve({ settled: now - last >= quietMs, waited_ms: Math.round(now - start) });
+    } else {
+      setTimeout(tick, Math.min(50, quietMs));
+    }
+  };
+  setTimeout(tick, quietMs);
+})
+"""
+
+
+def parse_wait_until(raw: str) -> Dict[str, str]:
+    """"navigate=load,go_back=domcontentloaded" → overrides on top of DEFAULT_WAIT_UNTIL; unknown states are ignored."""
+    mapping = dict(DEFAULT_WAIT_UNTIL)
+    for part in (raw or "").split(","):
+        action, _, state = part.partition("=")
+        action, state = action.strip(), state.strip().lower()
+        if action and state in _WAIT_STATES:
+            mapping[action] = state
+    return mapping
+
+
+def _domain(url: Optional[str]) -> str:
+    return (urlsplit(url or "").hostname or "").lower()
+
+
+class NavigationStrategy:
+    """Per-action wait states, DOM-settle check and per-domain adaptive navigation timeouts.
+
+    The timeout for a (domain, wait state) is multiplier × its p90 navigation time (last 50), clamped to [min, max];
+    until it has enough samples the max (80% of the execute timeout) applies. A timeout after the navigation
+    committed is not an error: the document exists and marks can be collected.
+    """
+
+    def __init__(
+        self,
+        *,
+        wait_until: Dict[str, str],
+        settle_quiet_ms: int = 300,
+        settle_max_ms: int = 2000,
+        timeout_min_sec: float = 3.0,
+        timeout_max_sec: float = 20.0,
+        timeout_multiplier: float = 3.0,
+        min_samples: int = 3,
+    ) -> None:
+        self.wait_until = wait_until
+        self.settle_quiet_ms = settle_quiet_ms
+        self.settle_max_ms = settle_max_ms
+        self.timeout_min_sec = timeout_min_sec
+        self.timeout_max_sec = max(timeout_min_sec, timeout_max_sec)
+        self.timeout_multiplier = timeout_multiplier
+        self.min_samples = min_samples
+        self._history: Dict[str, LatencyHistory] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "NavigationStrategy":
+        return cls(
+            wait_until=parse_wait_until(settings.nav_wait_until),
+            settle_quiet_ms=settings.nav_settle_quiet_ms,
+            settle_max_ms=settings.nav_settle_max_ms,
+            timeout_min_sec=settings.nav_timeout_min_sec,
+            # Leave headroom for settle + screenshot inside the execute budget.
+            timeout_max_sec=settings.execute_timeout_sec * 0.8,
+            timeout_multiplier=settings.nav_timeout_multiplier,
+        )
+
+    def timeout_for(self, domain: str, wait_until: str) -> float:
+        history = self._history.get(f"{domain}|{wait_until}")
+        p90 = history.quantile(0.9) if history is not None and len(history) >= self.min_samples else None
+        if p90 is None:
+            return self.timeout_max_sec
+        return min(self.timeout_max_sec, max(self.timeout_min_sec, p90 * self.timeout_multiplier))
+
+    def domain_summary(self) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {}
+        for key, history in self._history.items():
+            domain, _, wait_until = key.partition("|")
+            summary[key] = {
+                "samples": len(history),
+                "p50_s": history.quantile(0.5),
+                "p90_s": history.quantile(0.9),
+                "timeout_s": round(self.timeout_for(domain, wait_until), 2),
+            }
+        return summary
+
+    @timed("settle", CDP)
+    async def settle(self, page: Page) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            outcome = await page.evaluate(_SETTLE_JS, [self.settle_quiet_ms, self.settle_max_ms])
+        except Exception:
+            # Context destroyed by a late redirect: wait for the new document, then report unsettled.
+            try:
+                await page.wait_for_load_state("domcontentloaded", timeout=self.settle_max_ms)
+            except Exception:
+                pass
+            outcome = {"settled": False}
+        return {"settled": bool(outcome.get("settled")), "settle_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+    @timed("navigate", CDP)
+    async def navigate(self, page: Page, action_type: str, url: Optional[str] = None) -> Dict[str, Any]:
+        """Run navigate/go_back/go_forward with the configured wait state, then the settle check. Returns timing."""
+        wait_until = self.wait_until.get(action_type, "load")
+        start_url = page.url
+        domain = _domain(url) if action_type == "navigate" else _domain(start_url)
+        timeout_sec = self.timeout_for(domain, wait_until)
+        details: Dict[str, Any] = {
+            "action": action_type,
+            "wait_until": wait_until,
+            "domain": domain,
+            "timeout_s": round(timeout_sec, 2),
+            "timed_out": False,
+        }
+        started = time.perf_counter()
+        try:
+            if action_type == "navigate":
+                await page.goto(str(url), wait_until=wait_until, timeout=timeout_sec * 1000)  # type: ignore[arg-type]
+            elif action_type == "go_back":
+                await page.go_back(wait_until=wait_until, timeout=timeout_sec * 1000)  # type: ignore[arg-type]
+            else:
+                await page.go_forward(wait_until=wait_until, timeout=timeout_sec * 1000)  # type: ignore[arg-type]
+        except PlaywrightTimeoutError:
+            details["timed_out"] = True
+            if page.url == start_url:
+                self._history.setdefault(f"{domain}|{wait_until}", LatencyHistory()).record(time.perf_counter() - started)
+                raise
+        nav_sec = time.perf_counter() - started
+        details["nav_ms"] = round(nav_sec * 1000, 1)
+        final_domain = _domain(page.url) or domain
+        details["final_domain"] = final_domain
+        # Timeouts are recorded too, so a slow domain's budget grows instead of timing out forever. The lookup key
+        # always gets the sample (redirects would otherwise never feed the budget used next time); the landing
+        # domain too, for later navigations that start there.
+        for key_domain in {domain, final_domain}:
+            self._history.setdefault(f"{key_domain}|{wait_until}", LatencyHistory()).record(nav_sec)
+        details.update(await self.settle(page))
+        return details
@@ -13,6 +13,7 @@ class Paths:
     screenshots_dir: Path
     state_dir: Path
     logs_dir: Path
+    cache_dir: Path
 
     @classmethod
     def from_env(cls, root: Path) -> "Paths":
@@ -29,6 +30,22 @@ class Paths:
             screenshots_dir=_resolve("SCREENSHOTS_DIR", base_data / "screenshots"),
             state_dir=_resolve("STATE_DIR", base_data / "state"),
             logs_dir=_resolve("LOGS_DIR", root / "logs"),
+            cache_dir=_resolve("CACHE_DIR", base_data / "cache"),
+        )
+
+    def scoped(self, name: str, *, include_profile: bool = False) -> "Paths":
+        """Per-run view: artifacts/logs under <dir>/<name>; optionally a sibling profile dir <user_data_dir>-<name>."""
+        user_data_dir = self.user_data_dir
+        if include_profile:
+            user_data_dir = self.user_data_dir.parent / f"{self.user_data_dir.name}-{name}"
+        return Paths(
+            root=self.root,
+            user_data_dir=user_data_dir,
+            screenshots_dir=self.screenshots_dir / name,
+            state_dir=self.state_dir / name,
+            logs_dir=self.logs_dir / name,
+            # Learned data is shared across runs.
+            cache_dir=self.cache_dir,
         )
 
     def ensure(self) -> None:
@@ -41,4 +58,5 @@ class Paths:
             self.screenshots_dir,
             self.state_dir,
             self.logs_dir,
+            self.cache_dir,
         )
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import functools
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Generator, Optional
+
+
+@dataclass
+class _NodeStats:
+    profile: Optional[cProfile.Profile]
+    calls: int = 0
+    wall_s: float = 0.0
+    on_cpu_s: float = 0.0
+
+
+class _Profiled:
+    """Drives a node coroutine step by step; cProfile is enabled only while the coroutine itself runs.
+
+    Time the node spends suspended (awaiting CDP/LLM/disk) belongs to whatever else the event loop runs, so it is
+    neither profiled nor counted as on-CPU time. Tasks the node spawns are driven the same way (see _install_task_factory).
+    """
+
+    def __init__(self, coro: Coroutine[Any, Any, Any], profiler: "SessionProfiler", name: str, stats: _NodeStats) -> None:
+        self._coro = coro
+        self._profiler = profiler
+        self._name = name
+        self._stats = stats
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        coro, stats, profiler = self._coro, self._stats, self._profiler
+        value: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            profiler.current = self._name
+            started = time.perf_counter()
+            if stats.profile is not None:
+                stats.profile.enable()
+            try:
+                yielded = coro.throw(error) if error is not None else coro.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                if stats.profile is not None:
+                    stats.profile.disable()
+                stats.on_cpu_s += time.perf_counter() - started
+                profiler.current = None
+            try:
+                value, error = (yield yielded), None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as exc:  # noqa: BLE001 - cancellation etc. is forwarded into the node
+                value, error = None, exc
+
+
+class SessionProfiler:
+    """Per-node profiles of one graph run, written under logs/profile/<session_id>/ when the run ends.
+
+    cprofile: deterministic call graph per node (<node>.pstats + <node>.txt). sample: a thread samples the event-loop
+    thread's stack every interval and writes stacks.collapsed (flamegraph.pl / speedscope), each stack prefixed with
+    the node and whether it was running Python or awaiting I/O.
+    """
+
+    def __init__(self, session_id: str, out_dir: Path, *, mode: str, sample_interval_ms: int = 5) -> None:
+        self.session_id = session_id
+        self.out_dir = out_dir
+        self.deterministic = mode in {"cprofile", "both"}
+        self.sampling = mode in {"sample", "both"}
+        self.sample_interval_s = max(1, sample_interval_ms) / 1000
+        self.nodes: Dict[str, _NodeStats] = {}
+        self.current: Optional[str] = None  # node whose coroutine is executing right now
+        self.active: Optional[str] = None  # node in flight, possibly suspended
+        self._samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._target: Optional[int] = None
+
+    def start(self) -> None:
+        if not self.sampling or self._thread is not None:
+            return
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._sample_loop, name=f"profile-{self.session_id}", daemon=True)
+        self._thread.start()
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.sample_interval_s):
+            node = self.current or self.active
+            frame = sys._current_frames().get(self._target)  # type: ignore[arg-type]
+            if node is None or frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name})")
+                frame = frame.f_back
+            where = "python" if self.current else "awaiting"
+            self._samples[";".join([f"node.{node}", where, *reversed(stack)])] += 1
+
+    async def adopt(self, name: str, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Body of a task spawned by node `name`: its steps count as that node's work."""
+        return await _Profiled(coro, self, name, self.nodes[name])
+
+    async def run_node(self, name: str, node: Callable[[Any], Awaitable[Any]], state: Any) -> Any:
+        stats = self.nodes.get(name)
+        if stats is None:
+            stats = self.nodes[name] = _NodeStats(cProfile.Profile() if self.deterministic else None)
+        self.active = name
+        started = time.perf_counter()
+        try:
+            return await _Profiled(node(state), self, name, stats)  # type: ignore[arg-type]
+        finally:
+            stats.calls += 1
+            stats.wall_s += time.perf_counter() - started
+            self.active = None
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "calls": stats.calls,
+                "wall_ms": round(stats.wall_s * 1000, 1),
+                "on_cpu_ms": round(stats.on_cpu_s * 1000, 1),
+                "awaiting_ms": round(max(0.0, stats.wall_s - stats.on_cpu_s) * 1000, 1),
+            }
+            for name, stats in sorted(self.nodes.items(), key=lambda item: item[1].wall_s, reverse=True)
+        }
+
+    def finish(self, *, trace: Optional[Any], text_log: Optional[Any]) -> Dict[str, Any]:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        summary = self.summary()
+        try:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            for name, stats in self.nodes.items():
+                if stats.profile is None:
+                    continue
+                stats.profile.dump_stats(str(self.out_dir / f"{name}.pstats"))
+                text = io.StringIO()
+                pstats.Stats(stats.profile, stream=text).sort_stats("cumulative").print_stats(30)
+                (self.out_dir / f"{name}.txt").write_text(text.getvalue(), encoding="utf-8")
+            if self._samples:
+                lines = [f"{stack} {count}" for stack, count in self._samples.most_common()]
+                (self.out_dir / "stacks.collapsed").write_text("\n".join(lines) + "\n", encoding="utf-8")
+            (self.out_dir / "summary.json").write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+        except Exception as exc:
+            if text_log:
+                text_log.write(f"[{self.session_id}] profile not written: {exc}")
+        if trace:
+            try:
+                trace.write({"profile": summary, "profile_dir": str(self.out_dir), "session_id": self.session_id})
+            except Exception:
+                pass
+        if text_log:
+            text_log.write(f"[{self.session_id}] profiles written to {self.out_dir}")
+        return summary
+
+
+_session: ContextVar[Optional[SessionProfiler]] = ContextVar("agent_profile_session", default=None)
+
+
+def _install_task_factory() -> None:
+    """Profile tasks spawned while a node is executing as part of that node.
+
+    asyncio.wait_for (before 3.12), gather and create_task run the awaited coroutine in a new task, which would
+    otherwise escape the node's _Profiled steps and show up as "awaiting". Installed once per loop; the profiler is
+    looked up from the spawning task's context, so concurrent sessions each keep their own.
+    """
+    loop = asyncio.get_running_loop()
+    previous = loop.get_task_factory()
+    if getattr(previous, "_agent_profiling", False):
+        return
+
+    def factory(loop: asyncio.AbstractEventLoop, coro: Any, **kwargs: Any) -> "asyncio.Future[Any]":
+        profiler = _session.get()
+        if profiler is not None and profiler.current is not None and asyncio.iscoroutine(coro):
+            coro = profiler.adopt(profiler.current, coro)
+        if previous is not None:
+            return previous(loop, coro, **kwargs)
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    factory._agent_profiling = True  # type: ignore[attr-defined]
+    loop.set_task_factory(factory)
+
+
+def bind_profiler(profiler: SessionProfiler) -> Token:
+    profiler.start()
+    _install_task_factory()
+    return _session.set(profiler)
+
+
+def unbind_profiler(token: Token) -> None:
+    _session.reset(token)
+
+
+def profiled_node(name: str, node: Callable[[Any], Awaitable[Any]]) -> Callable[[Any], Awaitable[Any]]:
+    """Graph node wrapper; only installed when profiling is on, so the default path has no extra frame."""
+
+    @functools.wraps(node)
+    async def wrapped(state: Any) -> Any:
+        profiler = _session.get()
+        if profiler is None:
+            return await node(state)
+        return await profiler.run_node(name, node, state)
+
+    return wrapped
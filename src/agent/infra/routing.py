@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import weakref
+from collections import Counter
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext, Page, Request, Route
+
+from agent.config.config import Settings
+
+# Ad/analytics hosts that never contribute DOM the agent can act on.
+TRACKER_DOMAINS: FrozenSet[str] = frozenset(
+    {
+        "doubleclick.net",
+        "googlesyndication.com",
+        "googleadservices.com",
+        "google-analytics.com",
+        "googletagmanager.com",
+        "adservice.google.com",
+        "facebook.net",
+        "hotjar.com",
+        "segment.io",
+        "scorecardresearch.com",
+        "criteo.com",
+        "taboola.com",
+        "outbrain.com",
+        "mixpanel.com",
+        "amplitude.com",
+        "nr-data.net",
+        "quantserve.com",
+        "adnxs.com",
+    }
+)
+
+PROFILES: Dict[str, Dict[str, FrozenSet[str]]] = {
+    "off": {"types": frozenset(), "domains": frozenset()},
+    "light": {"types": frozenset({"media", "font"}), "domains": TRACKER_DOMAINS},
+    "aggressive": {"types": frozenset({"image", "media", "font", "texttrack", "manifest"}), "domains": TRACKER_DOMAINS},
+}
+
+# Nothing is downloaded for an aborted request, so savings are estimated from typical transfer sizes.
+_ESTIMATED_BYTES = {
+    "image": 45_000,
+    "media": 400_000,
+    "font": 35_000,
+    "script": 25_000,
+    "stylesheet": 15_000,
+    "texttrack": 5_000,
+    "manifest": 2_000,
+}
+_DEFAULT_ESTIMATE = 5_000
+
+# Types still fetched in visual mode (screenshots would otherwise show empty boxes).
+_VISUAL_TYPES = frozenset({"image"})
+
+# Re-assigning src/srcset (same value) makes the browser fetch the image again; resolves when all settled or maxMs.
+_RELOAD_IMAGES_JS = """
+(maxMs) => new Promise((resolve) => {
+  const broken = Array.from(document.images).filter((img) => img.src && (!img.complete || img.naturalWidth === 0));
+  if (!broken.length) return resolve(0);
+  let pending = broken.length;
+  const done = () => { if (--pending === 0) resolve(broken.length); };
+  for (const img of broken) {
+    if (img.srcset) img.srcset = img.srcset;
+    img.src = img.src;
+    img.addEventListener("load", done, { once: true });
+    img.addEventListener("error", done, { once: true });
+  }
+  setTimeout(() => resolve(broken.length), maxMs);
+})
+"""
+
+
+def _host_matches(host: str, domains: Iterable[str]) -> Optional[str]:
+    for domain in domains:
+        if host == domain or host.endswith("." + domain):
+            return domain
+    return None
+
+
+class NetworkRouter:
+    """context.route handler that aborts resource types/domains of the active profile and counts what it saved."""
+
+    def __init__(
+        self,
+        profile: str = "off",
+        *,
+        extra_types: Iterable[str] = (),
+        extra_domains: Iterable[str] = (),
+        allow_domains: Iterable[str] = (),
+        visual: bool = False,
+    ) -> None:
+        base = PROFILES.get(profile, PROFILES["off"])
+        self.profile = profile if profile in PROFILES else "off"
+        self.block_types = frozenset(base["types"]) | frozenset(t.lower() for t in extra_types)
+        self.block_domains = frozenset(base["domains"]) | frozenset(d.lower() for d in extra_domains)
+        self.allow_domains = frozenset(d.lower() for d in allow_domains)
+        self.base_visual = visual
+        self.visual = visual
+        self._installed: "weakref.WeakSet[BrowserContext]" = weakref.WeakSet()
+        self.reset_session()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "NetworkRouter":
+        return cls(
+            settings.route_profile,
+            extra_types=settings.route_block_types,
+            extra_domains=settings.route_block_domains,
+            allow_domains=settings.route_allow_domains,
+            # Every step screenshots anyway: never strip images.
+            visual=settings.observe_screenshot_mode == "always" or settings.planner_screenshot_mode == "always",
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.block_types or self.block_domains)
+
+    async def install(self, context: BrowserContext) -> None:
+        if not self.enabled or context in self._installed:
+            return
+        await context.route("**/*", self._handle)
+        self._installed.add(context)
+
+    def require_visual(self) -> bool:
+        """A step needs screenshots: stop stripping images for the rest of the session.
+
+        True when this switched visual mode on after images had been blocked, i.e. the current page is missing some
+        (see reload_images).
+        """
+        if self.visual:
+            return False
+        self.visual = True
+        self.session["visual_enabled"] = True
+        return self.session["blocked_by_type"]["image"] > 0
+
+    async def reload_images(self, page: Page, *, max_ms: int = 1500) -> int:
+        """Fetch the <img>s aborted before visual mode again, in place (no navigation, marks stay valid)."""
+        try:
+            return int(await page.evaluate(_RELOAD_IMAGES_JS, max_ms) or 0)
+        except Exception:
+            return 0
+
+    def reset_session(self) -> None:
+        """Start per-session counters; visual mode falls back to the configured default."""
+        self.visual = self.base_visual
+        self.session: Dict[str, Any] = {
+            "requests": 0,
+            "blocked": 0,
+            "est_bytes_saved": 0,
+            "blocked_by_type": Counter(),
+            "blocked_by_domain": Counter(),
+            "visual_enabled": False,
+        }
+
+    def session_stats(self) -> Dict[str, Any]:
+        stats = dict(self.session)
+        stats["profile"] = self.profile
+        stats["blocked_by_type"] = dict(self.session["blocked_by_type"])
+        stats["blocked_by_domain"] = dict(self.session["blocked_by_domain"].most_common(10))
+        return stats
+
+    def _block_reason(self, resource_type: str, host: str) -> Optional[str]:
+        if self.allow_domains and _host_matches(host, self.allow_domains):
+            return None
+        domain = _host_matches(host, self.block_domains)
+        if domain:
+            return domain
+        if resource_type in self.block_types and not (self.visual and resource_type in _VISUAL_TYPES):
+            return f"type:{resource_type}"
+        return None
+
+    async def _handle(self, route: Route, request: Request) -> None:
+        resource_type = request.resource_type
+        self.session["requests"] += 1
+        # Never block the page itself, whatever its host.
+        if resource_type != "document":
+            host = (urlsplit(request.url).hostname or "").lower()
+            reason = self._block_reason(resource_type, host)
+            if reason:
+                self.session["blocked"] += 1
+                self.session["est_bytes_saved"] += _ESTIMATED_BYTES.get(resource_type, _DEFAULT_ESTIMATE)
+                self.session["blocked_by_type"][resource_type] += 1
+                if not reason.startswith("type:"):
+                    self.session["blocked_by_domain"][reason] += 1
+                try:
+                    await route.abort("blockedbyclient")
+                except Exception:
+                    pass
+                return
+        try:
+            # fallback() (not continue_) so other route handlers, e.g. HAR replay, still see the request.
+            await route.fallback()
+        except Exception:
+            pass
@@ -3,9 +3,13 @@ from __future__ import annotations
 import asyncio
 from typing import Optional
 
-from playwright.async_api import BrowserContext, Page, Playwright, async_playwright
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
 
 from agent.config.config import Settings
+from agent.infra.navigation import NavigationStrategy
+from agent.infra.routing import NetworkRouter
+from agent.infra.tab_hygiene import TabHygiene
+from agent.infra.tab_registry import TabRegistry
 
 
 class BrowserRuntime:
@@ -15,6 +19,22 @@ class BrowserRuntime:
         self._context: Optional[BrowserContext] = None
         self._page: Optional[Page] = None
         self._active_page_id: Optional[str] = None
+        # Pooled runtimes wrap a context owned by BrowserPool's shared browser; they never relaunch.
+        self._pooled = False
+        # Set when attached over CDP: the browser belongs to someone else and must survive close().
+        self._cdp_browser: Optional[Browser] = None
+        self.router = NetworkRouter.from_settings(settings)
+        self.tabs = TabRegistry()
+        self.hygiene = TabHygiene(settings, self)
+        # Owned here so per-domain navigation history survives across goals.
+        self.navigation = NavigationStrategy.from_settings(settings)
+
+    @classmethod
+    def from_context(cls, settings: Settings, context: BrowserContext) -> "BrowserRuntime":
+        runtime = cls(settings)
+        runtime._pooled = True
+        runtime._adopt_context(context)
+        return runtime
 
     @property
     def page(self) -> Page:
@@ -22,6 +42,15 @@ class BrowserRuntime:
             raise RuntimeError("Browser page is not available. Call ensure_page() first.")
         return self._page
 
+    @property
+    def active_page(self) -> Optional[Page]:
+        """The active page, or None when there is none (unlike `page`, never raises)."""
+        return self._page if self._page and not self._page.is_closed() else None
+
+    @property
+    def context(self) -> Optional[BrowserContext]:
+        return self._context
+
     @staticmethod
     def is_target_closed_error(exc: Exception) -> bool:
         """Best-effort check for closed/terminated page/context."""
@@ -31,7 +60,10 @@ class BrowserRuntime:
     def set_active_page(self, page: Page) -> None:
         if page.is_closed():
             return
+        # Stamp both the tab being left and the one being entered.
+        self.tabs.mark_active(self._page)
         self._page = page
+        self.tabs.mark_active(page)
         try:
             self._active_page_id = page.guid  # type: ignore[attr-defined]
         except Exception:
@@ -69,24 +101,12 @@ class BrowserRuntime:
         print(f"[runtime] New page detected: {page.url}")
 
     async def get_pages_meta(self) -> list[dict[str, str]]:
-        pages = []
         if not self._context:
-            return pages
-        for idx, p in enumerate(self._context.pages):
-            try:
-                pages.append(
-                    {
-                        "index": str(idx),
-                        "id": getattr(p, "guid", None),  # type: ignore[attr-defined]
-                        "url": p.url,
-                        "title": await p.title(),
-                        "is_closed": str(p.is_closed()),
-                        "active": str(self._page == p),
-                    }
-                )
-            except Exception:
-                continue
-        return pages
+            return []
+        try:
+            return await self.tabs.snapshot(list(self._context.pages), self._page)
+        except Exception:
+            return []
 
     def get_active_page_id(self) -> Optional[str]:
         return self._active_page_id
@@ -111,6 +131,9 @@ class BrowserRuntime:
         if not self._context:
             return None
         candidates: list[Page] = []
+        if title_substr:
+            # Warms any stale titles concurrently; the loop below then reads them from the registry.
+            await self.get_pages_meta()
         for idx, p in enumerate(self._context.pages):
             if p.is_closed():
                 continue
@@ -121,37 +144,34 @@ class BrowserRuntime:
                 candidates.append(p)
                 continue
             if title_substr:
-                try:
-                    title = await p.title()
-                    if title_substr.lower() in title.lower():
-                        candidates.append(p)
-                except Exception:
-                    continue
+                info = self.tabs.get(p)
+                if info and title_substr.lower() in info.title.lower():
+                    candidates.append(p)
         if candidates:
             self.set_active_page(candidates[-1])
             return self._page
         return None
 
-    async def launch(self) -> Page:
+    async def launch(self, *, initial_url: Optional[str] = None) -> Page:
         if self._context:
             return self.page
 
-        self._playwright = await async_playwright().start()
+        if not self._playwright:
+            self._playwright = await async_playwright().start()
         chromium = self._playwright.chromium
+        if self.settings.cdp_endpoint:
+            return await self._attach_over_cdp(self.settings.cdp_endpoint)
         viewport = None
         if self.settings.viewport_width and self.settings.viewport_height:
             viewport = {"width": self.settings.viewport_width, "height": self.settings.viewport_height}
-        self._context = await chromium.launch_persistent_context(
+        context = await chromium.launch_persistent_context(
             user_data_dir=str(self.settings.paths.user_data_dir),
             headless=self.settings.headless,
             viewport=viewport,
             args=["--start-maximized"],
         )
-
-        try:
-            self._context.on("page", self._handle_new_page)
-        except Exception:
-            pass
+        self._adopt_context(context)
+        await self.prepare_context()
 
         self._page = self._context.pages[0] if self._context.pages else await self._context.new_page()
         try:
@@ -160,10 +180,129 @@ class BrowserRuntime:
         except Exception:
             pass
         self.set_active_page(self._page)
-        if self.settings.start_url:
+        target_url = initial_url or self.settings.start_url
+        if target_url:
+            await self._page.goto(target_url)
+        return self._page
+
+    async def _attach_over_cdp(self, endpoint: str) -> Page:
+        """Adopt the first context of an already running Chromium and its most recent alive tab."""
+        assert self._playwright is not None
+        self._cdp_browser = await self._playwright.chromium.connect_over_cdp(endpoint)
+        contexts = self._cdp_browser.contexts
+        context = contexts[0] if contexts else await self._cdp_browser.new_context()
+        self._adopt_context(context)
+        await self.prepare_context()
+        for existing in context.pages:
+            try:
+                existing.on("close", lambda _, page_ref=existing: self._handle_page_close(page_ref))
+            except Exception:
+                pass
+        alive = self._select_alive_page()
+        self._page = alive or await context.new_page()
+        self.set_active_page(self._page)
+        # A warm tab keeps whatever it was showing; only a blank one is sent to start_url.
+        if self.settings.start_url and (self._page.url in ("", "about:blank")):
             await self._page.goto(self.settings.start_url)
         return self._page
 
+    async def prepare_context(self) -> None:
+        """Context-level hooks installed once per adopted context: tab title watcher, blocking/HAR routes."""
+        if not self._context:
+            return
+        await self.tabs.install(self._context)
+        await self.install_routing()
+
+    async def install_routing(self) -> None:
+        """Blocking profile first, then HAR: handlers registered later run first, so replay answers before blocking."""
+        if not self._context:
+            return
+        try:
+            await self.router.install(self._context)
+        except Exception as exc:
+            print(f"[runtime] Network routing not installed: {exc}")
+        await self._install_har()
+
+    async def _install_har(self) -> None:
+        mode = self.settings.har_mode
+        if mode == "off" or not self._context:
+            return
+        har_path = self.settings.har_path
+        if mode == "replay" and not har_path.exists():
+            raise RuntimeError(f"HAR_MODE=replay but {har_path} does not exist; record it first with HAR_MODE=record.")
+        har_path.parent.mkdir(parents=True, exist_ok=True)
+        if mode == "record":
+            # Written when the context closes (runtime.close()); attached CDP contexts are never closed by us.
+            if self._cdp_browser:
+                print("[runtime] HAR recording needs an owned context; it is not written when attached over CDP.")
+            await self._context.route_from_har(
+                har_path,
+                url=self.settings.har_url_filter,
+                update=True,
+                update_content="embed",
+                update_mode="full",
+            )
+        else:
+            await self._context.route_from_har(
+                har_path,
+                url=self.settings.har_url_filter,
+                not_found=self.settings.har_not_found,
+            )
+        print(f"[runtime] HAR {mode}: {har_path}")
+
+    @property
+    def attached(self) -> bool:
+        return self._cdp_browser is not None
+
+    def _adopt_context(self, context: BrowserContext) -> None:
+        self._context = context
+        self.tabs.attach(context)
+        try:
+            self._context.on("page", self._handle_new_page)
+        except Exception:
+            pass
+
+    async def storage_state(self) -> Optional[dict]:
+        """Cookies/localStorage snapshot of the current context (used to seed pooled contexts)."""
+        if not self._context:
+            return None
+        try:
+            return await self._context.storage_state()
+        except Exception:
+            return None
+
+    async def recycle_context(self) -> bool:
+        """Close and relaunch the persistent context to release renderer memory, keeping storage and the current URL.
+
+        Session cookies are not written to the profile on close, so they are restored from storage_state().
+        Pooled and CDP-attached contexts are not ours to recycle. Neither is a context recording a HAR: closing it
+        writes the file, and the relaunched context would overwrite it with only the post-recycle traffic.
+        """
+        if not self._context or self._pooled or self._cdp_browser or self.settings.har_mode == "record":
+            return False
+        state = await self.storage_state()
+        url = self._page.url if self._page and not self._page.is_closed() else None
+        try:
+            await self._context.close()
+        except Exception:
+            pass
+        self._context = None
+        self._page = None
+        self._active_page_id = None
+        keep_url = url if url and url != "about:blank" else None
+        await self.launch(initial_url=keep_url)
+        if state and state.get("cookies") and self._context:
+            try:
+                await self._context.add_cookies(state["cookies"])
+            except Exception:
+                pass
+        print(f"[runtime] Browser context recycled; resumed at {keep_url or self.settings.start_url}")
+        return True
+
+    async def between_goals(self) -> dict:
+        """Tab/memory hygiene between goals (never mid-goal): close stale tabs, recycle on heap threshold."""
+        return await self.hygiene.between_goals()
+
     async def ensure_page(self) -> Page:
         if self._page and not self._page.is_closed():
             return self._page
@@ -175,13 +314,16 @@ class BrowserRuntime:
             self._page = await self._context.new_page()
             self.set_active_page(self._page)
             return self._page
+        if self._pooled:
+            raise RuntimeError("Pooled browser context is closed.")
         # If context missing, relaunch
         return await self.launch()
 
     async def close(self) -> None:
         # Gracefully close, suppressing errors if browser already terminated by user.
+        # Attached (CDP) browsers are only disconnected by stopping Playwright; their contexts stay alive.
         try:
-            if self._context:
+            if self._context and not self._cdp_browser:
                 await self._context.close()
         except Exception:
             pass
@@ -194,6 +336,7 @@ class BrowserRuntime:
             pass
         finally:
             self._playwright = None
+        self._cdp_browser = None
         self._page = None
 
     async def idle(self) -> None:
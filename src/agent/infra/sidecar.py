@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from playwright.async_api import async_playwright
+
+from agent.config.config import Settings
+
+
+def _state_file(settings: Settings) -> Path:
+    return settings.paths.state_dir / "sidecar.json"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def endpoint_ready(endpoint: str, timeout: float = 0.5) -> bool:
+    """True when the CDP endpoint answers /json/version."""
+    try:
+        with urllib.request.urlopen(f"{endpoint.rstrip('/')}/json/version", timeout=timeout) as resp:
+            return resp.status == 200
+    except Exception:
+        return False
+
+
+def sidecar_status(settings: Settings) -> Optional[Dict[str, Any]]:
+    """Recorded sidecar info if its process is still alive, else None."""
+    path = _state_file(settings)
+    if not path.exists():
+        return None
+    try:
+        info = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not _pid_alive(int(info.get("pid") or 0)):
+        return None
+    return info
+
+
+async def start_sidecar(settings: Settings, *, wait_sec: float = 15.0) -> Dict[str, Any]:
+    """Start (or reuse) a detached Chromium with remote debugging on settings.sidecar_port.
+
+    The process gets its own session so it outlives the agent; its profile is the regular user_data_dir, which means
+    the agent must attach to it (CDP_ENDPOINT) rather than launch the same profile itself.
+    """
+    existing = sidecar_status(settings)
+    if existing and endpoint_ready(existing["endpoint"]):
+        return existing
+    async with async_playwright() as pw:
+        executable = pw.chromium.executable_path
+    port = settings.sidecar_port
+    args = [
+        executable,
+        f"--remote-debugging-port={port}",
+        "--remote-debugging-address=127.0.0.1",
+        f"--user-data-dir={settings.paths.user_data_dir}",
+        "--no-first-run",
+        "--no-default-browser-check",
+    ]
+    if settings.sidecar_headless:
+        args.append("--headless=new")
+    args.append(settings.start_url or "about:blank")
+    log_path = settings.paths.logs_dir / "sidecar.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with log_path.open("ab") as log_f:
+        proc = subprocess.Popen(args, stdout=log_f, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL, start_new_session=True)
+    endpoint = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + wait_sec
+    while time.monotonic() < deadline:
+        if endpoint_ready(endpoint):
+            break
+        if proc.poll() is not None:
+            raise RuntimeError(f"Sidecar browser exited with code {proc.returncode}; see {log_path}")
+        await asyncio.sleep(0.1)
+    else:
+        raise RuntimeError(f"Sidecar browser did not expose CDP on {endpoint} within {wait_sec}s")
+    info = {"pid": proc.pid, "endpoint": endpoint, "started_at": time.time(), "headless": settings.sidecar_headless}
+    path = _state_file(settings)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(info), encoding="utf-8")
+    return info
+
+
+def stop_sidecar(settings: Settings, *, wait_sec: float = 5.0) -> bool:
+    """Terminate the recorded sidecar; returns False when none was running."""
+    info = sidecar_status(settings)
+    _state_file(settings).unlink(missing_ok=True)
+    if not info:
+        return False
+    pid = int(info["pid"])
+    try:
+        os.killpg(pid, signal.SIGTERM)
+    except Exception:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except Exception:
+            return False
+    deadline = time.monotonic() + wait_sec
+    while time.monotonic() < deadline and _pid_alive(pid):
+        time.sleep(0.1)
+    if _pid_alive(pid):
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except Exception:
+            pass
+    return True
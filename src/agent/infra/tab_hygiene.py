@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from playwright.async_api import Page
+
+from agent.config.config import Settings
+
+if TYPE_CHECKING:
+    from agent.infra.runtime import BrowserRuntime
+
+
+class TabHygiene:
+    """Between-goal housekeeping: close stale tabs and recycle the context when JS heap grows too large.
+
+    Tabs are closed when idle longer than tab_idle_ttl_sec, then least-recently-active first while more than
+    max_tabs are open. The active tab and the last remaining tab are never closed, and nothing is closed in a
+    browser attached over CDP: its tabs belong to the user.
+    """
+
+    def __init__(self, settings: Settings, runtime: "BrowserRuntime") -> None:
+        self.settings = settings
+        self.runtime = runtime
+
+    async def sweep(self) -> List[Dict[str, Any]]:
+        context = self.runtime.context
+        if not context or self.runtime.attached:
+            return []
+        active = self.runtime.active_page
+        now = time.monotonic()
+        pages = [p for p in context.pages if not p.is_closed()]
+
+        def last_active(page: Page) -> float:
+            info = self.runtime.tabs.get(page)
+            return info.last_active if info else now
+
+        victims: List[Page] = []
+        ttl = self.settings.tab_idle_ttl_sec
+        if ttl > 0:
+            victims.extend(p for p in pages if p != active and now - last_active(p) > ttl)
+        survivors = sorted((p for p in pages if p not in victims), key=last_active)
+        max_tabs = self.settings.max_tabs
+        if max_tabs > 0:
+            excess = len(survivors) - max_tabs
+            for page in survivors:
+                if excess <= 0:
+                    break
+                if page == active:
+                    continue
+                victims.append(page)
+                excess -= 1
+        if len(victims) >= len(pages):
+            victims = victims[: len(pages) - 1]
+        closed: List[Dict[str, Any]] = []
+        for page in victims:
+            entry = {"url": page.url, "idle_s": round(now - last_active(page), 1)}
+            try:
+                await page.close()
+                closed.append(entry)
+            except Exception:
+                continue
+        return closed
+
+    async def _page_heap_bytes(self, page: Page) -> Optional[int]:
+        context = self.runtime.context
+        if not context or page.is_closed():
+            return None
+        try:
+            session = await context.new_cdp_session(page)
+        except Exception:
+            return None
+        try:
+            await session.send("Performance.enable")
+            metrics = await session.send("Performance.getMetrics")
+            for metric in metrics.get("metrics", []):
+                if metric.get("name") == "JSHeapUsedSize":
+                    return int(metric.get("value") or 0)
+            return None
+        except Exception:
+            return None
+        finally:
+            try:
+                await session.detach()
+            except Exception:
+                pass
+
+    async def heap_usage(self) -> Dict[str, Any]:
+        """JSHeapUsedSize per open page (CDP Performance.getMetrics), fetched concurrently."""
+        context = self.runtime.context
+        if not context:
+            return {"total_mb": 0.0, "pages": []}
+        pages = [p for p in context.pages if not p.is_closed()]
+        sizes = await asyncio.gather(*(self._page_heap_bytes(p) for p in pages))
+        per_page = [
+            {"url": p.url, "heap_mb": round(size / (1024 * 1024), 1)} for p, size in zip(pages, sizes) if size is not None
+        ]
+        return {"total_mb": round(sum(item["heap_mb"] for item in per_page), 1), "pages": per_page}
+
+    async def between_goals(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {"closed_tabs": [], "heap": None, "recycled": False}
+        try:
+            report["closed_tabs"] = await self.sweep()
+        except Exception as exc:
+            report["sweep_error"] = str(exc)
+        threshold = self.settings.memory_recycle_mb
+        if threshold > 0:
+            report["heap"] = await self.heap_usage()
+            if report["heap"]["total_mb"] > threshold:
+                if self.settings.har_mode == "record":
+                    # Closing the context would end the HAR recording early (see recycle_context).
+                    report["recycle_skipped"] = "har_record"
+                else:
+                    report["recycled"] = await self.runtime.recycle_context()
+        return report
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from playwright.async_api import BrowserContext, Frame, Page
+
+from agent.infra.timing import CDP, timed
+
+_TITLE_BINDING = "__agentTabTitle"
+
+# Reports document.title changes through the binding; only the top frame, and only when the title actually changed.
+_TITLE_WATCH_JS = """
+(() => {
+  if (window.top !== window || window.__agentTitleWatch) return;
+  window.__agentTitleWatch = true;
+  let last = null;
+  const send = () => {
+    if (document.title === last) return;
+    last = document.title;
+    try { window.%s(last); } catch (e) {}
+  };
+  const hook = () => {
+    new MutationObserver(send).observe(document.head || document.documentElement, {
+      subtree: true, childList: true, characterData: true,
+    });
+    send();
+  };
+  if (document.readyState === "loading") document.addEventListener("DOMContentLoaded", hook);
+  else hook();
+})();
+""" % _TITLE_BINDING
+
+
+@dataclass
+class TabInfo:
+    page: Page
+    opened_at: float = field(default_factory=time.monotonic)
+    last_active: float = field(default_factory=time.monotonic)
+    title: str = ""
+    title_stale: bool = True
+
+
+class TabRegistry:
+    """Tab metadata kept current from context/page events, so per-step tab snapshots need no CDP round trips.
+
+    Titles arrive through an injected title watcher (binding) or are fetched on `load`; anything still stale when
+    a snapshot is taken is fetched concurrently.
+    """
+
+    def __init__(self, *, title_timeout_sec: float = 1.0) -> None:
+        self.title_timeout_sec = title_timeout_sec
+        self._tabs: Dict[Page, TabInfo] = {}
+        self._bound: "weakref.WeakSet[BrowserContext]" = weakref.WeakSet()
+        self.stats = {"snapshots": 0, "title_fetches": 0, "title_events": 0}
+
+    # --- event wiring --------------------------------------------------------------------------------------------
+
+    def attach(self, context: BrowserContext) -> None:
+        for page in context.pages:
+            self._track(page)
+        try:
+            context.on("page", self._track)
+        except Exception:
+            pass
+
+    async def install(self, context: BrowserContext) -> None:
+        """Register the title binding/init script once per context (existing documents get it on next navigation)."""
+        if context in self._bound:
+            return
+        self._bound.add(context)
+        try:
+            await context.expose_binding(_TITLE_BINDING, self._on_title_binding)
+            await context.add_init_script(_TITLE_WATCH_JS)
+        except Exception:
+            pass
+
+    def _track(self, page: Page) -> None:
+        if page in self._tabs or page.is_closed():
+            return
+        info = TabInfo(page=page)
+        self._tabs[page] = info
+        try:
+            page.on("close", lambda *_: self._tabs.pop(page, None))
+            page.on("framenavigated", lambda frame: self._on_navigated(page, frame))
+            page.on("load", lambda *_: self._on_load(page))
+        except Exception:
+            pass
+
+    def _on_navigated(self, page: Page, frame: Frame) -> None:
+        info = self._tabs.get(page)
+        if info is not None and frame == page.main_frame:
+            info.title_stale = True
+
+    def _on_load(self, page: Page) -> None:
+        info = self._tabs.get(page)
+        if info is None or not info.title_stale:
+            return
+        try:
+            asyncio.get_running_loop().create_task(self._refresh_title(info))
+        except RuntimeError:
+            pass
+
+    def _on_title_binding(self, source: Dict[str, Any], title: Any) -> None:
+        info = self._tabs.get(source.get("page"))  # type: ignore[arg-type]
+        if info is None:
+            return
+        info.title = str(title or "")
+        info.title_stale = False
+        self.stats["title_events"] += 1
+
+    async def _refresh_title(self, info: TabInfo) -> None:
+        if info.page.is_closed():
+            return
+        self.stats["title_fetches"] += 1
+        try:
+            info.title = await asyncio.wait_for(info.page.title(), timeout=self.title_timeout_sec)
+            info.title_stale = False
+        except Exception:
+            pass
+
+    # --- queries -------------------------------------------------------------------------------------------------
+
+    def mark_active(self, page: Optional[Page]) -> None:
+        info = self._tabs.get(page) if page is not None else None
+        if info is not None:
+            info.last_active = time.monotonic()
+
+    def get(self, page: Page) -> Optional[TabInfo]:
+        return self._tabs.get(page)
+
+    @timed("tab_snapshot", CDP)
+    async def snapshot(self, pages: List[Page], active: Optional[Page]) -> List[Dict[str, Any]]:
+        """Same shape as the old polled get_pages_meta(); only stale titles are fetched, all at once."""
+        self.stats["snapshots"] += 1
+        for page in pages:
+            self._track(page)
+        stale = [self._tabs[p] for p in pages if p in self._tabs and self._tabs[p].title_stale]
+        if stale:
+            await asyncio.gather(*(self._refresh_title(info) for info in stale))
+        meta: List[Dict[str, Any]] = []
+        for idx, page in enumerate(pages):
+            info = self._tabs.get(page)
+            meta.append(
+                {
+                    "index": str(idx),
+                    "id": getattr(page, "guid", None),  # type: ignore[attr-defined]
+                    "url": page.url,
+                    "title": info.title if info else "",
+                    "is_closed": str(page.is_closed()),
+                    "active": str(active == page),
+                }
+            )
+        return meta
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from collections import deque
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+from agent.infra.hedging import nearest_rank
+
+T = TypeVar("T")
+
+# Span categories; trace_export maps them onto Chrome trace-event "cat".
+NODE = "node"
+CDP = "cdp"
+LLM = "llm"
+IO = "io"
+COMPUTE = "compute"
+
+HISTOGRAM_WINDOW = 2000  # samples kept per span name for the session summary
+
+
+@dataclass
+class Span:
+    name: str
+    cat: str
+    start_us: int  # wall clock, epoch microseconds
+    dur_ms: float
+    depth: int
+    task: str
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "name": self.name,
+            "cat": self.cat,
+            "ts_us": self.start_us,
+            "ms": self.dur_ms,
+            "depth": self.depth,
+            "task": self.task,
+        }
+        if self.attrs:
+            payload["args"] = self.attrs
+        return payload
+
+
+class SessionTimings:
+    """Spans of one graph run: grouped per step for the trace, pooled per span name for the closing histogram."""
+
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self.step: Optional[int] = None
+        self._pending: List[Span] = []
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def add(self, span: Span) -> None:
+        self._pending.append(span)
+        self._samples.setdefault(span.name, deque(maxlen=HISTOGRAM_WINDOW)).append(span.dur_ms)
+
+    def flush_step(self, trace: Optional[Any], step: Optional[int]) -> None:
+        spans, self._pending = self._pending, []
+        if not spans or not trace:
+            return
+        try:
+            trace.write({"timing": {"step": step, "spans": [s.to_dict() for s in spans]}, "session_id": self.session_id})
+        except Exception:
+            pass
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        for name, samples in self._samples.items():
+            ordered = sorted(samples)
+            out[name] = {
+                "count": len(ordered),
+                "p50_ms": round(nearest_rank(ordered, 0.5), 1),
+                "p90_ms": round(nearest_rank(ordered, 0.9), 1),
+                "p99_ms": round(nearest_rank(ordered, 0.99), 1),
+                "max_ms": round(ordered[-1], 1),
+                "total_ms": round(sum(ordered), 1),
+            }
+        return dict(sorted(out.items(), key=lambda item: item[1]["total_ms"], reverse=True))
+
+    def finish(self, *, trace: Optional[Any], text_log: Optional[Any]) -> Dict[str, Dict[str, Any]]:
+        """Flush the last (unfinished) step and dump the per-span histogram."""
+        self.flush_step(trace, self.step)
+        summary = self.summary()
+        if trace and summary:
+            try:
+                trace.write({"timing_summary": summary, "session_id": self.session_id})
+            except Exception:
+                pass
+        if text_log and summary:
+            for name, stats in list(summary.items())[:8]:
+                text_log.write(
+                    f"[{self.session_id}] timing {name}: n={stats['count']} p50={stats['p50_ms']}ms "
+                    f"p90={stats['p90_ms']}ms p99={stats['p99_ms']}ms total={stats['total_ms']}ms"
+                )
+        return summary
+
+
+_session: ContextVar[Optional[SessionTimings]] = ContextVar("agent_timing_session", default=None)
+_depth: ContextVar[int] = ContextVar("agent_timing_depth", default=0)
+
+
+def bind_session(timings: SessionTimings) -> Token:
+    return _session.set(timings)
+
+
+def unbind_session(token: Token) -> None:
+    _session.reset(token)
+
+
+def current_session() -> Optional[SessionTimings]:
+    return _session.get()
+
+
+def _task_name() -> str:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return task.get_name() if task is not None else "main"
+
+
+class _SpanContext:
+    __slots__ = ("_timings", "_name", "_cat", "_attrs", "_token", "_wall", "_started")
+
+    def __init__(self, timings: SessionTimings, name: str, cat: str, attrs: Dict[str, Any]) -> None:
+        self._timings = timings
+        self._name = name
+        self._cat = cat
+        self._attrs = attrs
+
+    def __enter__(self) -> "_SpanContext":
+        self._token = _depth.set(_depth.get() + 1)
+        self._wall = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        dur_ms = round((time.perf_counter() - self._started) * 1000, 2)
+        depth = _depth.get() - 1
+        _depth.reset(self._token)
+        if exc_type is not None:
+            self._attrs["error"] = exc_type.__name__
+        self._timings.add(
+            Span(self._name, self._cat, int(self._wall * 1_000_000), dur_ms, depth, _task_name(), self._attrs)
+        )
+
+
+class _NullSpan:
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, cat: str = COMPUTE, **attrs: Any) -> Any:
+    """Timed block; a shared no-op outside an instrumented run, so call sites need no checks."""
+    timings = _session.get()
+    if timings is None:
+        return _NULL_SPAN
+    return _SpanContext(timings, name, cat, attrs)
+
+
+def timed(name: str, cat: str = COMPUTE) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorator form of span() for sync or async functions."""
+
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        if asyncio.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name, cat):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name, cat):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def timed_node(name: str, node: Callable[[Any], Awaitable[Any]], trace: Optional[Any]) -> Callable[[Any], Awaitable[Any]]:
+    """Graph node wrapper: one span per node run; the step's spans go to the trace once progress advances the step."""
+
+    @functools.wraps(node)
+    async def wrapped(state: Any) -> Any:
+        timings = _session.get()
+        if timings is None:
+            return await node(state)
+        step = state.get("step")
+        timings.step = step
+        with span(f"node.{name}", NODE, step=step):
+            result = await node(state)
+        if isinstance(result, dict) and result.get("step") != step:
+            timings.flush_step(trace, step)
+        return result
+
+    return wrapped
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# tid 0 of every session process carries the step envelopes; span lanes start at 1.
+_STEP_TID = 0
+
+
+def iter_records(paths: Iterable[Path]) -> Iterator[Dict[str, Any]]:
+    """trace.jsonl records from one or more files (farm/concurrent layouts included); bad lines are skipped."""
+    for path in paths:
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict):
+                    yield record
+
+
+def _session_key(record: Dict[str, Any]) -> str:
+    session = str(record.get("session_id") or "session")
+    # Farm traces interleave workers; keep them apart even if a session id repeats after a requeue.
+    return f"{record['worker']}/{session}" if record.get("worker") is not None else session
+
+
+def _pack_lanes(spans: List[Dict[str, Any]]) -> Dict[str, int]:
+    """One lane per asyncio task while it runs; lanes are reused once a task is done, so nesting stays valid."""
+    extents: Dict[str, Tuple[int, int]] = {}
+    for item in spans:
+        start = int(item["ts_us"])
+        end = start + int(round(float(item["ms"]) * 1000))
+        task = str(item.get("task") or "main")
+        lo, hi = extents.get(task, (start, end))
+        extents[task] = (min(lo, start), max(hi, end))
+    lane_ends: List[int] = []
+    lanes: Dict[str, int] = {}
+    for task, (start, end) in sorted(extents.items(), key=lambda item: item[1]):
+        for idx, lane_end in enumerate(lane_ends):
+            if lane_end <= start:
+                lanes[task] = idx + 1
+                lane_ends[idx] = end
+                break
+        else:
+            lane_ends.append(end)
+            lanes[task] = len(lane_ends)
+    return lanes
+
+
+def build_trace(records: Iterable[Dict[str, Any]], *, session: Optional[str] = None) -> Dict[str, Any]:
+    """Chrome trace-event JSON (Perfetto / chrome://tracing): one process per session, spans as complete events."""
+    sessions: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        if session and record.get("session_id") != session:
+            continue
+        key = _session_key(record)
+        entry = sessions.setdefault(key, {"steps": [], "summary": None, "goal": None, "terminal": None})
+        if isinstance(record.get("timing"), dict):
+            entry["steps"].append(record["timing"])
+        elif isinstance(record.get("timing_summary"), dict):
+            entry["summary"] = record["timing_summary"]
+        elif record.get("summary"):
+            entry["terminal"] = record
+        if record.get("goal") and not entry["goal"]:
+            entry["goal"] = record["goal"]
+
+    events: List[Dict[str, Any]] = []
+    other: Dict[str, Any] = {}
+    for pid, (key, entry) in enumerate(sorted(sessions.items()), start=1):
+        spans = [span for step in entry["steps"] for span in step.get("spans") or []]
+        if not spans:
+            continue
+        label = f"{key} — {entry['goal']}" if entry["goal"] else key
+        events.append({"ph": "M", "pid": pid, "tid": 0, "name": "process_name", "args": {"name": label}})
+        events.append({"ph": "M", "pid": pid, "tid": _STEP_TID, "name": "thread_name", "args": {"name": "steps"}})
+        lanes = _pack_lanes(spans)
+        for lane in sorted(set(lanes.values())):
+            events.append({"ph": "M", "pid": pid, "tid": lane, "name": "thread_name", "args": {"name": f"lane {lane}"}})
+        for step in entry["steps"]:
+            step_spans = step.get("spans") or []
+            if not step_spans:
+                continue
+            start = min(int(s["ts_us"]) for s in step_spans)
+            end = max(int(s["ts_us"]) + int(round(float(s["ms"]) * 1000)) for s in step_spans)
+            events.append(
+                {"ph": "X", "pid": pid, "tid": _STEP_TID, "name": f"step {step.get('step')}", "cat": "step", "ts": start, "dur": end - start}
+            )
+        last_end = 0
+        for span in spans:
+            start = int(span["ts_us"])
+            dur = int(round(float(span["ms"]) * 1000))
+            last_end = max(last_end, start + dur)
+            args = dict(span.get("args") or {})
+            args["task"] = span.get("task")
+            events.append(
+                {
+                    "ph": "X",
+                    "pid": pid,
+                    "tid": lanes[str(span.get("task") or "main")],
+                    "name": span["name"],
+                    "cat": span.get("cat") or "compute",
+                    "ts": start,
+                    "dur": dur,
+                    "args": args,
+                }
+            )
+        terminal = entry["terminal"]
+        if terminal:
+            events.append(
+                {
+                    "ph": "i",
+                    "s": "p",
+                    "pid": pid,
+                    "tid": _STEP_TID,
+                    "name": f"terminal: {terminal.get('terminal_reason') or terminal.get('stop_reason')}",
+                    "ts": last_end,
+                    "args": {"stop_reason": terminal.get("stop_reason"), "stop_details": terminal.get("stop_details")},
+                }
+            )
+        if entry["summary"]:
+            other[key] = entry["summary"]
+    return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"timing_summary": other}}
+
+
+def export(inputs: List[Path], out: Path, *, session: Optional[str] = None) -> Dict[str, Any]:
+    trace = build_trace(iter_records(inputs), session=session)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(trace, ensure_ascii=False), encoding="utf-8")
+    processes = {e["pid"] for e in trace["traceEvents"]}
+    spans = sum(1 for e in trace["traceEvents"] if e["ph"] == "X" and e["tid"] != _STEP_TID)
+    return {"path": str(out), "sessions": len(processes), "spans": spans}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert trace.jsonl timing spans to Chrome trace-event JSON (Perfetto).")
+    parser.add_argument("inputs", nargs="+", type=Path, help="trace.jsonl files (e.g. logs/trace.jsonl logs/*/trace.jsonl).")
+    parser.add_argument("-o", "--out", type=Path, help="Output file (default: <first input>.perfetto.json).")
+    parser.add_argument("--session", help="Only export this session_id.")
+    args = parser.parse_args()
+
+    out = args.out or args.inputs[0].with_suffix(".perfetto.json")
+    summary = export(args.inputs, out, session=args.session)
+    print(f"[trace-export] sessions={summary['sessions']} spans={summary['spans']} → {summary['path']}")
+    print("[trace-export] Open in https://ui.perfetto.dev or chrome://tracing")
+
+
+if __name__ == "__main__":
+    main()
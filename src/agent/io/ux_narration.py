@@ -1,22 +1,26 @@
 from __future__ import annotations
 
+from collections import deque
 from datetime import datetime, timezone
-from typing import List, Protocol
+from typing import Deque, Protocol
 
 from agent.core.graph_state import GraphState
+from agent.core.history_store import UX_MESSAGES_RING, ring
 
 
 class _Log(Protocol):
     def write(self, message: str) -> None: ...
 
 
-def append_ux(state: GraphState, text_log: _Log, message: str, *, keep_last: int = 30) -> List[str]:
+def append_ux(state: GraphState, text_log: _Log, message: str, *, keep_last: int = UX_MESSAGES_RING) -> Deque[str]:
     stamped = f"{datetime.now(timezone.utc).isoformat()} | {message}"
     try:
         text_log.write(stamped)
     except Exception:
         pass
-    msgs = list(state.get("ux_messages") or [])
-    msgs.append(stamped)
-    return msgs[-keep_last:]
+    msgs = state.get("ux_messages")
+    if not isinstance(msgs, deque) or msgs.maxlen != keep_last:
+        msgs = ring(keep_last, msgs or ())
+    msgs.append(stamped)  # O(1); the ring drops the oldest
+    return msgs
 
@@ -4,8 +4,10 @@ import asyncio
 from typing import Any, Optional
 
 from agent.config.config import Settings
+from agent.core.fallback_stats import FallbackStats
 from agent.core.graph_orchestrator import compile_graph
 from agent.core.graph_state import GraphState, classify_goal_kind
+from agent.core.history_store import ACTION_HISTORY_RING, INTENT_HISTORY_RING, RECORDS_RING, UX_MESSAGES_RING, ring
 from agent.core.node_ask_user import make_ask_user_node
 from agent.core.node_confirm import make_confirm_node
 from agent.core.node_error_retry import make_error_retry_node
@@ -18,7 +20,10 @@ from agent.core.node_progress import make_progress_node
 from agent.core.node_safety import make_safety_node
 from agent.infra.termination_normalizer import normalize_terminal
 from agent.core.planner import Planner
+from agent.infra.checkpoint import CheckpointStore, thread_config
+from agent.infra.profiling import SessionProfiler, bind_profiler, profiled_node, unbind_profiler
 from agent.infra.runtime import BrowserRuntime
+from agent.infra.timing import SessionTimings, bind_session, timed_node, unbind_session
 from agent.infra.tracing import TextLogger, TraceLogger, generate_step_id
 
 try:
@@ -32,6 +37,12 @@ class _NullLog:
         return None
 
 
+# Nodes that can run straight after a resume: they never act on or reason over the observed page, and all route on
+# to observe. Anything else (goal_check, loop_mitigation, planner, safety, confirm, execute) would use an observation
+# whose data-agent-ids belong to a page that died with the process.
+_RESUME_AS_IS = {"observe", "progress", "error_retry", "ask_user"}
+
+
 def _initial_state(goal: str, session_id: str, settings: Settings, runtime: BrowserRuntime) -> GraphState:
     return {
         "goal": goal,
@@ -47,8 +58,9 @@ def _initial_state(goal: str, session_id: str, settings: Settings, runtime: Brow
         "avoid_elements": [],
         "visited_urls": {},
         "visited_elements": {},
-        "action_history": [],
-        "records": [],
+        "action_history": ring(ACTION_HISTORY_RING),
+        "records": ring(RECORDS_RING),
+        "record_seq": 0,
         "exec_fail_counts": {},
         "recent_observations": [],
         "conservative_probe_done": False,
@@ -57,12 +69,15 @@ def _initial_state(goal: str, session_id: str, settings: Settings, runtime: Brow
         "progress_steps": 0,
         "no_progress_steps": 0,
         "planner_calls": 0,
+        "probe": None,
+        "probe_change": None,
+        "observation_reused": False,
         "tabs": [],
         "tab_events": [],
         "active_tab_id": runtime.get_active_page_id(),
         "intent_text": None,
-        "intent_history": [],
-        "ux_messages": [],
+        "intent_history": ring(INTENT_HISTORY_RING),
+        "ux_messages": ring(UX_MESSAGES_RING),
         "context_events": [],
     }
 
@@ -75,8 +90,14 @@ def build_graph(
     execute_enabled: bool,
     text_log: Optional[TextLogger] = None,
     trace: Optional[TraceLogger] = None,
+    checkpoints: Optional[CheckpointStore] = None,
 ):
     text_log = text_log or _NullLog()  # type: ignore[assignment]
+    fallback_stats = (
+        FallbackStats.load(settings.paths.cache_dir / "fallback_stats.json", min_attempts=settings.fallback_min_attempts)
+        if settings.fallback_learning
+        else None
+    )
     nodes = {
         "observe": make_observe_node(settings=settings, runtime=runtime, trace=trace),
         "loop_mitigation": make_loop_mitigation_node(settings=settings, runtime=runtime, text_log=text_log, trace=trace),
@@ -84,19 +105,90 @@ def build_graph(
         "planner": make_planner_node(settings=settings, planner=planner, runtime=runtime, text_log=text_log, trace=trace),
         "safety": make_safety_node(trace=trace),
         "confirm": make_confirm_node(settings=settings),
-        "execute": make_execute_node(settings=settings, runtime=runtime, execute_enabled=execute_enabled, text_log=text_log, trace=trace),
+        "execute": make_execute_node(
+            settings=settings,
+            runtime=runtime,
+            execute_enabled=execute_enabled,
+            text_log=text_log,
+            trace=trace,
+            fallback_stats=fallback_stats,
+        ),
         "progress": make_progress_node(settings=settings, trace=trace),
         "ask_user": make_ask_user_node(trace=trace),
         "error_retry": make_error_retry_node(text_log=text_log, trace=trace),
     }
+    # Wrappers are only installed when enabled; the profiler sits innermost so span timings include its overhead.
+    if settings.profile_mode != "off":
+        nodes = {name: profiled_node(name, node) for name, node in nodes.items()}
+    if settings.timing_spans:
+        nodes = {name: timed_node(name, node, trace) for name, node in nodes.items()}
     graph = compile_graph(nodes)
     graph_config = {"recursion_limit": max(settings.max_steps + 20, 50)}
+    checkpointed_graph: Any = None
+
+    async def _graph_for(session_id: str) -> tuple[Any, dict[str, Any]]:
+        nonlocal checkpointed_graph
+        if checkpoints is None:
+            return graph, graph_config
+        if checkpointed_graph is None:
+            checkpointed_graph = compile_graph(nodes, checkpointer=await checkpoints.saver())
+        return checkpointed_graph, thread_config(graph_config, session_id)
+
+    async def _prepare_resume(active_graph: Any, config: dict[str, Any], session_id: str) -> GraphState:
+        snapshot = await active_graph.aget_state(config)
+        values = dict(snapshot.values or {})
+        if not values:
+            raise ValueError(f"no checkpoint for session {session_id}")
+        if not snapshot.next:
+            raise ValueError(f"session {session_id} already finished (stop_reason={values.get('stop_reason')})")
+        # The browser did not survive the crash: reopen the last observed page before continuing.
+        observation = values.get("observation")
+        page = await runtime.ensure_page()
+        if observation is not None and observation.url and page.url != observation.url:
+            try:
+                await runtime.navigation.navigate(page, "navigate", observation.url)
+            except Exception as exc:
+                text_log.write(f"[{session_id}] resume: could not reopen {observation.url}: {exc}")
+        if set(snapshot.next) - _RESUME_AS_IS:
+            # Replay the routing out of progress (→ observe): the interrupted step starts over from a fresh observation.
+            await active_graph.aupdate_state(config, {}, as_node="progress")
+        text_log.write(f"[{session_id}] resuming at step {values.get('step')} (next={list(snapshot.next)})")
+        if trace:
+            try:
+                trace.write({"resume": {"step": values.get("step"), "next": list(snapshot.next)}, "session_id": session_id})
+            except Exception:
+                pass
+        return values  # type: ignore[return-value]
 
-    async def run(goal: str) -> dict[str, Any]:
-        session_id = generate_step_id("session")
-        initial_state = _initial_state(goal, session_id, settings, runtime)
+    async def run(goal: Optional[str] = None, session_id: Optional[str] = None, resume: bool = False) -> dict[str, Any]:
+        """Run a goal; with resume=True continue session_id from its last checkpoint (goal is taken from it)."""
+        if resume and (checkpoints is None or not session_id):
+            raise ValueError("resume needs checkpointing and a session_id")
+        session_id = session_id or generate_step_id("session")
+        runtime.router.reset_session()
+        active_graph, config = await _graph_for(session_id)
+        if resume:
+            initial_state = await _prepare_resume(active_graph, config, session_id)
+            goal = initial_state.get("goal", goal)
+            graph_input: Optional[GraphState] = None
+        else:
+            initial_state = _initial_state(str(goal or ""), session_id, settings, runtime)
+            graph_input = initial_state
+        timings = SessionTimings(session_id) if settings.timing_spans else None
+        timing_token = bind_session(timings) if timings is not None else None
+        profiler = (
+            SessionProfiler(
+                session_id,
+                settings.paths.logs_dir / "profile" / session_id,
+                mode=settings.profile_mode,
+                sample_interval_ms=settings.profile_sample_ms,
+            )
+            if settings.profile_mode != "off"
+            else None
+        )
+        profile_token = bind_profiler(profiler) if profiler is not None else None
         try:
-            result = await graph.ainvoke(initial_state, config=graph_config)
+            result = await active_graph.ainvoke(graph_input, config=config)
         except Exception as exc:
             if isinstance(exc, GraphRecursionError):
                 try:
@@ -113,7 +205,36 @@ def build_graph(
                 }
             else:
                 raise
+        finally:
+            if timing_token is not None:
+                unbind_session(timing_token)
+            if profile_token is not None:
+                unbind_profiler(profile_token)
+                # Also on a crash: stops the sampler thread and keeps the profile of the failing run.
+                profiler.finish(trace=trace, text_log=text_log)  # type: ignore[union-attr]
         result = normalize_terminal(result, session_id=session_id, text_log=text_log, trace=trace)
+        if timings is not None:
+            timings.finish(trace=trace, text_log=text_log)
+        if fallback_stats is not None:
+            try:
+                fallback_stats.save()
+            except Exception as exc:
+                text_log.write(f"[{session_id}] fallback stats not saved: {exc}")
+        if trace and runtime.router.enabled:
+            try:
+                trace.write({"network_routing": runtime.router.session_stats(), "session_id": session_id})
+            except Exception:
+                pass
+        if trace and runtime.navigation.domain_summary():
+            try:
+                trace.write({"navigation_domains": runtime.navigation.domain_summary(), "session_id": session_id})
+            except Exception:
+                pass
+        if trace and len(planner.models) > 1:
+            try:
+                trace.write({"planner_cascade": planner.cascade_summary(), "session_id": session_id})
+            except Exception:
+                pass
         return result
 
     return run
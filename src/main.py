@@ -3,10 +3,13 @@ import asyncio
 import os
 import shutil
 from dataclasses import replace
+from pathlib import Path
 
 from agent.config.config import Settings
 from agent.core.planner import Planner
+from agent.infra.llm_client import close_shared_clients
 from agent.infra.runtime import BrowserRuntime
+from agent.infra.tracing import generate_step_id
 from agent.io.ui_shell import run_ui_shell
 from agent.legacy.loop import AgentLoop
 from agent.legacy.state import AgentState
@@ -96,6 +99,75 @@ async def amain() -> None:
         type=int,
         help="Scroll step size in pixels for scroll actions and fallbacks.",
     )
+    parser.add_argument(
+        "--planner-streaming",
+        action="store_true",
+        help="Stream planner tool calls and pre-scroll the target element before the response completes.",
+    )
+    parser.add_argument(
+        "--planner-models",
+        help="Comma-separated planner cascade, cheapest first (overrides PLANNER_MODELS).",
+    )
+    parser.add_argument(
+        "--planner-hedge",
+        action="store_true",
+        help="Send a hedged second planner request when the first exceeds the adaptive p90 delay.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Run up to N goals at once, each in its own browser context (overrides MAX_CONCURRENT_GOALS).",
+    )
+    parser.add_argument(
+        "--max-contexts",
+        type=int,
+        help="Max simultaneously open browser contexts for concurrent goals (overrides MAX_BROWSER_CONTEXTS).",
+    )
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        help="Run a JSONL goals file across a pool of headless worker processes, then exit.",
+    )
+    parser.add_argument("--workers", type=int, help="Worker processes for --batch (overrides FARM_WORKERS).")
+    parser.add_argument(
+        "--worker-retries",
+        type=int,
+        help="Times a goal is requeued after its worker crashes (overrides FARM_WORKER_RETRIES).",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep browser/graph/planner warm and accept goals over a local HTTP job API.",
+    )
+    parser.add_argument("--daemon-port", type=int, help="TCP port for --daemon (overrides DAEMON_PORT).")
+    parser.add_argument("--daemon-socket", help="Unix socket path for --daemon instead of TCP (overrides DAEMON_SOCKET).")
+    parser.add_argument("--cdp-endpoint", help="Attach to a running Chromium over CDP instead of launching one.")
+    parser.add_argument(
+        "--start-sidecar",
+        action="store_true",
+        help="Start (or reuse) a detached Chromium sidecar that survives restarts, and attach to it.",
+    )
+    parser.add_argument("--stop-sidecar", action="store_true", help="Stop the sidecar browser and exit.")
+    parser.add_argument("--har-record", type=Path, help="Record all network traffic of this run into a HAR file.")
+    parser.add_argument("--har-replay", type=Path, help="Serve network traffic from a recorded HAR (offline run).")
+    parser.add_argument(
+        "--route-profile",
+        choices=["off", "light", "aggressive"],
+        help="Network blocking profile for images/fonts/media/trackers (overrides ROUTE_PROFILE).",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Checkpoint every graph node to SQLite so a crashed goal can be resumed (overrides CHECKPOINT_ENABLED).",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=["cprofile", "sample", "both"],
+        help="Profile every graph node into logs/profile/<session_id>/ (default cprofile; overrides PROFILE_MODE).",
+    )
+    parser.add_argument("--resume", metavar="SESSION_ID", help="Continue a checkpointed session from its last completed node.")
     args = parser.parse_args()
 
     settings = Settings.load()
@@ -148,9 +220,67 @@ async def amain() -> None:
             settings.max_attempts_per_element = max(1, args.max_attempts_per_element)
         if args.scroll_step:
             settings.scroll_step = max(50, args.scroll_step)
+        if args.planner_streaming:
+            settings.planner_streaming = True
+        if args.planner_hedge:
+            settings.planner_hedge = True
+        if args.planner_models:
+            settings.planner_models = [m.strip() for m in args.planner_models.split(",") if m.strip()] or settings.planner_models
+        if args.concurrency:
+            settings.max_concurrent_goals = max(1, args.concurrency)
+        if args.max_contexts:
+            settings.max_browser_contexts = max(1, args.max_contexts)
+        if args.workers:
+            settings.farm_workers = max(1, args.workers)
+        if args.worker_retries is not None:
+            settings.farm_worker_retries = max(0, args.worker_retries)
+        if args.daemon_port:
+            settings.daemon_port = args.daemon_port
+        if args.daemon_socket:
+            settings.daemon_socket = args.daemon_socket
+        if args.cdp_endpoint:
+            settings.cdp_endpoint = args.cdp_endpoint
+        if args.route_profile:
+            settings.route_profile = args.route_profile
+        if args.har_record:
+            settings.har_mode = "record"
+            settings.har_path = args.har_record
+        if args.har_replay:
+            settings.har_mode = "replay"
+            settings.har_path = args.har_replay
+        if args.checkpoint or args.resume:
+            settings.checkpoint_enabled = True
+        if args.profile:
+            settings.profile_mode = args.profile
 
     apply_cli_overrides()
 
+    if args.stop_sidecar:
+        from agent.infra.sidecar import stop_sidecar
+
+        print("[agent] Sidecar stopped." if stop_sidecar(settings) else "[agent] No sidecar running.")
+        return
+    if args.start_sidecar:
+        from agent.infra.sidecar import start_sidecar
+
+        sidecar = await start_sidecar(settings)
+        settings.cdp_endpoint = sidecar["endpoint"]
+        print(f"[agent] Sidecar browser pid={sidecar['pid']} at {sidecar['endpoint']}")
+
+    if args.batch:
+        from agent.farm import run_batch
+
+        if not settings.openai_api_key:
+            print("[agent] OPENAI_API_KEY not set; cannot run batch.")
+            return
+        summary = await asyncio.to_thread(run_batch, args.batch, settings, execute_enabled=not args.plan_only)
+        print(
+            f"[agent] Batch finished: goals={summary['goals']} workers={summary['workers']} "
+            f"crashes={summary['worker_crashes']} reasons={summary['stop_reasons']} total={summary['total_s']}s"
+        )
+        print(f"[agent] Summary: {summary['path']}")
+        return
+
     # UI shell may want its own step limit without mutating base settings permanently.
     ui_settings = replace(settings)
     if args.ui_step_limit:
@@ -167,7 +297,10 @@ async def amain() -> None:
 
     await runtime.launch()
     page = await runtime.ensure_page()
-    print(f"[agent] Headful browser started with persistent profile at: {ui_settings.paths.user_data_dir if args.ui_shell else settings.paths.user_data_dir}")
+    if runtime.attached:
+        print(f"[agent] Attached to running browser at {settings.cdp_endpoint} (left running on exit)")
+    else:
+        print(f"[agent] Headful browser started with persistent profile at: {ui_settings.paths.user_data_dir if args.ui_shell else settings.paths.user_data_dir}")
     print(f"[agent] Initial URL: {page.url}")
     print(f"[agent] Trace/logs: {ui_settings.paths.logs_dir if args.ui_shell else settings.paths.logs_dir}")
 
@@ -185,42 +318,37 @@ async def amain() -> None:
     def prompt_goal() -> str:
         return input("Enter goal for the agent (leave blank to stop): ").strip()
 
+    engine = None
     if not settings.openai_api_key:
         print("[agent] OPENAI_API_KEY not set; skipping loop and keeping browser open.")
     else:
         execute_enabled = not args.plan_only
-        planner = Planner(
-            api_key=settings.openai_api_key,
-            model=settings.openai_model,
-            base_url=settings.openai_base_url,
-        )
+        planner = Planner.from_settings(settings)
         active_settings = ui_settings if args.ui_shell else settings
 
         # Interactive-first: if no goals provided, start interactive loop without default execution.
-        if args.ui_shell:
-            # Build runner (prefer LangGraph; fallback to legacy loop wrapper).
-            runner = None
-            text_log = None
-            trace = None
-            if use_langgraph:
-                try:
-                    from agent.langgraph_loop import build_graph
-                    from agent.infra.tracing import TextLogger, TraceLogger
+        if args.daemon:
+            from agent.daemon import serve_daemon
 
-                    text_log = TextLogger(active_settings.paths.logs_dir / "agent.log")
-                    trace = TraceLogger(active_settings.paths.logs_dir / "trace.jsonl")
-                    runner = build_graph(
-                        settings=active_settings,
-                        planner=planner,
-                        runtime=runtime,
-                        execute_enabled=execute_enabled,
-                        text_log=text_log,
-                        trace=trace,
-                    )
-                except Exception as exc:
-                    print(f"[agent] Failed to init LangGraph loop for UI shell: {exc}. Falling back to legacy runner.")
-                    use_langgraph = False
-            if runner is None:
+            try:
+                await serve_daemon(settings, runtime, planner, execute_enabled=execute_enabled)
+            except (KeyboardInterrupt, asyncio.CancelledError):
+                print("\n[agent] Daemon stopped.")
+            await runtime.close()
+            await close_shared_clients()
+            return
+        # One engine (compiled graph, loggers, checkpoints) for every goal; legacy loop only if it cannot be built.
+        if use_langgraph:
+            try:
+                from agent.engine import AgentEngine
+
+                engine = AgentEngine(active_settings, runtime, planner, execute_enabled=execute_enabled)
+            except Exception as exc:
+                print(f"[agent] Failed to init LangGraph loop: {exc}. Falling back to legacy loop.")
+        if args.ui_shell:
+            if engine is not None:
+                runner = engine.run
+            else:
                 agent_state = AgentState()
                 loop = AgentLoop(
                     settings=active_settings,
@@ -240,10 +368,48 @@ async def amain() -> None:
                 runner=runner,
                 settings=active_settings,
                 clean_between_goals=clean_between_goals,
-                text_log=text_log,
-                trace=trace,
+                text_log=engine.text_log if engine else None,
+                trace=engine.trace if engine else None,
             )
         else:
+            if args.resume and engine is not None:
+                print(f"[agent] Resuming session {args.resume}")
+                try:
+                    result_state = await engine.resume(args.resume)
+                    print(
+                        f"[agent] Resumed session finished. reason={result_state.get('stop_reason')} "
+                        f"url={result_state.get('observation').url if result_state.get('observation') else None}"
+                    )
+                except ValueError as exc:
+                    print(f"[agent] Cannot resume {args.resume}: {exc}")
+            if settings.max_concurrent_goals > 1 and len(goals_queue) > 1:
+                from agent.concurrent_runner import run_goals_concurrently
+                from agent.infra.browser_pool import BrowserPool
+
+                print(
+                    f"[agent] Running {len(goals_queue)} goals concurrently "
+                    f"(concurrency={settings.max_concurrent_goals}, max_contexts={settings.max_browser_contexts})"
+                )
+                pool = BrowserPool(settings)
+                try:
+                    # The headful runtime holds the profile lock, so seed pooled contexts from its live state.
+                    await pool.start(storage_state=await runtime.storage_state())
+                    results = await run_goals_concurrently(
+                        goals_queue,
+                        settings=settings,
+                        planner=planner,
+                        pool=pool,
+                        execute_enabled=execute_enabled,
+                    )
+                finally:
+                    await pool.close()
+                for item in results:
+                    print(
+                        f"[agent] [{item['session_id']}] reason={item['stop_reason']} "
+                        f"wall={item['wall_s']}s url={item['url']} goal={item['goal']}"
+                    )
+                goals_queue = []
+            goals_run = 0
             while True:
                 if goals_queue:
                     goal = goals_queue.pop(0)
@@ -252,34 +418,23 @@ async def amain() -> None:
                 if not goal:
                     print("[agent] No goal provided; keeping browser open.")
                     break
+                if engine is not None:
+                    hygiene = await engine.between_goals()
+                else:
+                    hygiene = await runtime.between_goals() if goals_run else {}
+                if hygiene.get("closed_tabs") or hygiene.get("recycled"):
+                    print(
+                        f"[agent] Hygiene: closed_tabs={len(hygiene['closed_tabs'])} recycled={hygiene['recycled']} "
+                        f"heap_mb={(hygiene.get('heap') or {}).get('total_mb')}"
+                    )
+                goals_run += 1
                 print(f"[agent] Starting goal: {goal}")
                 clean_between_goals()
-                if use_langgraph:
-                    try:
-                        from agent.langgraph_loop import build_graph
-                    except Exception as exc:
-                        print(f"[agent] Failed to init LangGraph loop: {exc}. Falling back to custom loop.")
-                        use_langgraph = False
-
-                if use_langgraph:
-                    text_log = None
-                    trace = None
-                    try:
-                        from agent.infra.tracing import TextLogger, TraceLogger
-
-                        text_log = TextLogger(active_settings.paths.logs_dir / "agent.log")
-                        trace = TraceLogger(active_settings.paths.logs_dir / "trace.jsonl")
-                    except Exception:
-                        pass
-                    runner = build_graph(
-                        settings=active_settings,
-                        planner=planner,
-                        runtime=runtime,
-                        execute_enabled=execute_enabled,
-                        text_log=text_log,
-                        trace=trace,
-                    )
-                    result_state = await runner(goal=goal)  # type: ignore[arg-type]
+                if engine is not None:
+                    session_id = generate_step_id("session")
+                    if engine.checkpoints is not None:
+                        print(f"[agent] Checkpointing session {session_id} (continue after a crash with --resume {session_id})")
+                    result_state = await engine.run(goal, session_id=session_id)
                     print(
                         f"[agent] LangGraph finished. reason={result_state.get('stop_reason')} "
                         f"url={result_state.get('observation').url if result_state.get('observation') else None}"
@@ -302,7 +457,10 @@ async def amain() -> None:
     except KeyboardInterrupt:
         print("\n[agent] Interrupt received, shutting down...")
     finally:
+        if engine is not None:
+            await engine.close()
         await runtime.close()
+        await close_shared_clients()
         print("[agent] Browser closed. Bye.")
 
 